@@ -0,0 +1 @@
+"""离线基准测试套件"""
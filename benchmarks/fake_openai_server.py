@@ -0,0 +1,307 @@
+"""本地OpenAI兼容替身服务器，用于端到端压力测试
+
+支持 /v1/chat/completions（含流式输出和usage字段）和 /v1/models，
+并提供压测用的RSS源（/feeds/<编号>.xml）和文章网页（/articles/<编号>）。
+延迟服从对数正态分布，可配置错误率、429限流比例和编号错乱的翻译结果比例。
+
+用法（在项目根目录运行）:
+    python -m benchmarks.fake_openai_server --port 8765 --latency-ms 800 --error-rate 0.02
+然后设置 DEEPSEEK_BASE_URL=http://127.0.0.1:8765/v1 即可让程序使用该服务器。
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from . import fixtures
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\.\s*(.+)$")
+ARTICLE_MARKER = re.compile(r"^=== 文章(\d+) ===$", re.MULTILINE)
+
+SUMMARY_TEXT = (
+    "本文报道了一则重要新闻事件。文章首先介绍了事件的背景和起因，随后说明了主要参与方的立场与表态，"
+    "并引用了相关数据说明事件的规模和影响范围。\n"
+    "文章指出，该事件可能对当地经济、社会秩序以及相关政策的走向产生深远影响，专家对后续发展看法不一。\n"
+    "总体来看，事件仍在发展之中，各方将持续关注其进展以及可能带来的连锁反应。"
+)
+
+
+@dataclass
+class ServerOptions:
+    """替身服务器的行为配置"""
+    latency_ms: float = 500.0          # 首字节延迟中位数（毫秒）
+    latency_sigma: float = 0.6         # 对数正态分布的sigma，越大长尾越明显
+    token_interval_ms: float = 5.0     # 流式输出时每个分块的间隔（毫秒）
+    error_rate: float = 0.0            # 返回500错误的比例
+    rate_limit_rate: float = 0.0       # 返回429限流的比例
+    malformed_rate: float = 0.0        # 翻译结果编号错乱（缺行）的比例
+    feed_items: int = 100              # 每个压测RSS源包含的条目数
+    seed: Optional[int] = None         # 随机种子
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数（英文约4字符一个token，中文约1字一个token）"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return max(1, ascii_chars // 4 + (len(text) - ascii_chars))
+
+
+class FakeOpenAIServer:
+    """可在进程内启动和停止的替身服务器"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 options: Optional[ServerOptions] = None):
+        self.options = options or ServerOptions()
+        self.rng = random.Random(self.options.seed)
+        self.rng_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """服务器根地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base_url(self) -> str:
+        """OpenAI兼容接口地址，可直接作为DEEPSEEK_BASE_URL"""
+        return f"{self.base_url}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """在后台线程中启动服务器"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务器"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def sample_latency(self) -> float:
+        """按对数正态分布抽取一次延迟（秒）"""
+        with self.rng_lock:
+            value = self.rng.lognormvariate(math.log(self.options.latency_ms), self.options.latency_sigma)
+        return value / 1000
+
+    def build_reply(self, messages: List[dict]) -> str:
+        """根据请求内容生成回复：翻译请求逐行返回译文，其余请求返回固定总结"""
+        system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        if "translat" not in system.lower():
+            user = messages[-1].get("content", "") if messages else ""
+            numbers = ARTICLE_MARKER.findall(user)
+            if not numbers:
+                return SUMMARY_TEXT
+            # 批量总结：每篇返回一段带编号的总结
+            if len(numbers) > 1 and self.random() < self.options.malformed_rate:
+                # 模拟模型漏掉一篇
+                numbers.pop(int(self.random() * len(numbers)))
+            return "\n\n".join(f"=== 总结{n} ===\n{SUMMARY_TEXT}" for n in numbers)
+
+        user = messages[-1].get("content", "") if messages else ""
+        lines = []
+        for line in user.splitlines():
+            match = NUMBERED_LINE.match(line)
+            if match:
+                lines.append(f"{match.group(1)}. 【译】{match.group(2)}")
+        if not lines:
+            # 段落翻译：整段返回
+            return f"【译】{user}"
+        if len(lines) > 1 and self.random() < self.options.malformed_rate:
+            # 模拟模型漏掉一行或把两行合并
+            index = int(self.random() * (len(lines) - 1))
+            lines[index] = lines[index] + " " + lines.pop(index + 1).split(".", 1)[1]
+        return "\n".join(lines)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/v1/models":
+                    self._send_json(200, {
+                        "object": "list",
+                        "data": [{"id": "fake-model", "object": "model", "owned_by": "benchmark"}]
+                    })
+                    return
+                match = re.match(r"^/feeds/(\d+)\.xml$", parts.path)
+                if match:
+                    feed_id = int(match.group(1))
+                    query = parse_qs(parts.query)
+                    items = int(query.get("items", [server.options.feed_items])[0])
+                    body = fixtures.make_rss(
+                        items, seed=feed_id, link_base=f"{server.base_url}/articles/",
+                        start=feed_id * 100000
+                    )
+                    self._send(200, body, "application/rss+xml; charset=utf-8")
+                    return
+                match = re.match(r"^/articles/(\d+)$", parts.path)
+                if match:
+                    body = fixtures.make_article_html(
+                        int(match.group(1)) % 1000,
+                        canonical_url=f"{server.base_url}{parts.path}"
+                    )
+                    self._send(200, body.encode("utf-8"), "text/html; charset=utf-8")
+                    return
+                self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                if urlsplit(self.path).path != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                time.sleep(server.sample_latency())
+                roll = server.random()
+                if roll < server.options.rate_limit_rate:
+                    self._send_json(429, {"error": {"message": "rate limited", "type": "rate_limit_error"}},
+                                    headers={"Retry-After": "1"})
+                    return
+                if roll < server.options.rate_limit_rate + server.options.error_rate:
+                    self._send_json(500, {"error": {"message": "internal error", "type": "server_error"}})
+                    return
+
+                messages = request.get("messages", [])
+                reply = server.build_reply(messages)
+                usage = {
+                    "prompt_tokens": sum(estimate_tokens(m.get("content", "")) for m in messages),
+                    "completion_tokens": estimate_tokens(reply),
+                }
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                model = request.get("model", "fake-model")
+
+                if request.get("stream"):
+                    include_usage = (request.get("stream_options") or {}).get("include_usage", False)
+                    self._stream(completion_id, model, reply, usage if include_usage else None)
+                    return
+
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": usage
+                })
+
+            def _stream(self, completion_id: str, model: str, reply: str, usage: Optional[dict]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                def chunk(delta: dict, finish_reason: Optional[str] = None, chunk_usage=None):
+                    payload = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                        if chunk_usage is None else [],
+                    }
+                    if chunk_usage is not None:
+                        payload["usage"] = chunk_usage
+                    self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                try:
+                    chunk({"role": "assistant", "content": ""})
+                    for start in range(0, len(reply), 8):
+                        time.sleep(server.options.token_interval_ms / 1000)
+                        chunk({"content": reply[start:start + 8]})
+                    chunk({}, "stop")
+                    if usage is not None:
+                        chunk({}, chunk_usage=usage)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self._send(status, body, "application/json", headers)
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """添加替身服务器行为相关的命令行参数"""
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="延迟中位数（毫秒）")
+    parser.add_argument("--latency-sigma", type=float, default=0.6, help="对数正态分布sigma")
+    parser.add_argument("--token-interval-ms", type=float, default=5.0, help="流式分块间隔（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500错误比例")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429限流比例")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="翻译编号错乱比例")
+    parser.add_argument("--feed-items", type=int, default=100, help="每个压测RSS源的条目数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+
+
+def options_from_args(args: argparse.Namespace) -> ServerOptions:
+    """根据命令行参数创建ServerOptions"""
+    return ServerOptions(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        token_interval_ms=args.token_interval_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+        feed_items=args.feed_items,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地OpenAI兼容替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, options_from_args(args))
+    print(f"替身服务器已启动: {server.api_base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
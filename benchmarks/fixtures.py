@@ -0,0 +1,112 @@
+"""离线基准测试使用的固定数据生成器
+
+所有数据都由固定随机种子生成，保证不同版本之间的测试输入完全一致。
+"""
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from typing import List
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "government minister election market shares storm climate court police "
+    "health hospital school energy prices talks summit war ceasefire report "
+    "study scientists football league record company profits bank rates "
+    "inflation city council water flood fire railway strike union deal"
+).split()
+
+BASE_TIME = datetime(2024, 1, 1, 8, 0, 0)
+
+
+def make_title(rng: random.Random) -> str:
+    """生成一个英文新闻标题"""
+    words = rng.sample(WORDS, rng.randint(6, 11))
+    return " ".join(words).capitalize()
+
+
+def make_rss(count: int, seed: int = 1, link_base: str = "https://news.example.com/world/",
+             start: int = 100000) -> bytes:
+    """生成包含count个条目的RSS 2.0源，条目链接为 link_base + 编号"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        published = BASE_TIME + timedelta(minutes=17 * i)
+        items.append(f"""
+    <item>
+      <title>{escape(make_title(rng))}</title>
+      <description>{escape(" ".join(rng.choices(WORDS, k=40)))}</description>
+      <link>{escape(link_base)}{start + i}?at_medium=RSS&amp;at_campaign=bench</link>
+      <guid isPermaLink="false">news-{start + i}</guid>
+      <pubDate>{format_datetime(published.astimezone())}</pubDate>
+    </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Benchmark News</title>
+    <link>https://news.example.com/</link>
+    <description>Offline benchmark feed</description>{"".join(items)}
+  </channel>
+</rss>""".encode("utf-8")
+
+
+def make_atom(count: int, seed: int = 2) -> bytes:
+    """生成包含count个条目的Atom源"""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        updated = (BASE_TIME + timedelta(minutes=23 * i)).isoformat() + "Z"
+        entries.append(f"""
+  <entry>
+    <title>{escape(make_title(rng))}</title>
+    <link rel="alternate" href="https://blog.example.org/posts/{i}"/>
+    <id>tag:blog.example.org,2024:{i}</id>
+    <updated>{updated}</updated>
+    <summary>{escape(" ".join(rng.choices(WORDS, k=40)))}</summary>
+  </entry>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Benchmark Blog</title>
+  <id>tag:blog.example.org,2024:feed</id>
+  <updated>{BASE_TIME.isoformat()}Z</updated>{"".join(entries)}
+</feed>""".encode("utf-8")
+
+
+def make_article_html(index: int, paragraphs: int = 30, canonical_url: str = "") -> str:
+    """生成一篇带导航、脚本和样式的新闻网页"""
+    rng = random.Random(1000 + index)
+    canonical_url = canonical_url or f"https://news.example.com/world/{100000 + index}"
+    body = "\n".join(
+        f"<p>{escape(' '.join(rng.choices(WORDS, k=rng.randint(30, 80))))}.</p>"
+        for _ in range(paragraphs)
+    )
+    nav = "".join(f'<li><a href="/section/{w}">{w}</a></li>' for w in WORDS[:20])
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{escape(make_title(rng))}</title>
+  <link rel="canonical" href="{escape(canonical_url)}">
+  <style>body {{ font-family: sans-serif; }} .ad {{ display: none; }}</style>
+  <script>window.dataLayer = window.dataLayer || []; function track() {{ return 1; }}</script>
+</head>
+<body>
+  <nav><ul>{nav}</ul></nav>
+  <article>
+    <h1>{escape(make_title(rng))}</h1>
+    {body}
+  </article>
+  <footer>Copyright Example News</footer>
+  <script src="/static/app.js"></script>
+</body>
+</html>"""
+
+
+def make_titles(count: int, seed: int = 3) -> List[str]:
+    """生成count个英文标题"""
+    rng = random.Random(seed)
+    return [make_title(rng) for _ in range(count)]
+
+
+def make_numbered_response(count: int) -> str:
+    """生成与translate_batch返回格式一致的编号译文"""
+    return "\n".join(f"{i + 1}. 基准测试译文标题第{i + 1}条，包含一些中文内容。" for i in range(count))
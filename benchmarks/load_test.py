@@ -0,0 +1,225 @@
+"""端到端压力测试：获取 → 翻译 → 保存 → 总结
+
+启动本地替身服务器（或使用 --server-url 指定已运行的服务器），
+让大量文章走完整的处理流程，并报告吞吐量和各阶段的尾延迟。
+
+用法（在项目根目录运行，需要PostgreSQL）:
+    python -m benchmarks.load_test --feeds 20 --items 100 --workers 8 --error-rate 0.02
+
+测试使用独立的 <DB_NAME>_loadtest 数据库，开始前会清空其中的articles和feed_state表。
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# 压测数据写入独立的数据库，不影响正式数据
+os.environ.setdefault("DEEPSEEK_API_KEY", "offline-load-test")
+_base_db_name = os.environ.get("DB_NAME", "rss_articles")
+
+from .fake_openai_server import FakeOpenAIServer, add_server_arguments, options_from_args
+
+
+class LatencyRecorder:
+    """线程安全的分阶段延迟记录"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self.lock:
+                self.errors[name] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.samples[name].append(elapsed)
+
+    def record_error(self, name: str) -> None:
+        with self.lock:
+            self.errors[name] += 1
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数（最近秩法）"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def print_stage_report(recorder: LatencyRecorder) -> None:
+    """打印各阶段的延迟分布"""
+    print(f"{'阶段':<12}{'次数':>8}{'错误':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for name, values in recorder.samples.items():
+        print(
+            f"{name:<12}{len(values):>8}{recorder.errors.get(name, 0):>8}"
+            f"{statistics.median(values) * 1000:>10.1f}"
+            f"{percentile(values, 95) * 1000:>10.1f}"
+            f"{percentile(values, 99) * 1000:>10.1f}"
+            f"{max(values) * 1000:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="端到端压力测试")
+    parser.add_argument("--feeds", type=int, default=20, help="RSS源数量")
+    parser.add_argument("--items", type=int, default=100, help="每个RSS源的条目数")
+    parser.add_argument("--workers", type=int, default=8, help="并发线程数")
+    parser.add_argument("--summaries", type=int, default=None, help="生成总结的文章数，默认全部")
+    parser.add_argument("--summary-batch", type=int, default=1,
+                        help="每次请求合并总结的短文章数（见SUMMARY_BATCH_MAX_CHARS），默认不合并")
+    parser.add_argument("--server-url", default=None,
+                        help="使用已运行的替身服务器（例如 http://127.0.0.1:8765），默认在进程内启动")
+    parser.add_argument("--db-name", default=f"{_base_db_name}_loadtest", help="压测使用的数据库")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="使用IngestPipeline流水线获取和翻译，而不是每个源一个线程")
+    parser.add_argument("--metrics-json", default=None, help="把运行指标（阶段耗时、token用量）写入该文件")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ["DB_NAME"] = args.db_name
+    import psycopg2
+    from src.rss_translator import config
+    from src.rss_translator.metrics import metrics
+    from src.rss_translator.pipeline import IngestPipeline
+    from src.rss_translator.rss_reader import RSSReader
+    from src.rss_translator.translator import TranslationService
+
+    server = None
+    if args.server_url:
+        base_url = args.server_url.rstrip("/")
+    else:
+        server = FakeOpenAIServer(options=options_from_args(args)).start()
+        base_url = server.base_url
+
+    translator = TranslationService(api_key="load-test", base_url=f"{base_url}/v1")
+    reader = RSSReader(translator)
+    with psycopg2.connect(**reader.db.conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE articles, feed_state RESTART IDENTITY")
+
+    feed_urls = [f"{base_url}/feeds/{i + 1}.xml?items={args.items}" for i in range(args.feeds)]
+    recorder = LatencyRecorder()
+
+    def ingest(url: str) -> int:
+        with recorder.stage("ingest"):
+            new_count = reader.update_feed_worker(url)
+        if new_count is None:
+            recorder.record_error("ingest")
+            return 0
+        return new_count
+
+    def summarize(article) -> None:
+        try:
+            with recorder.stage("fetch"):
+                content = reader.get_article_content(article.url)
+            if not content:
+                recorder.record_error("fetch")
+                return
+            with recorder.stage("summarize"):
+                summary = translator.summarize_article(article.title, content)
+            with recorder.stage("save"):
+                reader.db.update_article_summary(article.url, summary)
+        except Exception:
+            pass
+
+    def summarize_chunk(chunk) -> None:
+        pending = []
+        for article in chunk:
+            with recorder.stage("fetch"):
+                content = reader.get_article_content(article.url)
+            if content:
+                pending.append((article, content))
+            else:
+                recorder.record_error("fetch")
+        short = [(a, c) for a, c in pending if len(c) <= config.SUMMARY_BATCH_MAX_CHARS]
+        long = [(a, c) for a, c in pending if len(c) > config.SUMMARY_BATCH_MAX_CHARS]
+        results = []
+        try:
+            if short:
+                with recorder.stage("summarize"):
+                    summaries = translator.summarize_batch([(a.title, c) for a, c in short])
+                for (article, _), summary in zip(short, summaries):
+                    if isinstance(summary, Exception):
+                        recorder.record_error("summarize")
+                    else:
+                        results.append((article, summary))
+            for article, content in long:
+                with recorder.stage("summarize"):
+                    results.append((article, translator.summarize_article(article.title, content)))
+        except Exception:
+            pass
+        for article, summary in results:
+            try:
+                with recorder.stage("save"):
+                    reader.db.update_article_summary(article.url, summary)
+            except Exception:
+                pass
+
+    try:
+        # 数据库层会逐条打印日志，压测期间屏蔽输出
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            if args.pipeline:
+                counts = []
+                pipeline = IngestPipeline(
+                    reader, on_complete=lambda url, count: counts.append(count or 0),
+                    workers={"fetch": args.workers, "translate": args.workers}
+                )
+                pipeline.start()
+                for url in feed_urls:
+                    pipeline.submit(url)
+                pipeline.join()
+                pipeline.stop()
+                ingested = sum(counts)
+            else:
+                with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                    ingested = sum(pool.map(ingest, feed_urls))
+            ingest_seconds = time.perf_counter() - start
+
+            articles = []
+            for url in feed_urls:
+                articles.extend(reader.db.get_articles_by_source(url, limit=args.items))
+            if args.summaries is not None:
+                articles = articles[:args.summaries]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                if args.summary_batch > 1:
+                    chunks = [articles[i:i + args.summary_batch]
+                              for i in range(0, len(articles), args.summary_batch)]
+                    list(pool.map(summarize_chunk, chunks))
+                else:
+                    list(pool.map(summarize, articles))
+            summary_seconds = time.perf_counter() - start
+    finally:
+        if server:
+            server.stop()
+
+    print("\n=== 压测结果 ===")
+    print(f"获取与翻译: {ingested}篇文章 / {ingest_seconds:.1f}秒 = {ingested / ingest_seconds:.1f}篇/秒")
+    summarized = len(recorder.samples.get("save", []))
+    if summary_seconds > 0:
+        print(f"总结: {summarized}篇文章 / {summary_seconds:.1f}秒 = {summarized / summary_seconds:.1f}篇/秒")
+    print()
+    print_stage_report(recorder)
+    if args.metrics_json:
+        metrics.dump_json(args.metrics_json)
+        print(f"\n运行指标已保存到: {args.metrics_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""离线基准测试：RSS获取处理流程各环节的性能
+
+用法（在项目根目录运行）:
+    python -m benchmarks.run                 # 运行全部基准测试
+    python -m benchmarks.run --skip-db       # 跳过需要PostgreSQL的测试
+    python -m benchmarks.run --sizes 1000 10000
+
+结果保存在 benchmarks/results/ 下，并与上一次的结果对比，便于发现性能回退。
+数据库测试使用独立的 <DB_NAME>_bench 数据库，不会影响正式数据。
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+# 基准测试不访问任何外部API，但配置模块要求设置API密钥
+os.environ.setdefault("DEEPSEEK_API_KEY", "offline-benchmark")
+
+import feedparser
+
+from src.rss_translator import __version__, config
+from src.rss_translator.database.models import Article
+from src.rss_translator.feed_parser import parse_feed_fallback, parse_feed_fast
+from src.rss_translator.rss_reader import parse_article_bytes, parse_article_html
+from src.rss_translator.translator import TranslationService
+from . import fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """多次运行func，返回耗时中位数（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class FakeCompletions:
+    """返回固定内容的chat.completions替身"""
+
+    def __init__(self, content: str):
+        self.response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None
+        )
+
+    def create(self, **kwargs):
+        return self.response
+
+
+def bench_feed_parse(results: Dict[str, dict]) -> None:
+    """feedparser解析时间（每个条目）"""
+    for name, maker in (("rss", fixtures.make_rss), ("atom", fixtures.make_atom)):
+        for count in (50, 500):
+            data = maker(count)
+            seconds = measure(lambda: feedparser.parse(data), repeat=3)
+            results[f"feedparser_{name}_{count}_per_entry"] = {
+                "value": seconds / count * 1e6, "unit": "us"
+            }
+
+
+def bench_fast_parse(results: Dict[str, dict]) -> None:
+    """快速解析器与feedparser在大型RSS源上的对比（每个条目）"""
+    for name, maker in (("rss", fixtures.make_rss), ("atom", fixtures.make_atom)):
+        for count in (500, 5000):
+            data = maker(count)
+            seconds = measure(lambda: parse_feed_fast(data, "bench"), repeat=3)
+            results[f"fast_parser_{name}_{count}_per_entry"] = {
+                "value": seconds / count * 1e6, "unit": "us"
+            }
+        data = maker(5000)
+        seconds = measure(lambda: parse_feed_fallback(data, "bench"), repeat=1)
+        results[f"feedparser_articles_{name}_5000_per_entry"] = {
+            "value": seconds / 5000 * 1e6, "unit": "us"
+        }
+
+
+def bench_extract(results: Dict[str, dict]) -> None:
+    """网页正文提取吞吐量"""
+    pages = [fixtures.make_article_html(i) for i in range(20)]
+
+    def run():
+        for page in pages:
+            parse_article_html(page, "https://news.example.com/")
+
+    seconds = measure(run, repeat=3)
+    results["extract_pages_per_sec"] = {"value": len(pages) / seconds, "unit": "pages/s"}
+
+    # 进程池并行提取（与EXTRACT_PROCESSES启用时的路径相同）
+    raw_pages = [page.encode("utf-8") for page in pages * 4]
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(parse_article_bytes, raw_pages[:workers], ["utf-8"] * workers,
+                      ["https://news.example.com/"] * workers))  # 预热子进程
+
+        def run_pool():
+            list(pool.map(parse_article_bytes, raw_pages, ["utf-8"] * len(raw_pages),
+                          ["https://news.example.com/"] * len(raw_pages)))
+
+        seconds = measure(run_pool, repeat=3)
+    results[f"extract_pages_per_sec_{workers}_processes"] = {
+        "value": len(raw_pages) / seconds, "unit": "pages/s"
+    }
+
+
+def bench_translate_parse(results: Dict[str, dict]) -> None:
+    """translate_batch的请求构造与编号结果解析"""
+    service = TranslationService()
+    for count in (10, 50, 200):
+        titles = fixtures.make_titles(count)
+        service.router.backends[0].client = SimpleNamespace(
+            chat=SimpleNamespace(completions=FakeCompletions(fixtures.make_numbered_response(count)))
+        )
+        seconds = measure(lambda: service.translate_batch(titles), repeat=20)
+        results[f"translate_batch_{count}"] = {"value": seconds * 1e6, "unit": "us"}
+
+
+def bench_database(results: Dict[str, dict], sizes: List[int]) -> None:
+    """save_articles写入速率与get_articles_by_source查询延迟"""
+    import psycopg2
+    from src.rss_translator.database.manager import DatabaseManager
+
+    db = DatabaseManager(dbname=f"{config.DB_NAME}_bench")
+    with psycopg2.connect(**db.conn_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE articles RESTART IDENTITY")
+
+    titles = fixtures.make_titles(max(sizes))
+    source = "https://news.example.com/rss.xml"
+    inserted = 0
+    for size in sorted(sizes):
+        batch = [
+            Article(
+                id=None,
+                title=titles[i],
+                translated_title=f"译文{i}",
+                url=f"https://news.example.com/world/{i}",
+                source=source if i % 4 else "https://other.example.com/rss.xml",
+                created_at=fixtures.BASE_TIME + timedelta(minutes=i)
+            )
+            for i in range(inserted, size)
+        ]
+        start = time.perf_counter()
+        for offset in range(0, len(batch), 200):
+            db.save_articles(batch[offset:offset + 200])
+        elapsed = time.perf_counter() - start
+        inserted = size
+        if batch:
+            results[f"save_articles_rows_per_sec_at_{size}"] = {
+                "value": len(batch) / elapsed, "unit": "rows/s"
+            }
+
+        seconds = measure(lambda: db.get_articles_by_source(source), repeat=10)
+        results[f"get_articles_by_source_at_{size}"] = {"value": seconds * 1e3, "unit": "ms"}
+
+
+def load_previous() -> dict:
+    """读取上一次保存的结果"""
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    if not files:
+        return {}
+    with open(files[-1], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, dict]) -> str:
+    """保存本次结果，返回文件路径"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    now = datetime.now()
+    path = os.path.join(RESULTS_DIR, f"{now:%Y%m%d-%H%M%S}-v{__version__}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": __version__,
+            "timestamp": now.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def print_report(results: Dict[str, dict], previous: dict) -> None:
+    """打印结果表，附带与上一次结果的变化"""
+    baseline = previous.get("results", {})
+    if previous:
+        print(f"对比基线: v{previous.get('version')} ({previous.get('timestamp')})")
+    for name, result in results.items():
+        line = f"{name:<45} {result['value']:>14.2f} {result['unit']}"
+        old = baseline.get(name)
+        if old and old.get("value"):
+            change = (result["value"] - old["value"]) / old["value"] * 100
+            line += f"   ({change:+.1f}%)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="离线基准测试")
+    parser.add_argument("--skip-db", action="store_true", help="跳过数据库基准测试")
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1000, 10000, 50000],
+        help="数据库测试的表规模"
+    )
+    parser.add_argument("--no-save", action="store_true", help="不保存本次结果")
+    args = parser.parse_args()
+
+    results: Dict[str, dict] = {}
+    bench_feed_parse(results)
+    bench_fast_parse(results)
+    bench_extract(results)
+    bench_translate_parse(results)
+    if not args.skip_db:
+        try:
+            bench_database(results, args.sizes)
+        except Exception as e:
+            print(f"数据库基准测试已跳过: {str(e)}", file=sys.stderr)
+
+    print_report(results, load_previous())
+    if not args.no_save:
+        print(f"\n结果已保存到: {save_results(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,111 @@
 """主程序入口"""
-from src.rss_translator.ui import RSSTranslatorUI
+import argparse
+from datetime import datetime
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="RSS翻译器")
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="启用性能分析，退出时把报告写入PROFILE_DIR（也可设置PROFILE=1）"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    daemon_parser = subparsers.add_parser("daemon", help="无界面后台轮询所有RSS源")
+    daemon_parser.add_argument(
+        "urls", nargs="*",
+        help="要轮询的RSS源，默认使用RSS_URLS环境变量"
+    )
+    daemon_parser.add_argument(
+        "--metrics-port", type=int, default=None,
+        help="启动指标接口的端口（/metrics、/metrics.json），默认使用METRICS_PORT环境变量"
+    )
+    daemon_parser.add_argument(
+        "--metrics-json", default=None,
+        help="退出时把指标写入该JSON文件"
+    )
+
+    export_parser = subparsers.add_parser("export", help="把文章和总结导出为JSONL或CSV")
+    export_parser.add_argument("output", help="输出文件，\"-\"表示标准输出")
+    export_parser.add_argument(
+        "--format", choices=("jsonl", "csv"), default=None,
+        help="导出格式，默认根据文件扩展名推断"
+    )
+    export_parser.add_argument("--source", default=None, help="只导出指定RSS源的文章")
+    export_parser.add_argument(
+        "--since", type=datetime.fromisoformat, default=None,
+        help="只导出此时间之后创建的文章，例如 2024-01-01"
+    )
+    export_parser.add_argument(
+        "--until", type=datetime.fromisoformat, default=None,
+        help="只导出此时间之前创建的文章"
+    )
+    export_parser.add_argument("--batch-size", type=int, default=1000, help="每批读取的行数")
+
+    archive_parser = subparsers.add_parser("archive", help="执行数据保留策略：归档旧文章并删除过期归档")
+    archive_parser.add_argument(
+        "--days", type=int, default=None,
+        help="文章在热表中保留的天数，默认使用ARCHIVE_AFTER_DAYS环境变量"
+    )
+    archive_parser.add_argument(
+        "--retention-days", type=int, default=None,
+        help="文章总保留天数，默认使用RETENTION_DAYS环境变量"
+    )
+    return parser.parse_args()
+
 
 def main():
+    args = parse_args()
+
+    from src.rss_translator import config
+    profiler = None
+    if args.profile or config.PROFILE:
+        from src.rss_translator.profiling import Profiler
+        profiler = Profiler().start()
+    try:
+        run(args, profiler)
+    finally:
+        if profiler:
+            profiler.stop()
+
+
+def run(args, profiler=None):
+    """执行命令行指定的命令，默认启动界面"""
+    if args.command == "daemon":
+        from src.rss_translator import config
+        from src.rss_translator.daemon import run_daemon
+        run_daemon(
+            args.urls or None,
+            metrics_port=config.METRICS_PORT if args.metrics_port is None else args.metrics_port,
+            metrics_json=args.metrics_json
+        )
+        return
+
+    if args.command == "export":
+        from src.rss_translator.export import run_export
+        run_export(
+            args.output, fmt=args.format, source=args.source,
+            since=args.since, until=args.until, batch_size=args.batch_size
+        )
+        return
+
+    if args.command == "archive":
+        from src.rss_translator import config
+        from src.rss_translator.database.manager import DatabaseManager
+        db = DatabaseManager()
+        archived = db.archive_articles(config.ARCHIVE_AFTER_DAYS if args.days is None else args.days)
+        purged = db.purge_archive(
+            config.RETENTION_DAYS if args.retention_days is None else args.retention_days
+        )
+        print(f"✓ 归档{archived}篇文章，删除{purged}篇过期归档")
+        return
+
+    from src.rss_translator.ui import RSSTranslatorUI
     app = RSSTranslatorUI()
+    if profiler:
+        profiler.watch_tk(app.root)
     app.run()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main() 
@@ -0,0 +1,160 @@
+"""LLM后端路由模块
+
+支持配置多个OpenAI兼容的后端，每个后端可以为不同任务指定不同的模型
+（例如标题翻译用便宜快速的小模型，总结用大模型）。
+每次调用按任务筛选后端，再按实时测得的延迟和错误率选择最优的一个；
+连续失败的后端暂停使用一段时间，请求自动切换到其他后端。
+"""
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from openai import OpenAI
+from . import config
+from .metrics import metrics
+
+# 指数加权移动平均的权重
+LATENCY_ALPHA = 0.2
+ERROR_ALPHA = 0.1
+
+# 未单独配置模型的任务沿用的任务模型
+TASK_FALLBACK = {
+    "summarize_batch": "summarize",
+    "translate_stream": "translate",
+}
+
+
+class Backend:
+    """一个OpenAI兼容的后端及其实时统计"""
+
+    def __init__(self, name: str, client, model: Optional[str] = None,
+                 models: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Args:
+            name: 后端名称，用于日志和指标
+            client: OpenAI客户端
+            model: 默认模型，None表示只处理models中列出的任务
+            models: 任务 → 模型，值为None表示不处理该任务
+        """
+        self.name = name
+        self.client = client
+        self.model = model
+        self.models = models or {}
+        self.latency: Dict[str, float] = {}  # 任务 → 平均耗时（秒）
+        self.error_rate = 0.0
+        self.failures = 0                    # 连续失败次数
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def model_for(self, task: str) -> Optional[str]:
+        """该后端处理task使用的模型，不处理时返回None"""
+        if task not in self.models and task in TASK_FALLBACK:
+            task = TASK_FALLBACK[task]
+        return self.models.get(task, self.model)
+
+    def available(self, now: float) -> bool:
+        """是否不在暂停期内"""
+        return now >= self.cooldown_until
+
+    def score(self, task: str) -> float:
+        """路由评分，越小越好；从未调用过的后端评分为0，会被优先尝试"""
+        with self._lock:
+            latency = self.latency.get(task)
+            if latency is None:
+                # 只有失败记录的后端排在最后，靠随机探索恢复
+                return 0.0 if self.error_rate == 0 else float("inf")
+            return latency * (1 + 4 * self.error_rate)
+
+    def record(self, task: str, success: bool, seconds: float) -> None:
+        """记录一次调用结果"""
+        with self._lock:
+            self.error_rate += ERROR_ALPHA * ((0.0 if success else 1.0) - self.error_rate)
+            if success:
+                self.failures = 0
+                previous = self.latency.get(task)
+                self.latency[task] = seconds if previous is None else (
+                    previous + LATENCY_ALPHA * (seconds - previous)
+                )
+            else:
+                self.failures += 1
+                if self.failures >= config.LLM_BACKEND_FAILURES:
+                    self.cooldown_until = time.monotonic() + config.LLM_BACKEND_COOLDOWN
+            latency = self.latency.get(task)
+            error_rate = self.error_rate
+        metrics.inc("rss_llm_backend_requests_total", backend=self.name, task=task,
+                    result="ok" if success else "error")
+        metrics.set_gauge("rss_llm_backend_error_rate", error_rate, backend=self.name)
+        if latency is not None:
+            metrics.set_gauge("rss_llm_backend_latency_seconds", latency, backend=self.name, task=task)
+
+
+class BackendRouter:
+    """按任务、延迟和错误率在多个后端之间选择"""
+
+    def __init__(self, backends: List[Backend]):
+        if not backends:
+            raise ValueError("至少需要配置一个LLM后端")
+        self.backends = backends
+
+    def candidates(self, task: str) -> List[Backend]:
+        """能处理task的后端"""
+        return [backend for backend in self.backends if backend.model_for(task)]
+
+    def pick(self, task: str, exclude: Iterable[str] = ()) -> Backend:
+        """
+        为task选择后端
+
+        优先选择未被排除且不在暂停期的后端；都不可用时依次放宽条件，
+        保证总能返回一个后端。
+
+        Args:
+            task: 任务类型
+            exclude: 本次调用中已失败的后端名称
+        """
+        candidates = self.candidates(task)
+        if not candidates:
+            raise Exception(f"没有可处理{task}任务的LLM后端")
+        exclude = set(exclude)
+        now = time.monotonic()
+        preferred = [b for b in candidates if b.name not in exclude and b.available(now)]
+        if not preferred:
+            preferred = [b for b in candidates if b.name not in exclude] or candidates
+        if len(preferred) > 1 and random.random() < config.LLM_ROUTER_EXPLORE:
+            # 偶尔尝试非最优后端，保持其统计数据新鲜
+            return random.choice(preferred)
+        return min(preferred, key=lambda backend: backend.score(task))
+
+    def has_alternative(self, task: str, exclude: Iterable[str]) -> bool:
+        """除exclude外是否还有能处理task的后端"""
+        exclude = set(exclude)
+        return any(backend.name not in exclude for backend in self.candidates(task))
+
+
+def load_backends(api_key: str = config.DEEPSEEK_API_KEY,
+                  base_url: str = config.DEEPSEEK_BASE_URL) -> List[Backend]:
+    """
+    根据config.LLM_BACKENDS创建后端；未配置时使用单个后端（api_key、base_url和MODEL_NAME）
+
+    LLM_BACKENDS为JSON数组，每项包含 name、base_url、api_key（或api_key_env）、
+    model（默认模型）和可选的 models（任务 → 模型）。
+    """
+    specs = config.LLM_BACKENDS or [
+        {"name": "default", "base_url": base_url, "api_key": api_key, "model": config.MODEL_NAME}
+    ]
+    backends = []
+    for i, spec in enumerate(specs):
+        key = spec.get("api_key") or os.getenv(spec.get("api_key_env", ""), "") or api_key
+        client = OpenAI(
+            api_key=key,
+            base_url=spec.get("base_url", base_url),
+            # 重试由TranslationService统一处理（带截止时间和故障切换）
+            max_retries=0
+        )
+        backends.append(Backend(
+            spec.get("name") or f"backend{i + 1}",
+            client,
+            model=spec.get("model", config.MODEL_NAME),
+            models=spec.get("models")
+        ))
+    return backends
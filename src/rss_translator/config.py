@@ -17,13 +17,132 @@ if not DEEPSEEK_API_KEY:
     raise ValueError("请设置DEEPSEEK_API_KEY环境变量")
 
 # DeepSeek API配置（腾讯云）
-DEEPSEEK_BASE_URL = "https://api.lkeap.cloud.tencent.com/v1"
+DEEPSEEK_BASE_URL = os.getenv('DEEPSEEK_BASE_URL', "https://api.lkeap.cloud.tencent.com/v1")
+
+# 多个OpenAI兼容后端（JSON数组），未设置时使用上面的DeepSeek配置和MODEL_NAME，例如：
+# [{"name": "fast", "base_url": "...", "api_key_env": "FAST_API_KEY", "model": null, "models": {"translate": "small-model"}},
+#  {"name": "deepseek", "base_url": "...", "api_key_env": "DEEPSEEK_API_KEY", "model": "deepseek-v3"}]
+LLM_BACKENDS = json.loads(os.getenv('LLM_BACKENDS', '[]'))
+LLM_BACKEND_FAILURES = int(os.getenv('LLM_BACKEND_FAILURES', '3'))       # 连续失败多少次后暂停使用该后端
+LLM_BACKEND_COOLDOWN = float(os.getenv('LLM_BACKEND_COOLDOWN', '30'))    # 后端暂停使用的时长（秒）
+LLM_ROUTER_EXPLORE = float(os.getenv('LLM_ROUTER_EXPLORE', '0.05'))      # 随机选择非最优后端的概率
+
+# LLM调用的截止时间（秒），包含所有重试和对冲请求
+LLM_DEADLINES = {
+    "translate": float(os.getenv('LLM_TRANSLATE_DEADLINE', '60')),
+    "translate_paragraph": float(os.getenv('LLM_PARAGRAPH_DEADLINE', '60')),
+    "summarize": float(os.getenv('LLM_SUMMARIZE_DEADLINE', '120')),
+    "summarize_batch": float(os.getenv('LLM_SUMMARIZE_BATCH_DEADLINE', '180')),
+    "translate_stream": float(os.getenv('LLM_TRANSLATE_STREAM_DEADLINE', '60')),
+}
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))                 # 429/5xx/超时的最大重试次数
+LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', '1'))     # 首次重试的等待时间（秒），之后每次翻倍
+LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', '20'))      # 单次重试等待时间上限（秒）
+LLM_HEDGE = os.getenv('LLM_HEDGE', '0').lower() in ('1', 'true', 'yes')  # 是否启用对冲请求
+LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))    # 请求耗时超过该百分位时发出对冲请求
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))    # 计算百分位所需的最少样本数
+
+# 流式翻译标题：每个标题的译文生成后立即保存并显示，而不是等整批翻译完成
+TRANSLATE_STREAM = os.getenv('TRANSLATE_STREAM', '0').lower() in ('1', 'true', 'yes')
+TRANSLATE_STREAM_BATCH = int(os.getenv('TRANSLATE_STREAM_BATCH', '5'))                  # 累积多少个译文保存一次
+TRANSLATE_STREAM_FLUSH_INTERVAL = float(os.getenv('TRANSLATE_STREAM_FLUSH_INTERVAL', '0.25'))  # 或距上次保存超过多少秒
+
+# PostgreSQL数据库配置
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = os.getenv('DB_PORT', '2606')
+DB_USER = os.getenv('DB_USER', 'postgres')
+DB_PASSWORD = os.getenv('DB_PASSWORD', '260682')  # 请根据您的设置修改
+DB_NAME = os.getenv('DB_NAME', 'rss_articles')
 
 # RSS配置
 DEFAULT_RSS_URL = os.getenv('RSS_URL', "http://feeds.bbci.co.uk/news/rss.xml")
+# 后台轮询的RSS源列表（逗号分隔），默认只包含DEFAULT_RSS_URL
+RSS_URLS = [u.strip() for u in os.getenv('RSS_URLS', DEFAULT_RSS_URL).split(',') if u.strip()]
+ARTICLE_LIST_LIMIT = int(os.getenv('ARTICLE_LIST_LIMIT', '50'))  # 文章列表显示的最大文章数
 
 # 请求配置
 REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '0.5'))  # API请求间隔时间（秒）
+REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '30'))  # 获取RSS源和网页的超时时间（秒）
+
+# 流水线配置：各阶段工作线程数和阶段间队列容量
+PIPELINE_WORKERS = {
+    "fetch": int(os.getenv('PIPELINE_FETCH_WORKERS', '4')),
+    "parse": int(os.getenv('PIPELINE_PARSE_WORKERS', '1')),
+    "dedup": int(os.getenv('PIPELINE_DEDUP_WORKERS', '1')),
+    "translate": int(os.getenv('PIPELINE_TRANSLATE_WORKERS', '2')),
+    "persist": int(os.getenv('PIPELINE_PERSIST_WORKERS', '1')),
+}
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '8'))
+
+# 指标接口端口，0表示不启动（/metrics为Prometheus格式，/metrics.json为JSON格式）
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+# 后台轮询配置（秒）
+POLL_INITIAL_INTERVAL = float(os.getenv('POLL_INITIAL_INTERVAL', '900'))  # 首次轮询间隔
+POLL_MIN_INTERVAL = float(os.getenv('POLL_MIN_INTERVAL', '120'))          # 最短轮询间隔
+POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '21600'))        # 最长轮询间隔（6小时）
+POLL_IDLE_FACTOR = 1.5    # 没有新文章时间隔的放大倍数
+POLL_JITTER = 0.1         # 间隔随机抖动比例（±10%）
+POLL_SMOOTHING = 0.5      # 发布速率估计的平滑系数
+
+# 去重配置
+DEDUP_WINDOW = int(os.getenv('DEDUP_WINDOW', '5000'))                    # 近似重复检测比较的最近文章数
+TITLE_SIMHASH_DISTANCE = int(os.getenv('TITLE_SIMHASH_DISTANCE', '6'))  # 标题指纹允许的最大汉明距离
+
+# 性能分析配置（也可用 main.py --profile 启用）
+PROFILE = os.getenv('PROFILE', '0').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')                            # 报告保存目录
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.01'))  # 调用栈采样间隔（秒）
+PROFILE_UI_LAG_MS = float(os.getenv('PROFILE_UI_LAG_MS', '200'))              # 界面主循环阻塞多久记为卡顿（毫秒）
+
+# 网页正文提取使用的进程数，0表示在调用线程中提取
+EXTRACT_PROCESSES = int(os.getenv('EXTRACT_PROCESSES', '0'))
+
+# 全文翻译时并发翻译的段落数
+PARAGRAPH_WORKERS = int(os.getenv('PARAGRAPH_WORKERS', '4'))
+
+# 数据库读缓存配置
+DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', '2000'))      # 单篇文章/总结缓存的最大条目数
+DB_CACHE_SOURCES = int(os.getenv('DB_CACHE_SOURCES', '64'))  # 按源文章列表缓存的最大条目数
+DB_CACHE_TTL = float(os.getenv('DB_CACHE_TTL', '300'))       # 缓存有效期（秒）
+
+# 数据库变更通知频道（LISTEN/NOTIFY），共用同一数据库的实例通过它同步新文章和总结
+NOTIFY_CHANNEL = os.getenv('NOTIFY_CHANNEL', 'rss_articles')
+
+# 后台任务队列配置
+JOB_LEASE = float(os.getenv('JOB_LEASE', '300'))                  # 任务租约时长（秒），超时后可被其他实例重新认领
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))        # 任务最大尝试次数
+JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', '30'))       # 失败重试的初始延迟（秒），每次翻倍
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '5'))    # 没有任务时的检查间隔（秒）
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))                  # 后台服务中执行任务的线程数
+
+# 延迟写入：桌面程序保存文章和总结时先写入内存队列和本地日志，后台批量提交到数据库
+WRITE_BEHIND = os.getenv('WRITE_BEHIND', '0').lower() in ('1', 'true', 'yes')
+WRITE_BEHIND_JOURNAL = os.getenv(
+    'WRITE_BEHIND_JOURNAL', os.path.join(os.path.dirname(__file__), "write_behind.jsonl")
+)                                                                           # 未提交写入的日志文件，重启后恢复
+WRITE_BEHIND_MAX_ITEMS = int(os.getenv('WRITE_BEHIND_MAX_ITEMS', '50'))    # 待写入条目达到此数量时立即提交
+WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', '1'))     # 最长提交间隔（秒）
+WRITE_BEHIND_MAX_FAILURES = int(os.getenv('WRITE_BEHIND_MAX_FAILURES', '5'))  # 同一条写入连续提交失败多少次后丢弃
+
+# 懒加载翻译：桌面程序刷新时不翻译标题，文章列表滚动到可见区域时再小批量翻译
+LAZY_TRANSLATE = os.getenv('LAZY_TRANSLATE', '0').lower() in ('1', 'true', 'yes')
+LAZY_TRANSLATE_BATCH = int(os.getenv('LAZY_TRANSLATE_BATCH', '10'))        # 每次请求翻译的标题数
+LAZY_TRANSLATE_PREFETCH = int(os.getenv('LAZY_TRANSLATE_PREFETCH', '10'))  # 额外预取可见区域下方的行数
+LAZY_TRANSLATE_RETRY_DELAY = float(os.getenv('LAZY_TRANSLATE_RETRY_DELAY', '5'))  # 翻译失败后重试的初始延迟（秒），每次翻倍
+LAZY_TRANSLATE_MAX_RETRIES = int(os.getenv('LAZY_TRANSLATE_MAX_RETRIES', '5'))    # 同一标题最多失败几次后不再自动重试
+
+# RSS源提供的正文（content:encoded、description等）达到此长度时，总结直接使用它，不再抓取网页
+FEED_CONTENT_MIN_CHARS = int(os.getenv('FEED_CONTENT_MIN_CHARS', '800'))
+
+# 批量总结配置：后台一次认领多个总结任务，短文章合并到一次LLM请求中总结
+SUMMARY_BATCH_SIZE = int(os.getenv('SUMMARY_BATCH_SIZE', '5'))              # 每次最多合并的文章数，1表示不合并
+SUMMARY_BATCH_MAX_CHARS = int(os.getenv('SUMMARY_BATCH_MAX_CHARS', '4000'))  # 正文不超过此长度的文章才参与合并
+
+# 数据保留配置
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '0'))       # 文章在热表中保留的天数，0表示不归档（默认）
+RETENTION_DAYS = int(os.getenv('RETENTION_DAYS', '0'))               # 文章总保留天数，超过后从归档中删除，0表示永久保留
+ARCHIVE_INTERVAL = float(os.getenv('ARCHIVE_INTERVAL', '21600'))    # 后台服务执行保留策略的间隔（秒）
 
 # 窗口状态配置文件路径
 WINDOW_STATE_FILE = os.path.join(os.path.dirname(__file__), "window_state.json")
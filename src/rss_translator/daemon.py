@@ -0,0 +1,185 @@
+"""后台轮询服务模块（无界面运行）"""
+import heapq
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from . import config
+from .jobs import JobWorker
+from .metrics import metrics, start_metrics_server
+from .pipeline import IngestPipeline
+from .rss_reader import RSSReader
+from .translator import TranslationService
+
+
+class FeedSchedule:
+    """单个RSS源的轮询状态"""
+
+    def __init__(self, url: str, interval: float):
+        self.url = url
+        self.interval = interval          # 当前轮询间隔（秒）
+        self.next_run = 0.0               # 下次轮询时间（time.monotonic）
+        self.started = 0.0                # 本次轮询开始时间
+        self.last_success: Optional[float] = None  # 上次成功轮询时间
+        self.errors = 0                   # 连续失败次数
+
+    def __lt__(self, other: "FeedSchedule") -> bool:
+        return self.next_run < other.next_run
+
+
+class PollingDaemon:
+    """
+    按各RSS源的发布速率自适应调整轮询间隔的后台服务
+
+    - 有新文章时，按观察到的平均发布间隔收敛轮询间隔
+    - 没有新文章时，逐步放大间隔，长期不更新的源几乎不产生开销
+    - 失败时按指数退避重试
+    - 所有间隔都带随机抖动，避免多个源同时请求
+    """
+
+    def __init__(self, reader: RSSReader, urls: Optional[List[str]] = None):
+        self.reader = reader
+        self.urls = urls or config.RSS_URLS
+        self.schedules: Dict[str, FeedSchedule] = {}
+        self._heap: List[FeedSchedule] = []
+        self._stopping = False
+        self._wakeup = threading.Condition()
+        # 到期的源提交给流水线并发处理，完成后在回调中重新排期
+        self.pipeline = IngestPipeline(reader, on_complete=self._on_feed_done)
+        # 执行桌面程序等实例提交的总结任务
+        self.job_worker = JobWorker(reader)
+
+        now = time.monotonic()
+        for url in self.urls:
+            schedule = FeedSchedule(url, config.POLL_INITIAL_INTERVAL)
+            schedule.next_run = now
+            self.schedules[url] = schedule
+            heapq.heappush(self._heap, schedule)
+
+    def stop(self) -> None:
+        """请求停止轮询"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+
+    def run(self) -> None:
+        """运行轮询循环，直到调用stop()"""
+        self._log(f"后台轮询已启动，共{len(self.schedules)}个RSS源")
+        self.pipeline.start()
+        self.job_worker.start()
+        if config.ARCHIVE_AFTER_DAYS > 0 or config.RETENTION_DAYS > 0:
+            threading.Thread(target=self._maintenance_loop, name="retention", daemon=True).start()
+        try:
+            while True:
+                with self._wakeup:
+                    if self._stopping:
+                        break
+                    delay = self._heap[0].next_run - time.monotonic() if self._heap else None
+                    if delay is None or delay > 0:
+                        # 没有到期的源，等待到期或有源处理完成
+                        self._wakeup.wait(delay)
+                        continue
+                    schedule = heapq.heappop(self._heap)
+                    schedule.started = time.monotonic()
+
+                # 流水线已满时在这里阻塞（背压），不持有锁
+                self.pipeline.submit(schedule.url)
+        finally:
+            self.pipeline.stop()
+            self.job_worker.stop()
+        self._log("后台轮询已停止")
+
+    def _on_feed_done(self, url: str, new_count: Optional[int]) -> None:
+        """流水线处理完一个源后，计算下次轮询时间并放回队列"""
+        with self._wakeup:
+            schedule = self.schedules[url]
+            self._reschedule(schedule, new_count)
+            heapq.heappush(self._heap, schedule)
+            self._wakeup.notify_all()
+
+    def _reschedule(self, schedule: FeedSchedule, new_count: Optional[int]) -> None:
+        """根据本次轮询结果安排下次轮询"""
+        if new_count is None:
+            schedule.errors += 1
+            interval = min(
+                schedule.interval * (2 ** schedule.errors),
+                config.POLL_MAX_INTERVAL
+            )
+        else:
+            schedule.errors = 0
+            self._adapt_interval(schedule, new_count, schedule.started)
+            schedule.last_success = schedule.started
+            interval = schedule.interval
+
+        interval *= 1 + random.uniform(-config.POLL_JITTER, config.POLL_JITTER)
+        schedule.next_run = time.monotonic() + interval
+        self._log(
+            f"{schedule.url}: 新文章{new_count if new_count is not None else '-'}篇，"
+            f"{interval:.0f}秒后再次检查"
+        )
+
+    def _adapt_interval(self, schedule: FeedSchedule, new_count: int, now: float) -> None:
+        """根据两次轮询之间观察到的新文章数量调整轮询间隔"""
+        if schedule.last_success is None:
+            # 首次轮询会把历史文章一次性导入，不能作为发布速率的依据
+            return
+
+        if new_count > 0:
+            # 平均发布间隔，轮询间隔向其收敛
+            observed_gap = (now - schedule.last_success) / new_count
+            interval = (
+                config.POLL_SMOOTHING * observed_gap
+                + (1 - config.POLL_SMOOTHING) * schedule.interval
+            )
+        else:
+            interval = schedule.interval * config.POLL_IDLE_FACTOR
+
+        schedule.interval = max(config.POLL_MIN_INTERVAL, min(interval, config.POLL_MAX_INTERVAL))
+
+    def _maintenance_loop(self) -> None:
+        """定期执行数据保留策略（归档旧文章、删除过期归档）"""
+        while True:
+            try:
+                archived, purged = self.reader.db.apply_retention()
+                if archived or purged:
+                    self._log(f"保留策略: 归档{archived}篇文章，删除{purged}篇过期归档")
+            except Exception as e:
+                self._log(f"✗ 执行保留策略失败: {str(e)}")
+            with self._wakeup:
+                if self._wakeup.wait_for(lambda: self._stopping, config.ARCHIVE_INTERVAL):
+                    return
+
+    def _log(self, message: str) -> None:
+        """输出带时间戳的日志"""
+        print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}")
+
+
+def run_daemon(urls: Optional[List[str]] = None, metrics_port: int = config.METRICS_PORT,
+               metrics_json: Optional[str] = None) -> None:
+    """
+    启动后台轮询服务，收到SIGINT/SIGTERM时退出
+    
+    Args:
+        urls: 要轮询的RSS源，默认使用config.RSS_URLS
+        metrics_port: 指标接口端口，0表示不启动
+        metrics_json: 退出时把指标写入该JSON文件
+    """
+    if metrics_port:
+        start_metrics_server(metrics_port)
+    
+    reader = RSSReader(TranslationService())
+    reader.set_log_callback(print)
+    daemon = PollingDaemon(reader, urls)
+
+    def handle_signal(signum, frame):
+        daemon.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    try:
+        daemon.run()
+    finally:
+        if metrics_json:
+            metrics.dump_json(metrics_json)
@@ -0,0 +1,86 @@
+"""数据库变更监听模块
+
+save_articles和update_article_summary在写入的同一事务中发送NOTIFY，
+事务提交后所有LISTEN该频道的实例（包括其他机器上的界面）立即收到变更。
+"""
+import json
+import select
+import threading
+from typing import Callable, Optional
+import psycopg2
+import psycopg2.extensions
+from .. import config
+
+
+class ChangeListener:
+    """在后台线程中LISTEN数据库通知，把每条变更事件交给回调"""
+
+    def __init__(self, conn_params: dict, callback: Callable[[dict], None],
+                 channel: str = config.NOTIFY_CHANNEL):
+        """
+        Args:
+            conn_params: psycopg2连接参数
+            callback: 事件回调，在监听线程中调用，参数为解析后的事件字典；
+                      连接中断重连后会收到 {"type": "reconnect"}，此时应重新加载数据
+            channel: 通知频道名
+        """
+        self.conn_params = dict(conn_params)
+        self.callback = callback
+        self.channel = channel
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ChangeListener":
+        """启动监听线程"""
+        self._thread = threading.Thread(target=self._run, name="db-listener", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止监听"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        delay = 1
+        connected_before = False
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.conn_params)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                delay = 1
+                if connected_before:
+                    # 断线期间的通知已丢失，通知调用方重新加载
+                    self._dispatch({"type": "reconnect"})
+                connected_before = True
+                self._listen(conn)
+            except psycopg2.Error as e:
+                print(f"数据库变更监听中断: {str(e)}，{delay}秒后重连")
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, 60)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _listen(self, conn) -> None:
+        while not self._stop_event.is_set():
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    event = json.loads(notify.payload)
+                except ValueError:
+                    continue
+                self._dispatch(event)
+
+    def _dispatch(self, event: dict) -> None:
+        try:
+            self.callback(event)
+        except Exception as e:
+            print(f"处理数据库变更事件出错: {str(e)}")
@@ -1,19 +1,38 @@
 """数据库管理器"""
+import json
+import zlib
 import psycopg2
-from datetime import datetime
-from typing import List, Optional
-from .models import Article
+from psycopg2.extras import execute_values
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from .cache import MISSING, LRUCache
+from .models import Article, Job
+from .write_behind import WriteBehindBuffer
+from .. import config
+from ..metrics import metrics
 
 class DatabaseManager:
-    def __init__(self):
-        """初始化数据库管理器"""
+    def __init__(self, dbname: str = config.DB_NAME):
+        """
+        初始化数据库管理器
+        
+        Args:
+            dbname: 文章数据库名称，不存在时自动创建
+        """
+        self.dbname = dbname
         self.conn_params = {
             "dbname": "postgres",  # 默认数据库
-            "user": "postgres",
-            "password": "260682",  # 请根据您的设置修改
-            "host": "localhost",
-            "port": "2606"
+            "user": config.DB_USER,
+            "password": config.DB_PASSWORD,
+            "host": config.DB_HOST,
+            "port": config.DB_PORT
         }
+        # 读穿透缓存：单篇文章、文章总结、按源的文章列表
+        self._article_cache = LRUCache(config.DB_CACHE_SIZE, config.DB_CACHE_TTL)
+        self._summary_cache = LRUCache(config.DB_CACHE_SIZE, config.DB_CACHE_TTL)
+        self._source_cache = LRUCache(config.DB_CACHE_SOURCES, config.DB_CACHE_TTL)
+        # 延迟写入队列，调用enable_write_behind()后启用
+        self.write_behind: Optional[WriteBehindBuffer] = None
         self.init_database()
 
     def init_database(self):
@@ -23,16 +42,16 @@ class DatabaseManager:
         conn.autocommit = True  # 设置自动提交
         try:
             with conn.cursor() as cur:
-                # 检查rss_articles数据库是否存在
-                cur.execute("SELECT 1 FROM pg_database WHERE datname='rss_articles'")
+                # 检查文章数据库是否存在
+                cur.execute("SELECT 1 FROM pg_database WHERE datname=%s", (self.dbname,))
                 if not cur.fetchone():
                     # 创建数据库
-                    cur.execute("CREATE DATABASE rss_articles")
+                    cur.execute(f'CREATE DATABASE "{self.dbname}"')
         finally:
             conn.close()
 
         # 更新连接参数到新数据库
-        self.conn_params["dbname"] = "rss_articles"
+        self.conn_params["dbname"] = self.dbname
 
         # 创建表和更新表结构
         conn = psycopg2.connect(**self.conn_params)
@@ -52,58 +71,316 @@ class DatabaseManager:
                 """)
                 
                 # 检查并添加summary字段
-                cur.execute("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name='articles' AND column_name='summary'
-                """)
-                if not cur.fetchone():
-                    print("添加summary字段到articles表...")
-                    cur.execute("""
-                        ALTER TABLE articles 
-                        ADD COLUMN summary TEXT
-                    """)
+                self._ensure_column(cur, "summary", "TEXT")
+                
+                # 跨源去重相关字段
+                self._ensure_column(cur, "canonical_url", "TEXT")
+                self._ensure_column(cur, "title_simhash", "BIGINT")
+                self._ensure_column(cur, "duplicate_of", "INTEGER")
+                
+                # RSS条目信息
+                self._ensure_column(cur, "guid", "TEXT")
+                self._ensure_column(cur, "published_at", "TIMESTAMP")
+                # RSS源提供的正文，足够长时总结直接使用，不再抓取网页
+                self._ensure_column(cur, "feed_content", "TEXT")
                 
                 # 创建URL唯一索引以实现去重
                 cur.execute("""
                     CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_url 
                     ON articles(url)
                 """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_articles_canonical_url
+                    ON articles(canonical_url)
+                """)
+                # 文章列表按时间倒序查询
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_articles_created_at
+                    ON articles(created_at DESC)
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_articles_source_created_at
+                    ON articles(source, created_at DESC)
+                """)
+                
+                # 归档表：存放超过保留期的旧文章，总结使用zlib压缩
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS articles_archive (
+                        id INTEGER PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        translated_title TEXT,
+                        url TEXT UNIQUE NOT NULL,
+                        source TEXT,
+                        summary_compressed BYTEA,
+                        created_at TIMESTAMP,
+                        canonical_url TEXT,
+                        duplicate_of INTEGER,
+                        guid TEXT,
+                        published_at TIMESTAMP,
+                        archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_articles_archive_created_at
+                    ON articles_archive(created_at)
+                """)
+                
+                # 段落译文缓存：全文翻译时按段落内容哈希复用已有译文
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS paragraph_translations (
+                        hash TEXT PRIMARY KEY,
+                        translation TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # RSS源状态：上次获取时已保存的条目指纹，指纹未变的条目刷新时直接跳过
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS feed_state (
+                        source TEXT PRIMARY KEY,
+                        fingerprints TEXT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # 任务表：多个实例通过SKIP LOCKED认领任务，租约过期的任务可被重新认领
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id SERIAL PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        payload TEXT,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        worker TEXT,
+                        lease_until TIMESTAMP,
+                        run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_error TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE (kind, key)
+                    )
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_claimable
+                    ON jobs(kind, run_after) WHERE status IN ('pending', 'running')
+                """)
                 conn.commit()
         finally:
             conn.close()
 
-    def save_articles(self, articles: List[Article]) -> None:
+    def _ensure_column(self, cur, column: str, definition: str) -> None:
+        """检查articles表是否存在指定字段，不存在则添加"""
+        cur.execute("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name='articles' AND column_name=%s
+        """, (column,))
+        if not cur.fetchone():
+            print(f"添加{column}字段到articles表...")
+            cur.execute(f"ALTER TABLE articles ADD COLUMN {column} {definition}")
+
+    def enable_write_behind(self, journal_path: str = config.WRITE_BEHIND_JOURNAL) -> None:
         """
-        保存文章列表，自动去重
+        启用延迟写入：save_articles和update_article_summary只排队，由后台线程批量提交
+        
+        Args:
+            journal_path: 未提交写入的本地日志文件，启用时会恢复其中上次未提交的写入
+        """
+        if self.write_behind is None:
+            self.write_behind = WriteBehindBuffer(self, journal_path).start()
+
+    def close(self) -> None:
+        """提交延迟写入队列中剩余的写入"""
+        if self.write_behind is not None:
+            self.write_behind.close()
+            self.write_behind = None
+
+    def save_articles(self, articles: List[Article],
+                      on_saved: Optional[Callable[[List[Article]], None]] = None) -> None:
+        """
+        保存文章列表，自动去重；启用延迟写入时只排队，稍后批量提交
         
         Args:
             articles: 文章对象列表
+            on_saved: 文章写入数据库后调用，参数为已写入的文章；启用延迟写入时在提交成功后
+                由后台线程调用，文章因连续提交失败被丢弃时不调用
         """
+        if self.write_behind is not None:
+            self.write_behind.save_articles(articles, on_saved)
+            return
+        self.write_articles(articles)
+        if on_saved is not None:
+            on_saved(articles)
+
+    def write_articles(self, articles: List[Article]) -> None:
+        """
+        在一个事务中保存文章列表，自动去重
+        
+        已存在的文章（同一URL）更新标题等信息，但保留首次保存的创建时间，
+        新数据没有总结时也保留已有总结。每篇文章在单独的保存点中写入，
+        某一篇写入失败时只跳过该篇，不会使整个事务失败。
+        
+        Args:
+            articles: 文章对象列表
+        """
+        # 每个RSS源新写入的文章ID，提交时通过NOTIFY通知其他实例
+        saved_ids = {}
         with psycopg2.connect(**self.conn_params) as conn:
             with conn.cursor() as cur:
                 for article in articles:
                     try:
+                        cur.execute("SAVEPOINT save_article")
                         cur.execute("""
-                            INSERT INTO articles (title, translated_title, url, source, summary, created_at)
-                            VALUES (%s, %s, %s, %s, %s, %s)
+                            INSERT INTO articles (title, translated_title, url, source, summary, created_at,
+                                                  canonical_url, title_simhash, duplicate_of,
+                                                  guid, published_at, feed_content)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                             ON CONFLICT (url) DO UPDATE 
                             SET translated_title = EXCLUDED.translated_title,
                                 title = EXCLUDED.title,
                                 source = EXCLUDED.source,
-                                summary = EXCLUDED.summary,
-                                created_at = EXCLUDED.created_at
+                                summary = COALESCE(EXCLUDED.summary, articles.summary),
+                                canonical_url = EXCLUDED.canonical_url,
+                                title_simhash = EXCLUDED.title_simhash,
+                                duplicate_of = EXCLUDED.duplicate_of,
+                                guid = EXCLUDED.guid,
+                                published_at = EXCLUDED.published_at,
+                                feed_content = COALESCE(EXCLUDED.feed_content, articles.feed_content)
+                            RETURNING id
                         """, (
                             article.title,
                             article.translated_title,
                             article.url,
                             article.source,
                             article.summary,
-                            article.created_at
+                            article.created_at,
+                            article.canonical_url,
+                            article.title_simhash,
+                            article.duplicate_of,
+                            article.guid,
+                            article.published_at,
+                            article.feed_content
                         ))
+                        saved_ids.setdefault(article.source, []).append(cur.fetchone()[0])
+                        cur.execute("RELEASE SAVEPOINT save_article")
                     except Exception as e:
                         print(f"保存文章时出错: {str(e)}")
+                        cur.execute("ROLLBACK TO SAVEPOINT save_article")
                         continue
+                self._notify_articles(cur, saved_ids)
+                conn.commit()
+        self.invalidate([article.url for article in articles],
+                        {article.source for article in articles})
+
+    def _notify(self, cur, event: dict) -> None:
+        """在当前事务中发送变更通知，事务提交后送达"""
+        cur.execute("SELECT pg_notify(%s, %s)", (config.NOTIFY_CHANNEL, json.dumps(event)))
+
+    def _notify_articles(self, cur, ids_by_source: Dict[str, List[int]]) -> None:
+        """按RSS源发送文章变更通知"""
+        for source, ids in ids_by_source.items():
+            # NOTIFY负载上限约8000字节，ID较多时分批发送
+            for offset in range(0, len(ids), 500):
+                self._notify(cur, {
+                    "type": "articles",
+                    "source": source,
+                    "ids": ids[offset:offset + 500]
+                })
+
+    def update_translated_titles(self, translations: List[Tuple[str, str, str]]) -> int:
+        """
+        在一个事务中保存多篇文章的标题译文，并发送文章变更通知
+        
+        Args:
+            translations: (URL, 原标题, 译文) 列表；原标题已变化的文章不更新
+            
+        Returns:
+            int: 更新的文章数量
+        """
+        if not translations:
+            return 0
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                rows = execute_values(cur, """
+                    UPDATE articles AS a
+                    SET translated_title = v.translated_title
+                    FROM (VALUES %s) AS v(url, title, translated_title)
+                    WHERE a.url = v.url AND a.title = v.title
+                    RETURNING a.id, a.source, a.url
+                """, translations, fetch=True)
+                ids_by_source = {}
+                for article_id, source, _ in rows:
+                    ids_by_source.setdefault(source, []).append(article_id)
+                self._notify_articles(cur, ids_by_source)
+                conn.commit()
+        self.invalidate([row[2] for row in rows], set(ids_by_source))
+        return len(rows)
+
+    def invalidate(self, urls: List[str], sources: Set[str]) -> None:
+        """使指定文章和RSS源的缓存失效"""
+        for url in urls:
+            self._article_cache.invalidate(url)
+            self._summary_cache.invalidate(url)
+        self._source_cache.invalidate_where(lambda key, _: key[0] in sources)
+
+    def invalidate_ids(self, ids: List[int], source: str) -> None:
+        """
+        按文章ID使缓存失效，不必先查询文章URL
+        
+        缓存的"文章不存在"和"无总结"结果可能对应这些新文章，一并清除
+        """
+        ids = set(ids)
+        self._article_cache.invalidate_where(lambda key, value: value is None or value.id in ids)
+        self._summary_cache.invalidate_where(lambda key, value: value is None)
+        self._source_cache.invalidate_where(lambda key, _: key[0] == source)
+
+    def invalidate_summary(self, url: str) -> None:
+        """文章总结更新后使相关缓存失效"""
+        self._article_cache.invalidate(url)
+        # 近似重复文章会继承原文章的总结，清除所有缓存的"无总结"结果
+        self._summary_cache.invalidate_where(
+            lambda key, value: key == url or value is None
+        )
+
+    def clear_cache(self) -> None:
+        """清空所有读缓存（例如在其他进程修改了数据库之后）"""
+        self._article_cache.clear()
+        self._summary_cache.clear()
+        self._source_cache.clear()
+
+    def get_feed_state(self, source: str) -> Set[str]:
+        """
+        获取RSS源上次获取时已保存的条目指纹
+        
+        Args:
+            source: RSS源URL
+            
+        Returns:
+            Set[str]: 条目指纹集合，从未获取过时为空集合
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT fingerprints FROM feed_state WHERE source = %s", (source,))
+                row = cur.fetchone()
+        return set(json.loads(row[0])) if row else set()
+
+    def save_feed_state(self, source: str, fingerprints: Set[str]) -> None:
+        """
+        保存RSS源当前已保存的条目指纹
+        
+        Args:
+            source: RSS源URL
+            fingerprints: 条目指纹集合
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO feed_state (source, fingerprints) VALUES (%s, %s)
+                    ON CONFLICT (source) DO UPDATE
+                    SET fingerprints = EXCLUDED.fingerprints,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (source, json.dumps(sorted(fingerprints))))
                 conn.commit()
 
     def get_articles(self, limit: int = 50) -> List[Article]:
@@ -137,12 +414,81 @@ class DatabaseManager:
                     for row in cur.fetchall()
                 ]
 
-    def get_article_summary(self, url: str) -> Optional[str]:
+    def get_article_summary(self, url: str, cached: bool = True) -> Optional[str]:
         """
         获取文章总结
         
         Args:
             url: 文章URL
+            cached: 是否允许使用缓存结果
+            
+        Returns:
+            Optional[str]: 文章总结，如果不存在则返回None
+        """
+        if self.write_behind is not None:
+            # 尚未提交的总结
+            pending = self.write_behind.pending_summary(url)
+            if pending:
+                return pending
+        summary = MISSING
+        if cached:
+            summary = self._summary_cache.get(url)
+            metrics.cache("db_summary", summary is not MISSING)
+        if summary is MISSING:
+            summary = self._load_article_summary(url)
+            self._summary_cache.set(url, summary)
+        return summary
+
+    def _load_article_summary(self, url: str) -> Optional[str]:
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                # 只有同一篇文章（规范化URL或标题相同）才复用原文章的总结，
+                # 仅标题近似的文章可能是另一条新闻
+                cur.execute("""
+                    SELECT COALESCE(a.summary, o.summary)
+                    FROM articles a
+                    LEFT JOIN articles o ON o.id = a.duplicate_of
+                        AND (o.canonical_url = a.canonical_url OR lower(o.title) = lower(a.title))
+                    WHERE a.url = %s
+                """, (url,))
+                
+                row = cur.fetchone()
+                if row:
+                    return row[0]
+                return self._load_archived_summary(cur, url)
+
+    def _load_archived_summary(self, cur, url: str) -> Optional[str]:
+        """从归档表读取并解压文章总结"""
+        cur.execute("""
+            SELECT summary_compressed FROM articles_archive WHERE url = %s
+        """, (url,))
+        row = cur.fetchone()
+        if row and row[0] is not None:
+            return _decompress(row[0])
+        return None
+
+    def get_feed_content(self, url: str) -> Optional[str]:
+        """
+        获取RSS源为文章提供的正文
+        
+        Args:
+            url: 文章URL
+            
+        Returns:
+            Optional[str]: 正文纯文本，源中没有提供时返回None
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT feed_content FROM articles WHERE url = %s", (url,))
+                row = cur.fetchone()
+        return row[0] if row else None
+
+    def find_summary_by_canonical_url(self, canonical_url: str) -> Optional[str]:
+        """
+        通过规范化URL查找同一篇文章已有的总结
+        
+        Args:
+            canonical_url: 规范化后的文章URL
             
         Returns:
             Optional[str]: 文章总结，如果不存在则返回None
@@ -152,12 +498,165 @@ class DatabaseManager:
                 cur.execute("""
                     SELECT summary
                     FROM articles
-                    WHERE url = %s
-                """, (url,))
+                    WHERE (canonical_url = %s OR url = %s) AND summary IS NOT NULL
+                    LIMIT 1
+                """, (canonical_url, canonical_url))
                 
                 row = cur.fetchone()
                 return row[0] if row else None
 
+    def find_articles_by_urls(self, urls: List[str], canonical_urls: List[str]) -> List[Article]:
+        """
+        按原始URL或规范化URL查找已存在的文章（不区分RSS源）
+        
+        Args:
+            urls: 原始URL列表
+            canonical_urls: 规范化URL列表
+            
+        Returns:
+            List[Article]: 匹配的文章对象列表
+        """
+        if not urls and not canonical_urls:
+            return []
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, title, translated_title, url, source, created_at,
+                           canonical_url, duplicate_of
+                    FROM articles
+                    WHERE url = ANY(%s) OR canonical_url = ANY(%s)
+                """, (list(urls), list(canonical_urls)))
+                
+                return [
+                    Article(
+                        id=row[0],
+                        title=row[1],
+                        translated_title=row[2],
+                        url=row[3],
+                        source=row[4],
+                        created_at=row[5],
+                        canonical_url=row[6],
+                        duplicate_of=row[7]
+                    )
+                    for row in cur.fetchall()
+                ]
+
+    def iter_articles(self, source: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Article]:
+        """
+        按创建时间顺序逐条读取文章，用于大批量导出
+        
+        使用服务器端命名游标分批获取，内存占用与表大小无关。
+        
+        Args:
+            source: 只读取指定RSS源的文章
+            since: 只读取此时间（含）之后创建的文章
+            until: 只读取此时间之前创建的文章
+            batch_size: 每次从服务器获取的行数
+            
+        Yields:
+            Article: 文章对象
+        """
+        conditions = []
+        params = []
+        if source:
+            conditions.append("source = %s")
+            params.append(source)
+        if since:
+            conditions.append("created_at >= %s")
+            params.append(since)
+        if until:
+            conditions.append("created_at < %s")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = psycopg2.connect(**self.conn_params)
+        try:
+            # 命名游标在服务器端执行查询，fetchmany每次只传输一批数据
+            with conn.cursor(name="export_articles") as cur:
+                cur.itersize = batch_size
+                cur.execute(f"""
+                    SELECT id, title, translated_title, url, source, created_at, summary,
+                           canonical_url, duplicate_of, guid, published_at
+                    FROM articles
+                    {where}
+                    ORDER BY created_at, id
+                """, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield Article(
+                            id=row[0],
+                            title=row[1],
+                            translated_title=row[2],
+                            url=row[3],
+                            source=row[4],
+                            created_at=row[5],
+                            summary=row[6],
+                            canonical_url=row[7],
+                            duplicate_of=row[8],
+                            guid=row[9],
+                            published_at=row[10]
+                        )
+        finally:
+            conn.close()
+
+    def get_articles_by_ids(self, ids: List[int]) -> List[Article]:
+        """
+        按ID获取文章，按创建时间倒序排列
+        
+        Args:
+            ids: 文章ID列表
+            
+        Returns:
+            List[Article]: 文章对象列表
+        """
+        if not ids:
+            return []
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, title, translated_title, url, source, created_at
+                    FROM articles
+                    WHERE id = ANY(%s)
+                    ORDER BY created_at DESC
+                """, (list(ids),))
+                
+                return [
+                    Article(
+                        id=row[0],
+                        title=row[1],
+                        translated_title=row[2],
+                        url=row[3],
+                        source=row[4],
+                        created_at=row[5]
+                    )
+                    for row in cur.fetchall()
+                ]
+
+    def get_recent_title_hashes(self, limit: int) -> List[Tuple[int, int, str, Optional[str]]]:
+        """
+        获取最近文章的标题指纹，用于近似重复检测
+        
+        Args:
+            limit: 返回的最大文章数量
+            
+        Returns:
+            List[Tuple[int, int, str, Optional[str]]]: (文章ID, 标题指纹, 原标题, 翻译后的标题) 列表
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT COALESCE(duplicate_of, id), title_simhash, title, translated_title
+                    FROM articles
+                    WHERE title_simhash IS NOT NULL
+                    ORDER BY created_at DESC
+                    LIMIT %s
+                """, (limit,))
+                return cur.fetchall()
+
     def get_article_by_url(self, url: str) -> Optional[Article]:
         """
         通过URL获取文章
@@ -168,6 +667,14 @@ class DatabaseManager:
         Returns:
             Optional[Article]: 文章对象，如果不存在则返回None
         """
+        article = self._article_cache.get(url)
+        metrics.cache("db_article", article is not MISSING)
+        if article is MISSING:
+            article = self._load_article_by_url(url)
+            self._article_cache.set(url, article)
+        return article
+
+    def _load_article_by_url(self, url: str) -> Optional[Article]:
         with psycopg2.connect(**self.conn_params) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -187,9 +694,27 @@ class DatabaseManager:
                         created_at=row[5],
                         summary=row[6]
                     )
+                
+                # 不在热表中时查找归档表
+                cur.execute("""
+                    SELECT id, title, translated_title, url, source, created_at, summary_compressed
+                    FROM articles_archive
+                    WHERE url = %s
+                """, (url,))
+                row = cur.fetchone()
+                if row:
+                    return Article(
+                        id=row[0],
+                        title=row[1],
+                        translated_title=row[2],
+                        url=row[3],
+                        source=row[4],
+                        created_at=row[5],
+                        summary=_decompress(row[6]) if row[6] is not None else None
+                    )
                 return None
 
-    def get_articles_by_source(self, source: str, limit: int = 50) -> List[Article]:
+    def get_articles_by_source(self, source: str, limit: int = config.ARTICLE_LIST_LIMIT) -> List[Article]:
         """
         获取指定源的最近文章列表
         
@@ -200,6 +725,16 @@ class DatabaseManager:
         Returns:
             List[Article]: 文章对象列表
         """
+        key = (source, limit)
+        articles = self._source_cache.get(key)
+        metrics.cache("db_source", articles is not MISSING)
+        if articles is MISSING:
+            articles = self._load_articles_by_source(source, limit)
+            self._source_cache.set(key, articles)
+        # 返回副本，调用方修改列表不影响缓存
+        return list(articles)
+
+    def _load_articles_by_source(self, source: str, limit: int) -> List[Article]:
         with psycopg2.connect(**self.conn_params) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -223,21 +758,341 @@ class DatabaseManager:
                 ]
 
     def update_article_summary(self, url: str, summary: str) -> None:
-        """更新文章总结"""
+        """更新文章总结；启用延迟写入时只排队，稍后批量提交"""
+        if self.write_behind is not None:
+            self.write_behind.update_summary(url, summary)
+            self.invalidate_summary(url)
+            return
+        
         print("\n=== 保存文章总结到数据库 ===")
         print(f"文章URL: {url}")
         print("正在保存...")
+        try:
+            self.write_article_summaries({url: summary})
+            print("✓ 总结保存成功")
+        except Exception as e:
+            print(f"✗ 更新文章总结时出错: {str(e)}")
+        print("=== 保存完成 ===\n")
+
+    def write_article_summaries(self, summaries: Dict[str, str]) -> None:
+        """
+        在一个事务中保存多篇文章的总结，并为每篇发送变更通知
         
+        Args:
+            summaries: URL → 总结
+        """
         with psycopg2.connect(**self.conn_params) as conn:
             with conn.cursor() as cur:
-                try:
+                execute_values(cur, """
+                    UPDATE articles AS a
+                    SET summary = v.summary
+                    FROM (VALUES %s) AS v(url, summary)
+                    WHERE a.url = v.url
+                """, list(summaries.items()))
+                for url in summaries:
+                    self._notify(cur, {"type": "summary", "url": url})
+                conn.commit()
+        for url in summaries:
+            self.invalidate_summary(url)
+
+    def get_paragraph_translations(self, hashes: List[str]) -> Dict[str, str]:
+        """
+        批量读取段落译文缓存
+        
+        Args:
+            hashes: 段落哈希列表
+            
+        Returns:
+            Dict[str, str]: 段落哈希 → 译文，只包含已缓存的段落
+        """
+        if not hashes:
+            return {}
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT hash, translation FROM paragraph_translations
+                    WHERE hash = ANY(%s)
+                """, (list(hashes),))
+                return dict(cur.fetchall())
+
+    def save_paragraph_translations(self, translations: Dict[str, str]) -> None:
+        """
+        保存段落译文缓存
+        
+        Args:
+            translations: 段落哈希 → 译文
+        """
+        if not translations:
+            return
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO paragraph_translations (hash, translation)
+                    VALUES %s
+                    ON CONFLICT (hash) DO UPDATE SET translation = EXCLUDED.translation
+                """, list(translations.items()))
+                conn.commit()
+
+    def enqueue_job(self, kind: str, key: str, payload: Optional[dict] = None) -> None:
+        """
+        添加任务；同类型同对象的任务已存在且未完成时不重复添加
+        
+        只有已完成的任务（例如总结之后又丢失）会重新排队；排队、执行中、退避等待重试
+        和已放弃（failed）的任务保持不变，不清除失败次数和退避时间。
+        
+        Args:
+            kind: 任务类型
+            key: 任务对象（例如文章URL）
+            payload: 任务参数
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO jobs (kind, key, payload)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (kind, key) DO UPDATE
+                    SET status = 'pending',
+                        payload = EXCLUDED.payload,
+                        attempts = 0,
+                        worker = NULL,
+                        lease_until = NULL,
+                        run_after = CURRENT_TIMESTAMP,
+                        last_error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE jobs.status = 'done'
+                """, (kind, key, json.dumps(payload or {})))
+                conn.commit()
+
+    def get_job(self, kind: str, key: str) -> Optional[Job]:
+        """
+        查询任务的当前状态
+        
+        Args:
+            kind: 任务类型
+            key: 任务对象
+            
+        Returns:
+            Optional[Job]: 任务（包括status、last_error和retry_in），不存在时返回None
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, kind, key, payload, attempts, status, last_error,
+                           GREATEST(0, EXTRACT(EPOCH FROM run_after - CURRENT_TIMESTAMP))
+                    FROM jobs
+                    WHERE kind = %s AND key = %s
+                """, (kind, key))
+                row = cur.fetchone()
+        if not row:
+            return None
+        return Job(id=row[0], kind=row[1], key=row[2], payload=json.loads(row[3] or "{}"),
+                   attempts=row[4], status=row[5], last_error=row[6], retry_in=float(row[7] or 0))
+
+    def claim_job(self, worker: str, kinds: List[str], key: Optional[str] = None,
+                  lease: float = config.JOB_LEASE) -> Optional[Job]:
+        """
+        认领一个可执行的任务
+        
+        Args:
+            worker: 执行者标识
+            kinds: 可执行的任务类型
+            key: 只认领指定对象的任务
+            lease: 租约时长（秒），超时未完成的任务可被其他执行者认领
+            
+        Returns:
+            Optional[Job]: 认领到的任务，没有可执行的任务时返回None
+        """
+        jobs = self.claim_jobs(worker, kinds, key=key, lease=lease, limit=1)
+        return jobs[0] if jobs else None
+
+    def claim_jobs(self, worker: str, kinds: List[str], key: Optional[str] = None,
+                   lease: float = config.JOB_LEASE, limit: int = 1) -> List[Job]:
+        """
+        认领最多limit个可执行的任务
+        
+        排队中的任务、以及租约已过期（执行者崩溃或失联）的任务可以被认领。
+        FOR UPDATE SKIP LOCKED保证并发认领的实例不会拿到同一个任务，也不会互相等待。
+        
+        Args:
+            worker: 执行者标识
+            kinds: 可执行的任务类型
+            key: 只认领指定对象的任务
+            lease: 租约时长（秒），超时未完成的任务可被其他执行者认领
+            limit: 最多认领的任务数
+            
+        Returns:
+            List[Job]: 认领到的任务，按排队顺序排列
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE jobs
+                    SET status = 'running',
+                        attempts = attempts + 1,
+                        worker = %s,
+                        lease_until = CURRENT_TIMESTAMP + %s * INTERVAL '1 second',
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN (
+                        SELECT id FROM jobs
+                        WHERE kind = ANY(%s)
+                          AND (%s IS NULL OR key = %s)
+                          AND run_after <= CURRENT_TIMESTAMP
+                          AND (status = 'pending'
+                               OR (status = 'running' AND lease_until < CURRENT_TIMESTAMP))
+                        ORDER BY run_after, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, kind, key, payload, attempts, run_after
+                """, (worker, lease, list(kinds), key, key, limit))
+                rows = cur.fetchall()
+                conn.commit()
+        rows.sort(key=lambda row: (row[5], row[0]))
+        return [Job(id=row[0], kind=row[1], key=row[2],
+                    payload=json.loads(row[3] or "{}"), attempts=row[4])
+                for row in rows]
+
+    def complete_job(self, job_id: int) -> None:
+        """标记任务完成"""
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE jobs
+                    SET status = 'done', lease_until = NULL, last_error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (job_id,))
+                conn.commit()
+
+    def fail_job(self, job_id: int, error: str,
+                 max_attempts: int = config.JOB_MAX_ATTEMPTS) -> None:
+        """
+        记录任务失败；未超过最大尝试次数时按指数退避重新排队
+        
+        Args:
+            job_id: 任务ID
+            error: 错误信息
+            max_attempts: 最大尝试次数，超过后任务标记为failed
+        """
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE jobs
+                    SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                        run_after = CURRENT_TIMESTAMP
+                                    + %s * POWER(2, attempts - 1) * INTERVAL '1 second',
+                        lease_until = NULL,
+                        last_error = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (max_attempts, config.JOB_RETRY_DELAY, error, job_id))
+                conn.commit()
+
+    def archive_articles(self, older_than_days: int = config.ARCHIVE_AFTER_DAYS,
+                         batch_size: int = 1000) -> int:
+        """
+        把创建时间早于保留期的文章从articles表移到articles_archive表
+        
+        热表只保留近期文章，列表和查找查询的数据量不随历史增长。
+        每批在一个事务中完成删除和插入，中途失败不会丢失数据。
+        
+        只有get_article_by_url和get_article_summary会回退读取归档表；文章列表、导出、
+        跨源去重查找、RSS正文和重复文章的总结复用都只查询热表，因此归档默认关闭。
+        
+        Args:
+            older_than_days: 保留在热表中的天数，0表示不归档
+            batch_size: 每批移动的行数
+            
+        Returns:
+            int: 归档的文章数量
+        """
+        if older_than_days <= 0:
+            return 0
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        total = 0
+        while True:
+            with psycopg2.connect(**self.conn_params) as conn:
+                with conn.cursor() as cur:
                     cur.execute("""
-                        UPDATE articles 
-                        SET summary = %s
-                        WHERE url = %s
-                    """, (summary, url))
+                        DELETE FROM articles
+                        WHERE id IN (
+                            SELECT id FROM articles
+                            WHERE created_at < %s
+                            ORDER BY id
+                            LIMIT %s
+                        )
+                        RETURNING id, title, translated_title, url, source, summary, created_at,
+                                  canonical_url, duplicate_of, guid, published_at
+                    """, (cutoff, batch_size))
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+                    execute_values(cur, """
+                        INSERT INTO articles_archive (id, title, translated_title, url, source,
+                                                      summary_compressed, created_at, canonical_url,
+                                                      duplicate_of, guid, published_at)
+                        VALUES %s
+                        ON CONFLICT (url) DO UPDATE
+                        SET id = EXCLUDED.id,
+                            title = EXCLUDED.title,
+                            translated_title = EXCLUDED.translated_title,
+                            source = EXCLUDED.source,
+                            summary_compressed = EXCLUDED.summary_compressed,
+                            created_at = EXCLUDED.created_at,
+                            canonical_url = EXCLUDED.canonical_url,
+                            duplicate_of = EXCLUDED.duplicate_of,
+                            guid = EXCLUDED.guid,
+                            published_at = EXCLUDED.published_at,
+                            archived_at = CURRENT_TIMESTAMP
+                    """, [
+                        row[:5] + (_compress(row[5]),) + row[6:]
+                        for row in rows
+                    ])
                     conn.commit()
-                    print("✓ 总结保存成功")
-                except Exception as e:
-                    print(f"✗ 更新文章总结时出错: {str(e)}")
-        print("=== 保存完成 ===\n") 
\ No newline at end of file
+            total += len(rows)
+        if total:
+            self.clear_cache()
+        return total
+
+    def purge_archive(self, older_than_days: int = config.RETENTION_DAYS) -> int:
+        """
+        删除归档表中创建时间早于保留期的文章
+        
+        Args:
+            older_than_days: 文章的总保留天数，0表示永久保留
+            
+        Returns:
+            int: 删除的文章数量
+        """
+        if older_than_days <= 0:
+            return 0
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        with psycopg2.connect(**self.conn_params) as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM articles_archive WHERE created_at < %s", (cutoff,))
+                deleted = cur.rowcount
+                conn.commit()
+        if deleted:
+            self.clear_cache()
+        return deleted
+
+    def apply_retention(self) -> Tuple[int, int]:
+        """
+        执行保留策略：先归档旧文章，再删除超过总保留期的归档
+        
+        Returns:
+            Tuple[int, int]: (归档数量, 删除数量)
+        """
+        return self.archive_articles(), self.purge_archive()
+
+
+def _compress(text: Optional[str]) -> Optional[bytes]:
+    """压缩总结文本"""
+    if text is None:
+        return None
+    return psycopg2.Binary(zlib.compress(text.encode("utf-8"), 9))
+
+
+def _decompress(data) -> str:
+    """解压归档表中的总结"""
+    return zlib.decompress(bytes(data)).decode("utf-8")
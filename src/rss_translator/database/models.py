@@ -5,21 +5,58 @@ from typing import Optional
 
 @dataclass
 class Article:
-    """文章模型"""
+    """文章模型（使用__slots__，减少缓存大量文章时的内存占用）"""
+    __slots__ = (
+        "id", "title", "translated_title", "url", "source", "created_at", "summary",
+        "canonical_url", "title_simhash", "duplicate_of", "guid", "published_at", "fingerprint",
+        "feed_content"
+    )
+
     id: Optional[int]
     title: str            # 原始标题
     translated_title: str  # 翻译后的标题
     url: str              # 文章URL
     source: str           # RSS源
     created_at: datetime  # 创建时间
-    summary: Optional[str] = None
+    summary: Optional[str]
+    canonical_url: Optional[str]  # 规范化后的URL，用于跨源去重
+    title_simhash: Optional[int]  # 标题SimHash指纹，用于近似重复检测
+    duplicate_of: Optional[int]   # 近似重复时指向原文章ID
+    guid: Optional[str]           # RSS条目的guid（Atom为id）
+    published_at: Optional[datetime]  # RSS条目的发布时间
+    fingerprint: Optional[str]    # 条目指纹（guid、标题和更新时间的哈希），解析时生成，用于检测条目变化
+    feed_content: Optional[str]   # RSS源提供的正文（纯文本），足够长时总结不再抓取网页
 
     def __init__(self, id: Optional[int], title: str, translated_title: str, 
-                 url: str, source: str, created_at: datetime, summary: Optional[str] = None):
+                 url: str, source: str, created_at: datetime, summary: Optional[str] = None,
+                 canonical_url: Optional[str] = None, title_simhash: Optional[int] = None,
+                 duplicate_of: Optional[int] = None, guid: Optional[str] = None,
+                 published_at: Optional[datetime] = None, fingerprint: Optional[str] = None,
+                 feed_content: Optional[str] = None):
         self.id = id
         self.title = title
         self.translated_title = translated_title
         self.url = url
         self.source = source
         self.created_at = created_at
-        self.summary = summary 
\ No newline at end of file
+        self.summary = summary
+        self.canonical_url = canonical_url
+        self.title_simhash = title_simhash
+        self.duplicate_of = duplicate_of
+        self.guid = guid
+        self.published_at = published_at
+        self.fingerprint = fingerprint
+        self.feed_content = feed_content
+
+
+@dataclass
+class Job:
+    """后台任务（总结、翻译等），由各实例通过SKIP LOCKED认领"""
+    id: int
+    kind: str             # 任务类型，例如 summary
+    key: str              # 任务对象，例如文章URL；同类型同对象只有一个任务
+    payload: dict         # 任务参数
+    attempts: int         # 已尝试次数（包括本次）
+    status: str = "running"            # pending、running、done 或 failed；认领到的任务为running
+    last_error: Optional[str] = None   # 最近一次失败的原因
+    retry_in: float = 0.0              # 退避中的任务距离可以再次认领的秒数
@@ -0,0 +1,271 @@
+"""延迟写入模块
+
+启用后，保存文章和总结只写入内存队列和本地日志文件就立即返回，
+后台线程按数量或时间阈值把队列中的写入合并到一个事务中批量提交。
+同一篇文章的多次写入只保留最后一次；程序异常退出时，
+下次启动会从日志文件恢复尚未提交的写入。连续多次提交失败的写入会被丢弃，
+避免一条无法写入的数据永远阻塞后续提交。需要在文章真正写入数据库之后执行的操作
+（例如记录RSS条目指纹）通过save_articles的on_saved回调在提交成功后执行，
+被丢弃的文章不会触发回调。
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from .models import Article
+from .. import config
+from ..metrics import metrics
+
+_DATETIME_FIELDS = ("created_at", "published_at")
+
+
+def _article_to_dict(article: Article) -> dict:
+    data = {field: getattr(article, field) for field in Article.__slots__}
+    for field in _DATETIME_FIELDS:
+        if data[field] is not None:
+            data[field] = data[field].isoformat()
+    return data
+
+
+def _article_from_dict(data: dict) -> Article:
+    data = {field: data.get(field) for field in Article.__slots__}
+    for field in _DATETIME_FIELDS:
+        if data[field] is not None:
+            data[field] = datetime.fromisoformat(data[field])
+    return Article(**data)
+
+
+class WriteBehindBuffer:
+    """合并并批量提交文章和总结的写入"""
+
+    def __init__(self, db, journal_path: str = config.WRITE_BEHIND_JOURNAL,
+                 max_items: int = config.WRITE_BEHIND_MAX_ITEMS,
+                 interval: float = config.WRITE_BEHIND_INTERVAL,
+                 max_failures: int = config.WRITE_BEHIND_MAX_FAILURES):
+        """
+        Args:
+            db: DatabaseManager，提供立即写入数据库的方法
+            journal_path: 本地日志文件路径
+            max_items: 待写入条目达到此数量时立即提交
+            interval: 最长多久（秒）提交一次
+            max_failures: 同一条写入连续提交失败多少次后丢弃
+        """
+        self.db = db
+        self.journal_path = journal_path
+        self.max_items = max_items
+        self.interval = interval
+        self.max_failures = max_failures
+        self._articles: Dict[str, Article] = {}   # URL → 待保存的文章
+        self._summaries: Dict[str, str] = {}      # URL → 待保存的总结
+        # URL → 该文章提交成功后要调用的回调（日志恢复的写入没有回调）
+        self._on_saved: Dict[str, List[Callable[[List[Article]], None]]] = {}
+        self._failures: Dict[Tuple[str, str], int] = {}  # (类型, URL) → 连续提交失败次数
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._journal = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "WriteBehindBuffer":
+        """恢复日志中未提交的写入，并启动后台提交线程"""
+        recovered = self._replay_journal()
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if recovered:
+            print(f"从延迟写入日志恢复{recovered}条未提交的写入")
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        return self
+
+    def save_articles(self, articles: List[Article],
+                      on_saved: Optional[Callable[[List[Article]], None]] = None) -> None:
+        """
+        排队保存文章，所有文章的日志记录写入后只同步一次磁盘
+
+        Args:
+            articles: 文章对象列表
+            on_saved: 文章提交到数据库后在提交线程中调用，参数为本次提交成功的这些文章；
+                文章因连续提交失败被丢弃时不调用
+        """
+        records = [{"op": "article", "article": _article_to_dict(article)} for article in articles]
+        with self._cond:
+            for article in articles:
+                self._articles[article.url] = article
+                if on_saved is not None:
+                    callbacks = self._on_saved.setdefault(article.url, [])
+                    if on_saved not in callbacks:
+                        callbacks.append(on_saved)
+            self._append(records)
+            self._after_write()
+
+    def update_summary(self, url: str, summary: str) -> None:
+        """排队保存文章总结"""
+        with self._cond:
+            self._summaries[url] = summary
+            self._append([{"op": "summary", "url": url, "summary": summary}])
+            self._after_write()
+
+    def pending_summary(self, url: str) -> Optional[str]:
+        """尚未提交的总结，没有时返回None"""
+        with self._cond:
+            return self._summaries.get(url)
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._articles) + len(self._summaries)
+
+    def flush(self) -> bool:
+        """
+        把当前队列中的写入提交到数据库
+
+        Returns:
+            bool: 是否全部提交成功；失败的写入留在队列中等待下次提交，
+                连续失败max_failures次的写入被丢弃
+        """
+        with self._flush_lock:
+            with self._cond:
+                articles, self._articles = self._articles, {}
+                summaries, self._summaries = self._summaries, {}
+                on_saved, self._on_saved = self._on_saved, {}
+            if not articles and not summaries:
+                return True
+            try:
+                with metrics.time("write_behind_flush"):
+                    # 先保存文章，总结可能属于同一批新文章
+                    if articles:
+                        self.db.write_articles(list(articles.values()))
+                    if summaries:
+                        self.db.write_article_summaries(summaries)
+            except Exception as e:
+                print(f"✗ 延迟写入提交失败: {str(e)}")
+                with self._cond:
+                    # 放回队列，提交期间的新写入更新，保留新的
+                    dropped = False
+                    for url, article in articles.items():
+                        if self._retry("article", url):
+                            self._articles.setdefault(url, article)
+                            # 回调等到文章（或提交期间写入的更新版本）提交成功后再调用
+                            callbacks = self._on_saved.setdefault(url, [])
+                            callbacks[:0] = [cb for cb in on_saved.get(url, ()) if cb not in callbacks]
+                        else:
+                            dropped = True
+                    for url, summary in summaries.items():
+                        if self._retry("summary", url):
+                            self._summaries.setdefault(url, summary)
+                        else:
+                            dropped = True
+                    if dropped:
+                        self._rewrite_journal()
+                metrics.inc("rss_write_behind_flushes_total", result="error")
+                return False
+            metrics.inc("rss_write_behind_flushes_total", result="ok")
+            metrics.inc("rss_write_behind_items_total", len(articles) + len(summaries))
+            with self._cond:
+                for url in articles:
+                    self._failures.pop(("article", url), None)
+                for url in summaries:
+                    self._failures.pop(("summary", url), None)
+                self._rewrite_journal()
+                metrics.set_gauge("rss_write_behind_pending", len(self._articles) + len(self._summaries))
+            self._notify_saved(articles, on_saved)
+            return True
+
+    def close(self) -> None:
+        """停止后台线程并提交剩余的写入（提交失败的写入保留在日志中）"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+        with self._cond:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
+    def _notify_saved(self, articles: Dict[str, Article],
+                      on_saved: Dict[str, List[Callable[[List[Article]], None]]]) -> None:
+        """按回调分组调用已提交文章的on_saved回调，回调出错不影响提交结果"""
+        grouped: Dict[Callable[[List[Article]], None], List[Article]] = {}
+        for url, callbacks in on_saved.items():
+            for callback in callbacks:
+                grouped.setdefault(callback, []).append(articles[url])
+        for callback, saved in grouped.items():
+            try:
+                callback(saved)
+            except Exception as e:
+                print(f"✗ 延迟写入提交后的回调出错: {str(e)}")
+
+    def _retry(self, kind: str, url: str) -> bool:
+        """记录一次提交失败，返回是否继续重试；调用方持有self._cond"""
+        key = (kind, url)
+        self._failures[key] = self._failures.get(key, 0) + 1
+        if self._failures[key] < self.max_failures:
+            return True
+        del self._failures[key]
+        print(f"✗ 延迟写入连续{self.max_failures}次提交失败，已丢弃: {kind} {url}")
+        metrics.inc("rss_write_behind_dropped_total", kind=kind)
+        return False
+
+    def _after_write(self) -> None:
+        """调用方持有self._cond"""
+        pending = len(self._articles) + len(self._summaries)
+        metrics.set_gauge("rss_write_behind_pending", pending)
+        if pending >= self.max_items:
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._articles) + len(self._summaries) < self.max_items:
+                    self._cond.wait(self.interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def _append(self, records: List[dict]) -> None:
+        """追加一次调用的全部日志记录，调用方持有self._cond"""
+        if self._journal and records:
+            self._journal.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            self._journal.flush()
+            # 写入磁盘后才返回，系统崩溃时也不会丢失已确认的写入；每次调用只同步一次
+            os.fsync(self._journal.fileno())
+
+    def _rewrite_journal(self) -> None:
+        """用队列中剩余的写入重写日志，调用方持有self._cond"""
+        if not self._journal:
+            return
+        self._journal.close()
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for article in self._articles.values():
+                f.write(json.dumps({"op": "article", "article": _article_to_dict(article)},
+                                   ensure_ascii=False) + "\n")
+            for url, summary in self._summaries.items():
+                f.write(json.dumps({"op": "summary", "url": url, "summary": summary},
+                                   ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _replay_journal(self) -> int:
+        """读取日志中未提交的写入，返回恢复的条目数"""
+        if not os.path.exists(self.journal_path):
+            return 0
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record.get("op") == "article":
+                        article = _article_from_dict(record["article"])
+                        self._articles[article.url] = article
+                    elif record.get("op") == "summary":
+                        self._summaries[record["url"]] = record["summary"]
+                except (ValueError, KeyError, TypeError):
+                    # 异常退出时最后一行可能不完整
+                    continue
+        return len(self._articles) + len(self._summaries)
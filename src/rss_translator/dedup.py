@@ -0,0 +1,174 @@
+"""文章去重模块：URL规范化与标题近似重复检测"""
+import hashlib
+import re
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 需要从URL中移除的跟踪参数（精确匹配）
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "ocid", "cmpid", "ref", "ref_src", "referrer",
+    "at_medium", "at_campaign", "at_custom1", "at_custom2", "at_custom3", "at_custom4",
+    "_ga", "_gl", "smid", "smtyp", "amp", "outputtype",
+}
+# 需要移除的跟踪参数前缀
+TRACKING_PREFIXES = ("utm_", "ns_", "pk_", "mtm_", "hmsr", "spm")
+
+SIMHASH_BITS = 64
+# 标题词数少于此值时不做近似去重，避免"Live updates"之类的短标题误判
+SIMHASH_MIN_TOKENS = 4
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[一-鿿]")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化文章URL，使同一篇文章的不同变体得到相同结果
+
+    - 协议和域名转小写，去掉默认端口、www.前缀和片段
+    - 移除utm_*等跟踪参数，其余参数排序
+    - 还原AMP变体（amp.域名、/amp路径、AMP缓存地址）
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        str: 规范化后的URL
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+    path = parts.path or "/"
+
+    # Google AMP缓存: https://example-com.cdn.ampproject.org/c/s/example.com/path
+    if host.endswith(".cdn.ampproject.org"):
+        match = re.match(r"^/[a-z]/(s/)?([^/]+)(/.*)?$", path)
+        if match:
+            scheme = "https" if match.group(1) else "http"
+            host = match.group(2).lower()
+            path = match.group(3) or "/"
+
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("amp."):
+        host = host[4:]
+
+    port = parts.port
+    netloc = host
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        netloc = f"{host}:{port}"
+
+    # 去掉AMP路径标记
+    path = re.sub(r"/amp(/|$)", "/", path)
+    path = re.sub(r"\.amp(\.html)?$", r"\1", path)
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1 and path.endswith("/"):
+        path = path[:-1]
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query.sort()
+
+    # http和https视为同一文章
+    return urlunsplit(("https" if scheme in ("http", "https") else scheme,
+                       netloc, path, urlencode(query), ""))
+
+
+def _is_tracking_param(key: str) -> bool:
+    """判断查询参数是否为跟踪参数"""
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+def _tokenize(text: str) -> List[str]:
+    """把标题拆分为词（英文按单词，中文按单字）"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def normalize_title(title: str) -> str:
+    """
+    规范化标题：转小写并去掉标点和多余空白
+
+    只有规范化后完全相同的标题才视为同一标题，可以直接复用译文
+
+    Args:
+        title: 标题文本
+
+    Returns:
+        str: 规范化后的标题
+    """
+    return " ".join(_tokenize(title or ""))
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    计算标题的64位SimHash指纹
+
+    以标题中的单词为特征，返回有符号整数以便存入PostgreSQL的BIGINT列
+
+    Args:
+        text: 标题文本
+
+    Returns:
+        Optional[int]: 指纹，标题过短时返回None
+    """
+    tokens = _tokenize(text or "")
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+
+    features = tokens
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    # 转换为有符号64位整数
+    if fingerprint >= 1 << (SIMHASH_BITS - 1):
+        fingerprint -= 1 << SIMHASH_BITS
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """计算两个64位指纹之间的汉明距离"""
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count("1")
+
+
+def find_near_duplicate(fingerprint: Optional[int],
+                        candidates: Iterable[Tuple[int, int]],
+                        max_distance: int) -> Optional[int]:
+    """
+    在候选指纹中查找最接近的近似重复项
+
+    近似重复只用于关联同一事件的报道：只差一两个词的标题含义可能相反
+    （如"rise"与"fall"），不能据此复用译文或总结
+
+    Args:
+        fingerprint: 待检测标题的指纹
+        candidates: (文章ID, 指纹) 列表
+        max_distance: 允许的最大汉明距离
+
+    Returns:
+        Optional[int]: 最接近的文章ID，没有时返回None
+    """
+    if fingerprint is None:
+        return None
+    best_id, best_distance = None, max_distance + 1
+    for article_id, other in candidates:
+        distance = hamming_distance(fingerprint, other)
+        if distance < best_distance:
+            best_id, best_distance = article_id, distance
+            if distance == 0:
+                break
+    return best_id
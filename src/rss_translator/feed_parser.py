@@ -0,0 +1,315 @@
+"""RSS源解析模块
+
+对格式规范的RSS 2.0和Atom源使用基于lxml iterparse的快速解析，
+只提取链接、标题、guid和日期，逐条生成Article对象并及时释放已处理的XML节点；
+每个条目带有由guid、标题和更新时间生成的指纹，用于判断条目自上次获取后是否变化，
+以及源中提供的正文（content:encoded、description等，转换为纯文本）；
+其他格式（RSS 1.0、格式错误的源等）或未安装lxml时回退到feedparser。
+"""
+import calendar
+import hashlib
+import html
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Iterator, List, Optional
+import feedparser
+from .database.models import Article
+from .metrics import metrics
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml为可选依赖
+    etree = None
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLOCK_TAG_RE = re.compile(r"</?(?:p|div|br|li|h[1-6]|blockquote|tr|section|article)\b[^>]*>", re.IGNORECASE)
+_SCRIPT_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+
+class UnsupportedFeed(Exception):
+    """快速解析器无法处理的RSS源，需要回退到feedparser"""
+
+
+class ParsedFeed:
+    """解析结果：源标题和文章列表"""
+
+    def __init__(self, title: str, articles: List[Article], parser: str):
+        self.title = title
+        self.articles = articles
+        self.parser = parser  # 使用的解析器：fast 或 feedparser
+
+
+def parse_feed(data: bytes, source: str) -> ParsedFeed:
+    """
+    解析RSS源内容，优先使用快速解析器
+
+    Args:
+        data: RSS源原始内容
+        source: RSS源URL，写入Article.source
+
+    Returns:
+        ParsedFeed: 解析结果
+    """
+    if etree is not None:
+        try:
+            feed = parse_feed_fast(data, source)
+            metrics.inc("rss_feed_parser_total", parser="fast")
+            return feed
+        except (UnsupportedFeed, etree.XMLSyntaxError):
+            pass
+
+    metrics.inc("rss_feed_parser_total", parser="feedparser")
+    return parse_feed_fallback(data, source)
+
+
+def parse_feed_fast(data: bytes, source: str) -> ParsedFeed:
+    """
+    使用lxml iterparse解析RSS 2.0或Atom源
+
+    Raises:
+        UnsupportedFeed: 不是RSS 2.0或Atom格式
+        etree.XMLSyntaxError: XML格式错误
+    """
+    title = ""
+    articles: List[Article] = []
+    for article_or_title in _iter_fast(data, source):
+        if isinstance(article_or_title, Article):
+            articles.append(article_or_title)
+        else:
+            title = article_or_title
+    return ParsedFeed(title, articles, "fast")
+
+
+def _iter_fast(data: bytes, source: str) -> Iterator[object]:
+    """逐条生成Article对象；遇到源标题时生成标题字符串"""
+    context = etree.iterparse(
+        BytesIO(data), events=("start", "end"),
+        resolve_entities=False, no_network=True, huge_tree=True
+    )
+    root_tag = None
+    depth = 0
+    now = datetime.now()
+    for event, element in context:
+        if event == "start":
+            depth += 1
+            if root_tag is None:
+                root_tag = element.tag
+                if root_tag == "rss":
+                    if not element.get("version", "2.0").startswith("2"):
+                        raise UnsupportedFeed(f"不支持的RSS版本: {element.get('version')}")
+                elif root_tag != f"{ATOM_NS}feed":
+                    raise UnsupportedFeed(f"不支持的根节点: {root_tag}")
+            continue
+
+        depth -= 1
+        tag = element.tag
+        if root_tag == "rss":
+            if tag == "item":
+                article = _rss_item(element, source, now)
+                if article:
+                    yield article
+                _release(element)
+            elif tag == "title" and depth == 2:
+                # rss/channel/title
+                yield (element.text or "").strip()
+        else:
+            if tag == f"{ATOM_NS}entry":
+                article = _atom_entry(element, source, now)
+                if article:
+                    yield article
+                _release(element)
+            elif tag == f"{ATOM_NS}title" and depth == 1:
+                yield _text_content(element)
+
+
+def _rss_item(item, source: str, now: datetime) -> Optional[Article]:
+    """把RSS 2.0的<item>转换为Article"""
+    link = guid = title = pub_date = None
+    contents = []
+    for child in item:
+        tag = child.tag
+        if tag in (CONTENT_ENCODED, "description"):
+            contents.append(html_to_text(child.text))
+        elif tag == "link":
+            link = (child.text or "").strip()
+        elif tag == "title":
+            title = (child.text or "").strip()
+        elif tag == "guid":
+            guid = (child.text or "").strip()
+            if not link and child.get("isPermaLink", "true").lower() == "true":
+                link = guid
+        elif tag == "pubDate":
+            pub_date = _parse_rfc822(child.text)
+        elif tag == "{http://purl.org/dc/elements/1.1/}date" and pub_date is None:
+            pub_date = _parse_iso8601(child.text)
+    if not link:
+        return None
+    return _make_article(title, link, guid, pub_date, pub_date, source, now, _longest(contents))
+
+
+def _atom_entry(entry, source: str, now: datetime) -> Optional[Article]:
+    """把Atom的<entry>转换为Article"""
+    link = fallback_link = guid = title = published = updated = None
+    contents = []
+    for child in entry:
+        tag = child.tag
+        if tag in (f"{ATOM_NS}content", f"{ATOM_NS}summary"):
+            if child.get("type") == "xhtml":
+                contents.append(html_to_text(etree.tostring(child, encoding="unicode")))
+            elif child.get("src") is None:
+                contents.append(html_to_text(child.text))
+        elif tag == f"{ATOM_NS}link":
+            rel = child.get("rel", "alternate")
+            href = child.get("href")
+            if rel == "alternate" and href:
+                if link is None or child.get("type", "text/html") == "text/html":
+                    link = href
+            elif href and fallback_link is None:
+                fallback_link = href
+        elif tag == f"{ATOM_NS}title":
+            title = _text_content(child)
+        elif tag == f"{ATOM_NS}id":
+            guid = (child.text or "").strip()
+        elif tag == f"{ATOM_NS}published":
+            published = _parse_iso8601(child.text)
+        elif tag == f"{ATOM_NS}updated":
+            updated = _parse_iso8601(child.text)
+    link = link or fallback_link
+    if not link:
+        return None
+    return _make_article(title, link.strip(), guid, published or updated, updated or published,
+                         source, now, _longest(contents))
+
+
+def entry_fingerprint(guid: Optional[str], link: str, title: str,
+                      updated: Optional[object]) -> str:
+    """
+    计算条目指纹：guid（没有时用链接）、标题和更新时间任一变化，指纹都会变化
+
+    Args:
+        guid: 条目guid（Atom为id）
+        link: 条目链接
+        title: 条目标题
+        updated: 条目更新时间（datetime或原始字符串）
+    """
+    if isinstance(updated, datetime):
+        updated = updated.isoformat()
+    text = "\x1f".join((guid or link, title, updated or ""))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """把条目正文的HTML转换为纯文本，块级元素之间换行"""
+    if not value:
+        return ""
+    text = _SCRIPT_RE.sub("", value)
+    text = _BLOCK_TAG_RE.sub("\n", text)
+    text = html.unescape(_TAG_RE.sub("", text))
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _longest(contents: List[str]) -> Optional[str]:
+    """源中同时提供全文和摘要时取较长的一个"""
+    return max(contents, key=len) if any(contents) else None
+
+
+def _make_article(title: Optional[str], link: str, guid: Optional[str],
+                  published: Optional[datetime], updated: Optional[object],
+                  source: str, now: datetime, content: Optional[str] = None) -> Article:
+    return Article(
+        id=None,
+        title=title or "",
+        translated_title=None,
+        url=link,
+        source=source,
+        created_at=now,
+        guid=guid or None,
+        published_at=published,
+        fingerprint=entry_fingerprint(guid, link, title or "", updated),
+        feed_content=content
+    )
+
+
+def _text_content(element) -> str:
+    """取节点文本，html/xhtml类型的标题去掉标签"""
+    if element.get("type") == "xhtml":
+        text = "".join(element.itertext())
+    else:
+        text = element.text or ""
+        if element.get("type") == "html":
+            text = _TAG_RE.sub("", text)
+    return " ".join(text.split())
+
+
+def _release(element) -> None:
+    """释放已处理的节点及之前的兄弟节点，保持内存占用稳定"""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _to_local_naive(value: datetime) -> datetime:
+    """转换为本地时区的naive时间，与数据库中其他时间保持一致"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _parse_rfc822(text: Optional[str]) -> Optional[datetime]:
+    if not text:
+        return None
+    try:
+        return _to_local_naive(parsedate_to_datetime(text.strip()))
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_iso8601(text: Optional[str]) -> Optional[datetime]:
+    if not text:
+        return None
+    value = text.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        return _to_local_naive(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def parse_feed_fallback(data: bytes, source: str) -> ParsedFeed:
+    """
+    使用feedparser解析任意格式的RSS源
+
+    Raises:
+        Exception: 源无法解析且没有任何条目
+    """
+    feed = feedparser.parse(data)
+    if feed.bozo and not feed.entries:
+        raise Exception(f"RSS源获取失败: {feed.get('bozo_exception')}")
+
+    now = datetime.now()
+    articles = []
+    for entry in feed.entries:
+        link = entry.get("link")
+        if not link:
+            continue
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        published = None
+        if parsed:
+            published = _to_local_naive(
+                datetime.fromtimestamp(calendar.timegm(parsed), tz=timezone.utc)
+            )
+        contents = [html_to_text(item.get("value")) for item in entry.get("content", [])]
+        contents.append(html_to_text(entry.get("summary")))
+        articles.append(_make_article(
+            entry.get("title", ""), link, entry.get("id"), published,
+            entry.get("updated") or entry.get("published"), source, now, _longest(contents)
+        ))
+    return ParsedFeed(feed.feed.get("title", ""), articles, "feedparser")
@@ -0,0 +1,337 @@
+"""后台任务模块
+
+总结等耗时的LLM任务写入数据库的jobs表，由各实例（桌面程序、后台服务，
+可以在不同机器上）认领执行。认领使用 FOR UPDATE SKIP LOCKED，
+同一篇文章的总结同一时间只有一个执行者，不会重复调用LLM；
+执行者崩溃后租约过期，任务会被其他实例重新认领，失败的任务按指数退避重试。
+后台执行者一次认领多个总结任务，短文章合并到一次LLM请求中总结。
+"""
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from . import config
+from .database.models import Job
+from .dedup import canonicalize_url
+from .metrics import metrics
+from .rss_reader import RSSReader
+
+SUMMARY_JOB = "summary"
+
+
+def worker_id() -> str:
+    """当前线程的执行者标识：主机名:进程号:线程号"""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _fetch_for_summary(reader: RSSReader, url: str,
+                       log: Callable[[str], None]) -> Tuple[str, Optional[str]]:
+    """
+    获取待总结的文章内容
+
+    RSS源提供的正文足够长时直接使用，省去抓取和解析网页；否则抓取网页提取正文。
+
+    Returns:
+        Tuple[str, Optional[str]]: (文章内容, 同一篇文章（规范URL相同）的已有总结)
+    """
+    content = reader.db.get_feed_content(url)
+    if content and len(content) >= config.FEED_CONTENT_MIN_CHARS:
+        metrics.cache("feed_content", True)
+        log("✓ 使用RSS源提供的文章内容")
+        return content, None
+    metrics.cache("feed_content", False)
+
+    log("正在获取文章内容...")
+    page = reader.fetch_article(url)
+    content, canonical_url = page if page else (None, None)
+    if not content:
+        raise Exception("无法获取文章内容")
+    log("✓ 文章内容获取成功")
+
+    # 页面声明的规范URL可能对应已有总结的同一篇文章
+    summary = None
+    if canonical_url and canonical_url != canonicalize_url(url):
+        summary = reader.db.find_summary_by_canonical_url(canonical_url)
+        metrics.cache("canonical_summary", bool(summary))
+    return content, summary
+
+
+def _save_summary(reader: RSSReader, url: str, summary: str) -> None:
+    # 直接提交而不经过延迟写入队列：任务完成前总结必须已经写入数据库，
+    # 否则其他实例看到任务已完成却读不到总结，会再次调用LLM
+    with metrics.time("persist_summary"):
+        reader.db.write_article_summaries({url: summary})
+
+
+def run_summary_job(reader: RSSReader, url: str, title: str,
+                    log: Optional[Callable[[str], None]] = None) -> str:
+    """
+    生成并保存文章总结
+
+    执行前重新查询数据库（不使用缓存），其他实例已生成的总结直接返回，不调用LLM。
+
+    Args:
+        reader: 提供数据库和翻译服务的RSSReader
+        url: 文章URL
+        title: 文章原标题
+        log: 日志回调
+
+    Returns:
+        str: 文章总结
+    """
+    log = log or (lambda message: None)
+    summary = reader.db.get_article_summary(url, cached=False)
+    if summary:
+        log("✓ 总结已由其他实例生成")
+        return summary
+
+    content, summary = _fetch_for_summary(reader, url, log)
+    if summary:
+        log("✓ 找到同一篇文章的已有总结，直接复用")
+    else:
+        log("正在生成文章总结...")
+        with metrics.time("summarize"):
+            summary = reader.translator.summarize_article(title, content)
+        log("✓ 总结生成成功")
+
+    # 保存总结到数据库
+    log("正在保存总结到数据库...")
+    _save_summary(reader, url, summary)
+    return summary
+
+
+def claim_summary_job(reader: RSSReader, url: str, title: str,
+                      cancelled: Callable[[], bool],
+                      log: Optional[Callable[[str], None]] = None,
+                      poll_interval: float = config.JOB_POLL_INTERVAL) -> Tuple[Optional[Job], Optional[str]]:
+    """
+    为界面认领文章的总结任务，任务由其他执行者持有时等待其结果
+
+    其他执行者失败（fail_job不发送数据库通知）或崩溃时，界面收不到总结通知，
+    因此每poll_interval秒重新尝试认领并检查任务状态：退避时间结束或租约过期后由本实例认领，
+    总结已生成时直接返回，任务已放弃时报错。
+
+    Args:
+        reader: 提供数据库的RSSReader
+        url: 文章URL
+        title: 文章原标题
+        cancelled: 返回True时停止等待（例如用户已切换到其他文章）
+        log: 日志回调
+        poll_interval: 检查间隔（秒）
+
+    Returns:
+        Tuple[Optional[Job], Optional[str]]: (认领到的任务, None) 由调用方生成总结；
+            (None, 总结) 其他执行者已生成总结；(None, None) 等待期间被取消
+
+    Raises:
+        Exception: 任务多次失败已被放弃
+    """
+    log = log or (lambda message: None)
+    reader.db.enqueue_job(SUMMARY_JOB, url, {"title": title})
+    waiting = False
+    while True:
+        job = reader.db.claim_job(worker_id(), [SUMMARY_JOB], key=url)
+        if job is not None:
+            return job, None
+        state = reader.db.get_job(SUMMARY_JOB, url)
+        if state is None or state.status == "done":
+            summary = reader.db.get_article_summary(url, cached=False)
+            if summary:
+                return None, summary
+            # 任务已完成但总结不存在（例如已被清理），重新排队后认领
+            reader.db.enqueue_job(SUMMARY_JOB, url, {"title": title})
+            continue
+        if state.status == "failed":
+            raise Exception(f"总结任务已失败{state.attempts}次，不再重试: {state.last_error}")
+        if not waiting:
+            if state.status == "pending" and state.retry_in > 0:
+                log(f"上次生成失败，{int(state.retry_in)}秒后重试: {state.last_error}")
+            else:
+                log("其他实例正在生成该文章的总结，完成后将自动显示")
+            waiting = True
+        time.sleep(poll_interval)
+        if cancelled():
+            return None, None
+
+
+def run_summary_batch(reader: RSSReader, articles: List[Tuple[str, str]]) -> Dict[str, Optional[Exception]]:
+    """
+    生成并保存多篇文章的总结
+
+    文章内容并发获取；正文不超过SUMMARY_BATCH_MAX_CHARS的短文章合并到一次LLM请求中总结，
+    长文章仍逐篇总结。每篇文章的成功与失败互不影响。
+
+    Args:
+        reader: 提供数据库和翻译服务的RSSReader
+        articles: (URL, 原标题) 列表
+
+    Returns:
+        Dict[str, Optional[Exception]]: URL → 失败原因，成功为None
+    """
+    results: Dict[str, Optional[Exception]] = {}
+    quiet = lambda message: None
+
+    def prepare(article: Tuple[str, str]) -> Optional[str]:
+        url, _ = article
+        if reader.db.get_article_summary(url, cached=False):
+            return None
+        content, summary = _fetch_for_summary(reader, url, quiet)
+        if summary:
+            _save_summary(reader, url, summary)
+            return None
+        return content
+
+    short, long = [], []
+    with ThreadPoolExecutor(max_workers=len(articles)) as pool:
+        futures = [pool.submit(prepare, article) for article in articles]
+        for (url, title), future in zip(articles, futures):
+            try:
+                content = future.result()
+            except Exception as e:
+                results[url] = e
+                continue
+            if content is None:
+                results[url] = None
+            elif len(content) <= config.SUMMARY_BATCH_MAX_CHARS:
+                short.append((url, title, content))
+            else:
+                long.append((url, title, content))
+
+    summaries: List[Tuple[str, str]] = []
+    if short:
+        try:
+            with metrics.time("summarize_batch"):
+                batch = reader.translator.summarize_batch([(title, content) for _, title, content in short])
+            for (url, _, _), summary in zip(short, batch):
+                if isinstance(summary, Exception):
+                    results[url] = summary
+                else:
+                    summaries.append((url, summary))
+        except Exception as e:
+            for url, _, _ in short:
+                results[url] = e
+    for url, title, content in long:
+        try:
+            with metrics.time("summarize"):
+                summaries.append((url, reader.translator.summarize_article(title, content)))
+        except Exception as e:
+            results[url] = e
+
+    for url, summary in summaries:
+        try:
+            _save_summary(reader, url, summary)
+            results[url] = None
+        except Exception as e:
+            results[url] = e
+    return results
+
+
+def _handle_summary(reader: RSSReader, job: Job) -> None:
+    run_summary_job(reader, job.key, job.payload.get("title", ""))
+
+
+def _handle_summary_batch(reader: RSSReader, jobs: List[Job]) -> Dict[int, Optional[Exception]]:
+    results = run_summary_batch(reader, [(job.key, job.payload.get("title", "")) for job in jobs])
+    return {job.id: results.get(job.key) for job in jobs}
+
+
+# 任务类型 → 处理函数
+HANDLERS: Dict[str, Callable[[RSSReader, Job], None]] = {
+    SUMMARY_JOB: _handle_summary,
+}
+
+# 任务类型 → 批量处理函数，返回 任务ID → 失败原因（成功为None）
+BATCH_HANDLERS: Dict[str, Callable[[RSSReader, List[Job]], Dict[int, Optional[Exception]]]] = {
+    SUMMARY_JOB: _handle_summary_batch,
+}
+
+
+class JobWorker:
+    """在后台线程中循环认领并执行任务"""
+
+    def __init__(self, reader: RSSReader, workers: int = config.JOB_WORKERS,
+                 kinds: Optional[List[str]] = None):
+        """
+        Args:
+            reader: 提供数据库和翻译服务的RSSReader
+            workers: 执行线程数
+            kinds: 执行的任务类型，默认全部
+        """
+        self.reader = reader
+        self.workers = workers
+        self.kinds = kinds or list(HANDLERS)
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "JobWorker":
+        """启动执行线程"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """停止执行线程（正在执行的任务完成后退出）"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+    def _run(self) -> None:
+        worker = worker_id()
+        while not self._stop_event.is_set():
+            try:
+                jobs = self.reader.db.claim_jobs(worker, self.kinds,
+                                                 limit=max(1, config.SUMMARY_BATCH_SIZE))
+            except Exception as e:
+                self._log(f"✗ 认领任务失败: {str(e)}")
+                jobs = []
+            if not jobs:
+                self._stop_event.wait(config.JOB_POLL_INTERVAL)
+                continue
+            by_kind: Dict[str, List[Job]] = {}
+            for job in jobs:
+                by_kind.setdefault(job.kind, []).append(job)
+            for kind, group in by_kind.items():
+                if len(group) > 1 and kind in BATCH_HANDLERS:
+                    self.run_batch(kind, group)
+                else:
+                    for job in group:
+                        self.run_job(job)
+
+    def run_job(self, job: Job) -> None:
+        """执行一个已认领的任务并记录结果"""
+        try:
+            with metrics.time(f"job_{job.kind}"):
+                HANDLERS[job.kind](self.reader, job)
+            self.reader.db.complete_job(job.id)
+            metrics.inc("rss_jobs_total", kind=job.kind, result="done")
+            self._log(f"✓ 任务完成: {job.kind} {job.key}")
+        except Exception as e:
+            self.reader.db.fail_job(job.id, str(e))
+            metrics.inc("rss_jobs_total", kind=job.kind, result="error")
+            self._log(f"✗ 任务失败（第{job.attempts}次）: {job.kind} {job.key}: {str(e)}")
+
+    def run_batch(self, kind: str, jobs: List[Job]) -> None:
+        """批量执行同一类型的已认领任务并逐个记录结果"""
+        try:
+            with metrics.time(f"job_{kind}_batch"):
+                results = BATCH_HANDLERS[kind](self.reader, jobs)
+        except Exception as e:
+            results = {job.id: e for job in jobs}
+        for job in jobs:
+            error = results.get(job.id)
+            if error is None:
+                self.reader.db.complete_job(job.id)
+                metrics.inc("rss_jobs_total", kind=job.kind, result="done")
+                self._log(f"✓ 任务完成: {job.kind} {job.key}")
+            else:
+                self.reader.db.fail_job(job.id, str(error))
+                metrics.inc("rss_jobs_total", kind=job.kind, result="error")
+                self._log(f"✗ 任务失败（第{job.attempts}次）: {job.kind} {job.key}: {str(error)}")
+
+    def _log(self, message: str) -> None:
+        if self.reader.log_callback:
+            self.reader.log_callback(message)
@@ -0,0 +1,230 @@
+"""运行指标模块：各处理阶段耗时、LLM token用量和缓存命中率
+
+指标保存在进程内，可通过Prometheus文本格式的HTTP接口（/metrics）
+或JSON（/metrics.json、dump_json）导出。
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+
+# 阶段耗时直方图的桶边界（秒）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    inner = ",".join(
+        f'{name}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in key
+    )
+    return "{" + inner + "}"
+
+
+class _Histogram:
+    """单个阶段的耗时分布"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+
+class Metrics:
+    """线程安全的进程内指标注册表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Histogram] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {
+            "rss_stage_duration_seconds": "各处理阶段耗时",
+            "rss_llm_requests_total": "LLM请求次数",
+            "rss_llm_tokens_total": "LLM token用量",
+            "rss_cache_requests_total": "缓存查询次数（按命中结果）",
+        }
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """记录代码块耗时，出错时同样计入"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """记录一次阶段耗时"""
+        with self._lock:
+            self._stages.setdefault(stage, _Histogram()).observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """计数器加value"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """设置仪表值"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def cache(self, cache: str, hit: bool) -> None:
+        """记录一次缓存查询结果"""
+        self.inc("rss_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def record_usage(self, task: str, model: str, usage) -> None:
+        """
+        记录一次LLM调用及其token用量
+
+        Args:
+            task: 调用类型（如translate、summarize）
+            model: 模型名称
+            usage: completion.usage对象，可能为None
+        """
+        self.inc("rss_llm_requests_total", task=task, model=model)
+        if usage is None:
+            return
+        for kind in ("prompt_tokens", "completion_tokens"):
+            tokens = getattr(usage, kind, None)
+            if tokens:
+                self.inc("rss_llm_tokens_total", tokens, task=task, model=model,
+                         kind=kind.replace("_tokens", ""))
+
+    def hit_rates(self) -> Dict[str, float]:
+        """按缓存名称计算命中率"""
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for key, value in self._counters.get("rss_cache_requests_total", {}).items():
+                labels = dict(key)
+                totals.setdefault(labels["cache"], {}).setdefault(labels["result"], 0)
+                totals[labels["cache"]][labels["result"]] += value
+        return {
+            cache: results.get("hit", 0) / (results.get("hit", 0) + results.get("miss", 0))
+            for cache, results in totals.items()
+            if results.get("hit", 0) + results.get("miss", 0)
+        }
+
+    def to_dict(self) -> dict:
+        """导出为可JSON序列化的字典"""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": hist.count,
+                    "total_seconds": hist.total,
+                    "avg_seconds": hist.total / hist.count if hist.count else 0.0,
+                    "max_seconds": hist.max,
+                }
+                for stage, hist in self._stages.items()
+            }
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            gauges = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._gauges.items()
+            }
+        return {
+            "stages": stages,
+            "counters": counters,
+            "gauges": gauges,
+            "cache_hit_rates": self.hit_rates(),
+        }
+
+    def dump_json(self, path: str) -> None:
+        """把当前指标写入JSON文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def render_prometheus(self) -> str:
+        """导出为Prometheus文本格式"""
+        lines = []
+        with self._lock:
+            name = "rss_stage_duration_seconds"
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, hist in sorted(self._stages.items()):
+                # observe()已按累计方式计数
+                for bound, count in zip(DURATION_BUCKETS, hist.bucket_counts):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {hist.total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+
+            for kind, registry in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(registry.items()):
+                    if name in self._help:
+                        lines.append(f"# HELP {name} {self._help[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局指标注册表
+metrics = Metrics()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0",
+                         registry: Optional[Metrics] = None) -> ThreadingHTTPServer:
+    """
+    在后台线程中启动指标HTTP接口
+
+    - /metrics       Prometheus文本格式
+    - /metrics.json  JSON格式
+
+    Args:
+        port: 监听端口
+        host: 监听地址
+        registry: 指标注册表，默认为全局metrics
+
+    Returns:
+        ThreadingHTTPServer: 服务器对象，可调用shutdown()停止
+    """
+    registry = registry or metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = registry.render_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(registry.to_dict(), ensure_ascii=False).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
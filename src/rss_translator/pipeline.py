@@ -0,0 +1,239 @@
+"""流水线式RSS获取处理模块
+
+把一次RSS更新拆分为 获取 → 解析 → 去重 → 翻译 → 保存 五个阶段，
+阶段之间用有界队列连接，每个阶段有独立的工作线程数。
+源B的下载可以和源A的翻译同时进行；下游处理不过来时，上游的put会阻塞，形成背压。
+"""
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import Callable, Dict, List, Optional
+from . import config
+from .metrics import metrics
+from .rss_reader import RSSReader
+
+
+class FeedJob:
+    """在各阶段之间传递的单个RSS源更新任务"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.data: Optional[bytes] = None
+        self.feed = None
+        self.new_entries: list = []
+        self.articles: list = []
+        self.started = time.perf_counter()
+
+
+class _Stage:
+    """流水线中的一个阶段"""
+
+    def __init__(self, name: str, func: Callable[[FeedJob], bool], workers: int, queue_size: int):
+        self.name = name
+        self.func = func          # 返回False表示任务在此阶段结束，不再向下游传递
+        self.workers = workers
+        self.queue: "Queue[FeedJob]" = Queue(maxsize=queue_size)
+        self.next: Optional["_Stage"] = None
+        self.busy = 0
+
+
+class IngestPipeline:
+    """
+    由有界队列连接的多阶段RSS获取处理流水线
+
+    用法:
+        pipeline = IngestPipeline(reader, on_complete=callback)
+        pipeline.start()
+        pipeline.submit(url)      # 队列满时阻塞
+        pipeline.join()           # 等待所有已提交任务完成
+        pipeline.stop()
+    """
+
+    def __init__(self, reader: RSSReader,
+                 on_complete: Optional[Callable[[str, Optional[int]], None]] = None,
+                 workers: Optional[Dict[str, int]] = None,
+                 queue_size: int = config.PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            reader: 提供各阶段处理方法的RSSReader
+            on_complete: 每个源处理完成后的回调 (url, 新增文章数量)，失败时数量为None
+            workers: 各阶段工作线程数，默认使用config.PIPELINE_WORKERS
+            queue_size: 每个阶段输入队列的容量
+        """
+        self.reader = reader
+        self.on_complete = on_complete
+        worker_counts = dict(config.PIPELINE_WORKERS, **(workers or {}))
+
+        self.stages: List[_Stage] = [
+            _Stage(name, func, worker_counts[name], queue_size)
+            for name, func in (
+                ("fetch", self._fetch),
+                ("parse", self._parse),
+                ("dedup", self._dedup),
+                ("translate", self._translate),
+                ("persist", self._persist),
+            )
+        ]
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next = next_stage
+
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+
+    def start(self) -> None:
+        """启动所有阶段的工作线程"""
+        for stage in self.stages:
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(stage,),
+                    name=f"ingest-{stage.name}-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, url: str, timeout: Optional[float] = None) -> bool:
+        """
+        提交一个RSS源，获取阶段队列已满时阻塞
+
+        Args:
+            url: RSS源URL
+            timeout: 最长等待时间，None表示一直等待
+
+        Returns:
+            bool: 是否提交成功
+        """
+        with self._lock:
+            self._pending += 1
+        try:
+            self.stages[0].queue.put(FeedJob(url), timeout=timeout)
+        except Full:
+            self._finish()
+            return False
+        self._update_depth(self.stages[0])
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交的任务完成，返回是否在超时前完成"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self) -> None:
+        """停止工作线程（不等待队列中剩余的任务，丢弃的任务也计为已结束，join不会一直等待）"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        for stage in self.stages:
+            while True:
+                try:
+                    job = stage.queue.get_nowait()
+                except Empty:
+                    break
+                self._drop(job, stage)
+
+    def queue_depths(self) -> Dict[str, Dict[str, int]]:
+        """各阶段当前排队和处理中的任务数"""
+        return {
+            stage.name: {"queued": stage.queue.qsize(), "busy": stage.busy}
+            for stage in self.stages
+        }
+
+    def _worker(self, stage: _Stage) -> None:
+        """阶段工作线程：取任务、处理、交给下一阶段"""
+        while not self._stop_event.is_set():
+            try:
+                job = stage.queue.get(timeout=0.5)
+            except Empty:
+                continue
+            self._update_depth(stage)
+            self._set_busy(stage, 1)
+            try:
+                forward = stage.func(job)
+            except Exception as e:
+                self._log(f"✗ {job.url} 在{stage.name}阶段失败: {str(e)}")
+                self._complete(job, None)
+                forward = False
+            finally:
+                self._set_busy(stage, -1)
+
+            if forward and stage.next:
+                # 下游队列满时阻塞，形成背压
+                forwarded = False
+                while not self._stop_event.is_set():
+                    try:
+                        stage.next.queue.put(job, timeout=0.5)
+                        forwarded = True
+                        break
+                    except Full:
+                        continue
+                if forwarded:
+                    self._update_depth(stage.next)
+                else:
+                    # 停止时仍未能交给下游
+                    self._drop(job, stage.next)
+
+    def _fetch(self, job: FeedJob) -> bool:
+        job.data = self.reader.download_feed(job.url)
+        return True
+
+    def _parse(self, job: FeedJob) -> bool:
+        job.feed = self.reader.parse_feed(job.data, job.url)
+        job.data = None
+        return True
+
+    def _dedup(self, job: FeedJob) -> bool:
+        job.new_entries = self.reader.find_new_entries(job.url, job.feed)
+        job.feed = None
+        if not job.new_entries:
+            self._complete(job, 0)
+            return False
+        job.articles = self.reader.build_articles(job.url, job.new_entries)
+        return True
+
+    def _translate(self, job: FeedJob) -> bool:
+        self.reader.translate_articles(job.articles)
+        return True
+
+    def _persist(self, job: FeedJob) -> bool:
+        self.reader.persist_articles(job.articles)
+        self._complete(job, sum(1 for article in job.articles if article.id is None))
+        return False
+
+    def _complete(self, job: FeedJob, new_count: Optional[int]) -> None:
+        """任务结束：记录耗时、调用回调"""
+        metrics.observe("ingest_total", time.perf_counter() - job.started)
+        if new_count is not None:
+            self._log(f"✓ {job.url}: 新增{new_count}篇文章")
+        try:
+            if self.on_complete:
+                self.on_complete(job.url, new_count)
+        except Exception as e:
+            self._log(f"✗ 完成回调出错: {str(e)}")
+        finally:
+            self._finish()
+
+    def _drop(self, job: FeedJob, stage: _Stage) -> None:
+        """停止时丢弃尚未处理的任务"""
+        metrics.inc("rss_pipeline_dropped_total", stage=stage.name)
+        self._log(f"流水线已停止，{job.url} 在{stage.name}阶段前被丢弃")
+        self._finish()
+
+    def _finish(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    def _set_busy(self, stage: _Stage, delta: int) -> None:
+        with self._lock:
+            stage.busy += delta
+            busy = stage.busy
+        metrics.set_gauge("rss_pipeline_busy_workers", busy, stage=stage.name)
+
+    def _update_depth(self, stage: _Stage) -> None:
+        metrics.set_gauge("rss_pipeline_queue_depth", stage.queue.qsize(), stage=stage.name)
+
+    def _log(self, message: str) -> None:
+        if self.reader.log_callback:
+            self.reader.log_callback(message)
@@ -0,0 +1,177 @@
+"""性能分析模块
+
+用 main.py --profile 或环境变量 PROFILE=1 启用，退出时在 PROFILE_DIR 下生成报告：
+  - cprofile.prof / cprofile.txt: 主线程的cProfile结果（可用snakeviz等工具查看.prof）
+  - stacks.txt: 所有线程的采样调用栈（折叠格式，可直接生成火焰图）
+  - memory.txt: tracemalloc内存分配增长最多的代码位置
+  - ui_lag.txt: 阻塞Tk主循环超过阈值的事件及阻塞时主线程的调用栈
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Tuple
+from . import config
+
+
+def _format_stack(frame, limit: int = 60) -> List[str]:
+    """把调用栈转换为从外到内的 函数名(文件:行号) 列表"""
+    entries = []
+    while frame is not None and len(entries) < limit:
+        code = frame.f_code
+        entries.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    entries.reverse()
+    return entries
+
+
+class Profiler:
+    """收集cProfile、采样调用栈、内存分配和界面卡顿数据"""
+
+    def __init__(self, output_dir: Optional[str] = None,
+                 sample_interval: float = config.PROFILE_SAMPLE_INTERVAL,
+                 lag_threshold: float = config.PROFILE_UI_LAG_MS / 1000):
+        """
+        Args:
+            output_dir: 报告目录，默认 PROFILE_DIR/<时间戳>
+            sample_interval: 调用栈采样间隔（秒）
+            lag_threshold: 主循环阻塞多久（秒）记为卡顿
+        """
+        self.output_dir = output_dir or os.path.join(
+            config.PROFILE_DIR, datetime.now().strftime("%Y%m%d-%H%M%S")
+        )
+        self.sample_interval = sample_interval
+        self.lag_threshold = lag_threshold
+        self.profile = cProfile.Profile()
+        self.stacks: Counter = Counter()
+        self.lag_events: List[Tuple[str, float, List[str]]] = []  # (开始时间, 阻塞秒数, 调用栈)
+        self.started = 0.0
+        self._main_ident = threading.main_thread().ident
+        self._stop_event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._memory_start = None
+        # Tk主循环心跳：主线程每次执行after回调时更新
+        self._tk_root = None
+        self._last_tick: Optional[float] = None
+        self._stall_stack: Optional[List[str]] = None
+
+    def start(self) -> "Profiler":
+        """开始收集"""
+        self.started = time.perf_counter()
+        tracemalloc.start(25)
+        self._memory_start = tracemalloc.take_snapshot()
+        self.profile.enable()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._sampler.start()
+        print(f"性能分析已启用，退出时报告保存到: {self.output_dir}")
+        return self
+
+    def watch_tk(self, root) -> None:
+        """
+        监控Tk主循环：主线程超过阈值没有处理心跳时，记录阻塞它的调用栈
+
+        Args:
+            root: Tk根窗口
+        """
+        self._tk_root = root
+        self._last_tick = time.perf_counter()
+        root.after(0, self._tick)
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        stalled = now - self._last_tick if self._last_tick is not None else 0.0
+        stack = self._stall_stack
+        if stack is not None and stalled >= self.lag_threshold:
+            started = datetime.now().timestamp() - stalled
+            self.lag_events.append((
+                datetime.fromtimestamp(started).strftime("%H:%M:%S.%f")[:-3], stalled, stack
+            ))
+            print(f"[性能分析] 主循环阻塞{stalled * 1000:.0f}ms: {stack[-1] if stack else '未知'}")
+        self._stall_stack = None
+        self._last_tick = now
+        if not self._stop_event.is_set():
+            try:
+                self._tk_root.after(max(1, int(self.lag_threshold * 250)), self._tick)
+            except Exception:
+                # 窗口已销毁
+                pass
+
+    def _sample_loop(self) -> None:
+        """定期采样所有线程的调用栈，并检查主循环是否卡住"""
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                stack = _format_stack(frame)
+                self.stacks[";".join([names.get(ident, str(ident))] + stack)] += 1
+
+            last_tick = self._last_tick
+            if (last_tick is not None and self._stall_stack is None
+                    and time.perf_counter() - last_tick >= self.lag_threshold):
+                # 主线程已阻塞超过阈值，记录此刻它在执行的代码
+                main_frame = frames.get(self._main_ident)
+                if main_frame is not None:
+                    self._stall_stack = _format_stack(main_frame)
+
+    def stop(self) -> str:
+        """停止收集并写出报告，返回报告目录"""
+        self._stop_event.set()
+        self.profile.disable()
+        if self._sampler:
+            self._sampler.join(timeout=1)
+        memory_end = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write_cprofile()
+        self._write_stacks()
+        self._write_memory(memory_end)
+        self._write_ui_lag()
+        print(f"性能分析报告已保存到: {self.output_dir}")
+        return self.output_dir
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    def _write_cprofile(self) -> None:
+        self.profile.dump_stats(self._path("cprofile.prof"))
+        text = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(50)
+        with open(self._path("cprofile.txt"), "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+
+    def _write_stacks(self) -> None:
+        with open(self._path("stacks.txt"), "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _write_memory(self, memory_end) -> None:
+        with open(self._path("memory.txt"), "w", encoding="utf-8") as f:
+            f.write(f"运行时长: {time.perf_counter() - self.started:.1f}秒\n\n")
+            f.write("内存增长最多的代码位置:\n")
+            for stat in memory_end.compare_to(self._memory_start, "lineno")[:30]:
+                f.write(f"{stat}\n")
+            f.write("\n当前占用最多的代码位置:\n")
+            for stat in memory_end.statistics("lineno")[:30]:
+                f.write(f"{stat}\n")
+
+    def _write_ui_lag(self) -> None:
+        with open(self._path("ui_lag.txt"), "w", encoding="utf-8") as f:
+            if self._tk_root is None:
+                f.write("未监控界面主循环\n")
+                return
+            f.write(f"阈值: {self.lag_threshold * 1000:.0f}ms，卡顿次数: {len(self.lag_events)}\n")
+            for started, seconds, stack in sorted(self.lag_events, key=lambda e: -e[1]):
+                f.write(f"\n[{started}] 阻塞 {seconds * 1000:.0f}ms\n")
+                for entry in stack:
+                    f.write(f"    {entry}\n")
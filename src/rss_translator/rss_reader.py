@@ -1,26 +1,158 @@
 """RSS阅读器模块"""
+import atexit
+import hashlib
+import multiprocessing
 import time
 import webbrowser
-import feedparser
 import requests
-from typing import List, Tuple, Optional, Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple, Optional, Callable
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from . import config
 from . import utils
 from .translator import TranslationService
+from .database.listener import ChangeListener
 from .database.manager import DatabaseManager
 from .database.models import Article
-from datetime import datetime
+from .dedup import canonicalize_url, find_near_duplicate, normalize_title, simhash
+from .feed_parser import ParsedFeed, parse_feed
+from .metrics import metrics
 import threading
-from queue import Queue
+
+def parse_article_html(html: str, base_url: str) -> Tuple[str, Optional[str]]:
+    """
+    从网页HTML中提取正文文本和<link rel="canonical">地址
+    
+    Args:
+        html: 网页HTML
+        base_url: 网页地址，用于解析相对的canonical链接
+        
+    Returns:
+        Tuple[str, Optional[str]]: (正文文本, 规范化后的canonical URL)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    canonical_url = None
+    link = soup.find('link', rel='canonical', href=True)
+    if link:
+        canonical_url = canonicalize_url(urljoin(base_url, link['href']))
+    
+    # 移除脚本和样式元素
+    for script in soup(['script', 'style']):
+        script.decompose()
+    
+    # 获取正文内容
+    text = soup.get_text()
+    
+    # 清理文本
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    
+    return text, canonical_url
+
+def parse_article_bytes(data: bytes, encoding: Optional[str], base_url: str) -> Tuple[str, Optional[str]]:
+    """
+    解码网页原始内容后提取正文，可在子进程中执行
+    
+    Args:
+        data: 网页原始字节
+        encoding: 响应声明的编码，None时按UTF-8解码
+        base_url: 网页地址
+    """
+    html = data.decode(encoding or "utf-8", errors="replace")
+    return parse_article_html(html, base_url)
+
+# 正文提取进程池（config.EXTRACT_PROCESSES > 0时启用）
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = threading.Lock()
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """创建或返回正文提取进程池"""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            # 程序中已有多个线程（界面、数据库监听、后台更新），fork可能复制其他线程持有的锁，
+            # 子进程改用forkserver（不支持时用spawn）启动
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _extract_pool = ProcessPoolExecutor(max_workers=config.EXTRACT_PROCESSES, mp_context=context)
+            atexit.register(_extract_pool.shutdown, wait=False)
+        return _extract_pool
+
+def _run_extract(func: Callable, *args):
+    """在进程池（启用时）或当前线程中执行提取函数"""
+    global _extract_pool
+    if config.EXTRACT_PROCESSES > 0:
+        try:
+            return _get_extract_pool().submit(func, *args).result()
+        except BrokenProcessPool:
+            # 子进程异常退出，丢弃进程池，下次调用时重建
+            with _extract_pool_lock:
+                _extract_pool = None
+    return func(*args)
+
+def extract_article(data: bytes, encoding: Optional[str], base_url: str) -> Tuple[str, Optional[str]]:
+    """
+    提取网页正文和canonical URL
+    
+    BeautifulSoup解析是占用GIL的纯Python计算，启用进程池后在子进程中执行，
+    多个总结线程可以同时利用多个CPU核心，也不会阻塞界面主循环。
+    """
+    return _run_extract(parse_article_bytes, data, encoding, base_url)
+
+def parse_article_paragraphs(html: str) -> List[str]:
+    """
+    按段落提取网页正文，用于全文翻译
+    
+    Args:
+        html: 网页HTML
+        
+    Returns:
+        List[str]: 段落文本列表（已合并空白、去掉重复的相邻段落）
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        script.decompose()
+    
+    paragraphs = []
+    for element in soup.find_all(['h1', 'h2', 'h3', 'h4', 'p']):
+        text = ' '.join(element.get_text().split())
+        if text and (not paragraphs or paragraphs[-1] != text):
+            paragraphs.append(text)
+    return paragraphs
+
+def parse_paragraph_bytes(data: bytes, encoding: Optional[str]) -> List[str]:
+    """解码网页原始内容后按段落提取正文，可在子进程中执行"""
+    return parse_article_paragraphs(data.decode(encoding or "utf-8", errors="replace"))
 
 class RSSReader:
-    def __init__(self, translator: TranslationService):
+    def __init__(self, translator: TranslationService, db: Optional[DatabaseManager] = None):
+        """
+        Args:
+            translator: 翻译服务
+            db: 数据库管理器，默认连接config中配置的数据库
+        """
         self.translator = translator
         self.articles: List[Tuple[str, str, str]] = []  # [(标题, 翻译, URL)]
-        self.db = DatabaseManager()
-        self.translation_queue = Queue()
-        self.processed_articles = Queue()
+        self.article_times: Dict[str, datetime] = {}    # URL → 创建时间，用于合并变更时保持列表顺序
+        self.db = db if db is not None else DatabaseManager()
+        self.source: Optional[str] = None  # 当前显示的RSS源
+        # 保护source、articles和article_times：界面线程切换RSS源，监听线程合并变更
+        self._articles_lock = threading.Lock()
+        self.listener: Optional[ChangeListener] = None
+        # RSS源 → 已保存条目的指纹，与数据库feed_state表同步
+        self._feed_fingerprints: Dict[str, Set[str]] = {}
+        self._feed_lock = threading.Lock()
+        # 懒加载翻译：正在翻译的文章URL，以及执行翻译的线程池
+        self._lazy_pending: Set[str] = set()
+        # 翻译失败的文章URL → (失败次数, 下次可重试的时间)
+        self._lazy_failures: Dict[str, Tuple[int, float]] = {}
+        self._lazy_lock = threading.Lock()
+        self._lazy_pool: Optional[ThreadPoolExecutor] = None
         self.status_callback = None  # 初始化状态回调属性
         self.log_callback = None  # 添加日志回调
 
@@ -32,17 +164,13 @@ class RSSReader:
         """设置日志回调函数"""
         self.log_callback = callback
 
-    def translate_worker(self, titles: List[str]):
-        """翻译工作线程"""
-        try:
-            translated_titles = self.translator.translate_batch(titles)
-            self.translation_queue.put(translated_titles)
-        except Exception as e:
-            print(f"翻译过程出错: {str(e)}")
-            self.translation_queue.put(None)
-
-    def update_feed_worker(self, url: str):
-        """后台更新线程：获取RSS、翻译标题、保存到数据库"""
+    def update_feed_worker(self, url: str) -> Optional[int]:
+        """
+        后台更新线程：获取RSS、翻译标题、保存到数据库
+        
+        Returns:
+            Optional[int]: 新增文章数量，更新失败时返回None
+        """
         try:
             if self.log_callback:
                 self.log_callback("=== 开始更新RSS ===")
@@ -52,31 +180,19 @@ class RSSReader:
                 self.log_callback("正在获取RSS源...")
             
             # 获取RSS
-            feed = feedparser.parse(url)
+            feed = self.parse_feed(self.download_feed(url), url)
             if self.log_callback:
-                self.log_callback(f"RSS源标题: {feed.feed.get('title', '未知')}")
+                self.log_callback(f"RSS源标题: {feed.title or '未知'}")
             
             if self.status_callback:
                 self.status_callback("↻ 对比新文章...", False)
             if self.log_callback:
                 self.log_callback("\n正在对比新文章...")
+                self.log_callback(f"RSS源文章总数: {len(feed.articles)}篇")
             
-            # 获取所有RSS条目的URL
-            feed_urls = [entry.link for entry in feed.entries]
+            new_entries = self.find_new_entries(url, feed)
             if self.log_callback:
-                self.log_callback(f"RSS源文章总数: {len(feed_urls)}篇")
-            
-            # 从数据库获取已存在的URL
-            existing_articles = self.db.get_articles_by_source(url)
-            existing_urls = {article.url for article in existing_articles}
-            if self.log_callback:
-                self.log_callback(f"数据库已有文章: {len(existing_urls)}篇")
-            
-            # 找出新文章
-            new_entries = [
-                entry for entry in feed.entries 
-                if entry.link not in existing_urls
-            ]
+                self.log_callback(f"数据库已有文章: {len(feed.articles) - len(new_entries)}篇")
             
             if not new_entries:
                 if self.status_callback:
@@ -84,55 +200,63 @@ class RSSReader:
                 if self.log_callback:
                     self.log_callback("✓ 没有新文章，已是最新")
                     self.log_callback("=== 更新完成 ===\n")
-                return
+                return 0
             
+            added = sum(1 for article, _, _ in new_entries if article.id is None)
             if self.log_callback:
-                self.log_callback(f"\n发现{len(new_entries)}篇新文章:")
-                for i, entry in enumerate(new_entries, 1):
-                    self.log_callback(f"{i}. {entry.title}")
+                self.log_callback(f"\n发现{added}篇新文章，{len(new_entries) - added}篇标题有更新:")
+                for i, (article, _, _) in enumerate(new_entries, 1):
+                    self.log_callback(f"{i}. {article.title}")
             
-            if self.status_callback:
-                self.status_callback(f"↻ 翻译{len(new_entries)}篇新文章...", False)
-            if self.log_callback:
-                self.log_callback("\n开始翻译新文章标题...")
+            # 准备新文章数据，重复文章直接复用已有翻译
+            articles_data = self.build_articles(url, new_entries)
+            pending = [article for article in articles_data if not article.translated_title]
+            reused = len(articles_data) - len(pending)
+            if reused and self.log_callback:
+                self.log_callback(f"\n{reused}篇为重复文章，复用已有翻译")
             
-            # 只翻译新文章的标题
-            new_titles = [entry.title for entry in new_entries]
-            translated_titles = self.translator.translate_batch(new_titles)
+            if pending and config.LAZY_TRANSLATE:
+                # 懒加载模式：先保存原标题，显示到可见区域时再翻译
+                if self.log_callback:
+                    self.log_callback(f"\n{len(pending)}篇新文章的标题将在显示时翻译")
+                pending = []
             
-            if self.log_callback:
-                self.log_callback("\n翻译结果:")
-                for i, (title, translated) in enumerate(zip(new_titles, translated_titles), 1):
-                    self.log_callback(f"{i}. {translated}")
-                    self.log_callback(f"   原标题: {title}")
+            if pending:
+                if self.status_callback:
+                    self.status_callback(f"↻ 翻译{len(pending)}篇新文章...", False)
+                if self.log_callback:
+                    self.log_callback("\n开始翻译新文章标题...")
+                
+                if config.TRANSLATE_STREAM:
+                    # 每个标题翻译完成后立即保存，界面通过数据库通知逐条显示
+                    ready = [article for article in articles_data if article.translated_title]
+                    if ready:
+                        self.persist_articles(ready)
+                    self.stream_translate_articles(pending)
+                else:
+                    self.translate_articles(pending)
+                
+                if self.log_callback:
+                    self.log_callback("\n翻译结果:")
+                    for i, article in enumerate(pending, 1):
+                        self.log_callback(f"{i}. {article.translated_title}")
+                        self.log_callback(f"   原标题: {article.title}")
             
-            if self.status_callback:
-                self.status_callback("↻ 保存到数据库...", False)
-            if self.log_callback:
-                self.log_callback("\n正在保存到数据库...")
-            
-            # 准备新文章数据
-            articles_data = []
-            for entry, translated_title in zip(new_entries, translated_titles):
-                article = Article(
-                    id=None,
-                    title=entry.title,
-                    translated_title=translated_title,
-                    url=entry.link,
-                    source=url,
-                    created_at=datetime.now(),
-                    summary=None  # 初始化summary为None
-                )
-                articles_data.append(article)
-            
-            # 保存到数据库
-            self.db.save_articles(articles_data)
+            if not (pending and config.TRANSLATE_STREAM):
+                if self.status_callback:
+                    self.status_callback("↻ 保存到数据库...", False)
+                if self.log_callback:
+                    self.log_callback("\n正在保存到数据库...")
+                
+                # 保存到数据库
+                self.persist_articles(articles_data)
             
             if self.status_callback:
                 self.status_callback(f"✓ 已更新{len(new_entries)}篇", False)
             if self.log_callback:
                 self.log_callback(f"\n✓ 成功更新{len(new_entries)}篇文章")
                 self.log_callback("=== 更新完成 ===\n")
+            return added
             
         except Exception as e:
             if self.status_callback:
@@ -140,13 +264,243 @@ class RSSReader:
             if self.log_callback:
                 self.log_callback(f"✗ 后台更新过程出错: {str(e)}")
                 self.log_callback("=== 更新失败 ===\n")
+            return None
+
+    # 以下各方法对应更新流程的一个阶段，既由update_feed_worker顺序调用，
+    # 也由IngestPipeline在不同的线程中流水线执行
+
+    def download_feed(self, url: str) -> bytes:
+        """获取阶段：下载RSS源"""
+        with metrics.time("fetch"):
+            response = requests.get(url, timeout=config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.content
+
+    def parse_feed(self, data: bytes, url: str) -> ParsedFeed:
+        """解析阶段：把RSS源内容解析为文章对象（尚未翻译）"""
+        with metrics.time("parse"):
+            return parse_feed(data, url)
+
+    def find_new_entries(self, url: str, feed: ParsedFeed) -> List[Tuple[Article, str, Optional[Article]]]:
+        """
+        对比阶段：找出数据库中还没有的条目，以及标题有变化的已有条目
+        
+        指纹与上次获取时相同的条目直接跳过，不查询数据库；
+        同一源内的URL变体视为已存在，其他源中的同一篇文章作为重复文章返回。
+        新条目按发布时间从新到旧分配递减的创建时间，文章列表保持源中的发布顺序。
+        
+        Returns:
+            List[Tuple[Article, str, Optional[Article]]]: (文章, 规范化URL, 其他源中的同一篇文章) 列表，
+                标题有变化的已有条目id不为None
+        """
+        with metrics.time("diff"):
+            known = self._known_fingerprints(url)
+            unchanged = set()
+            candidates = []
+            for article in feed.articles:
+                if article.fingerprint in known:
+                    unchanged.add(article.fingerprint)
+                else:
+                    candidates.append(article)
+            metrics.inc("rss_feed_entries_total", len(unchanged), result="unchanged")
+            if not candidates:
+                self._remember_fingerprints(url, unchanged)
+                return []
+            
+            # 获取指纹有变化的条目的URL及其规范化形式
+            feed_urls = [article.url for article in candidates]
+            canonical_urls = [canonicalize_url(link) for link in feed_urls]
+            
+            # 从数据库获取已存在的文章（包括其他源中的同一篇文章）
+            existing_articles = self.db.find_articles_by_urls(feed_urls, canonical_urls)
+            existing_by_url = {article.url: article for article in existing_articles}
+            existing_by_canonical = {
+                article.canonical_url: article
+                for article in existing_articles if article.canonical_url
+            }
+            
+            new_entries = []
+            seen = set()
+            for article, canonical_url in zip(candidates, canonical_urls):
+                existing = existing_by_url.get(article.url)
+                if existing:
+                    if existing.source == url and existing.title != article.title:
+                        # 标题有变化：保留原有ID、创建时间和去重信息，重新翻译
+                        article.id = existing.id
+                        article.created_at = existing.created_at
+                        article.duplicate_of = existing.duplicate_of
+                        new_entries.append((article, canonical_url, None))
+                    else:
+                        unchanged.add(article.fingerprint)
+                    continue
+                if canonical_url in seen:
+                    continue
+                seen.add(canonical_url)
+                original = existing_by_canonical.get(canonical_url)
+                if original and original.source == url:
+                    unchanged.add(article.fingerprint)
+                    continue
+                new_entries.append((article, canonical_url, original))
+            
+            updated = sum(1 for article, _, _ in new_entries if article.id is not None)
+            metrics.inc("rss_feed_entries_total", len(candidates) - len(new_entries), result="existing")
+            metrics.inc("rss_feed_entries_total", updated, result="updated")
+            metrics.inc("rss_feed_entries_total", len(new_entries) - updated, result="new")
+            self._order_by_publish_time([article for article, _, _ in new_entries if article.id is None])
+            self._remember_fingerprints(url, unchanged)
+            return new_entries
+
+    def _order_by_publish_time(self, articles: List[Article]) -> None:
+        """
+        为同一次获取的新文章分配递减的创建时间
+        
+        所有条目都有发布时间时按发布时间从新到旧排列，否则保持源中的顺序
+        """
+        if all(article.published_at for article in articles):
+            articles = sorted(articles, key=lambda article: article.published_at, reverse=True)
+        for rank, article in enumerate(articles):
+            article.created_at = article.created_at - timedelta(microseconds=rank)
+
+    def _known_fingerprints(self, source: str) -> Set[str]:
+        """RSS源已保存条目的指纹，首次使用时从数据库加载"""
+        with self._feed_lock:
+            fingerprints = self._feed_fingerprints.get(source)
+        if fingerprints is None:
+            try:
+                fingerprints = self.db.get_feed_state(source)
+            except Exception as e:
+                print(f"读取RSS源状态时出错: {str(e)}")
+                fingerprints = set()
+            with self._feed_lock:
+                self._feed_fingerprints[source] = fingerprints
+        return fingerprints
+
+    def _remember_fingerprints(self, source: str, fingerprints: Set[str]) -> None:
+        """记录RSS源已保存条目的指纹（只保留源中当前仍有的条目），有变化时写入数据库"""
+        with self._feed_lock:
+            if self._feed_fingerprints.get(source) == fingerprints:
+                return
+            self._feed_fingerprints[source] = fingerprints
+        try:
+            self.db.save_feed_state(source, fingerprints)
+        except Exception as e:
+            print(f"保存RSS源状态时出错: {str(e)}")
+
+    def build_articles(self, source: str,
+                       new_entries: List[Tuple[Article, str, Optional[Article]]]) -> List[Article]:
+        """
+        去重阶段：补全新文章的去重信息，并标记跨源重复或标题近似重复的文章
+        
+        只有规范化URL相同或规范化标题完全相同时才复用已有译文；
+        标题近似（SimHash）的文章只通过duplicate_of关联，仍单独翻译和总结。
+        
+        Args:
+            source: RSS源URL
+            new_entries: find_new_entries的返回值
+            
+        Returns:
+            List[Article]: 文章对象列表，可复用翻译的文章已填入translated_title
+        """
+        with metrics.time("dedup"):
+            recent = self.db.get_recent_title_hashes(config.DEDUP_WINDOW)
+            candidates = [(article_id, fingerprint) for article_id, fingerprint, _, _ in recent]
+            translations = {}
+            for _, _, title, translated in recent:
+                if translated:
+                    translations.setdefault(normalize_title(title), translated)
+            
+            articles = []
+            for article, canonical_url, original in new_entries:
+                article.source = source
+                article.canonical_url = canonical_url
+                article.title_simhash = simhash(article.title)
+                if article.id is not None:
+                    # 标题有变化的已有文章，需要重新翻译
+                    article.translated_title = None
+                elif original:
+                    article.duplicate_of = original.duplicate_of or original.id
+                    article.translated_title = original.translated_title
+                else:
+                    article.duplicate_of = find_near_duplicate(
+                        article.title_simhash, candidates, config.TITLE_SIMHASH_DISTANCE
+                    )
+                    article.translated_title = translations.get(normalize_title(article.title))
+                articles.append(article)
+        
+        reused = sum(1 for article in articles if article.translated_title)
+        metrics.inc("rss_cache_requests_total", reused, cache="title_translation", result="hit")
+        metrics.inc("rss_cache_requests_total", len(articles) - reused,
+                    cache="title_translation", result="miss")
+        return articles
+
+    def translate_articles(self, articles: List[Article]) -> None:
+        """翻译阶段：翻译尚无译文的文章标题（原地填入translated_title）"""
+        pending = [article for article in articles if not article.translated_title]
+        if not pending:
+            return
+        with metrics.time("translate"):
+            translated_titles = self.translator.translate_batch([article.title for article in pending])
+        for article, translated_title in zip(pending, translated_titles):
+            article.translated_title = translated_title
+
+    def stream_translate_articles(self, articles: List[Article]) -> None:
+        """
+        流式翻译并分小批保存文章标题
+        
+        译文累积TRANSLATE_STREAM_BATCH个，或距上次保存超过TRANSLATE_STREAM_FLUSH_INTERVAL秒时
+        写入数据库（随之发送一次变更通知），避免逐篇保存使每个监听的界面反复合并整个列表；
+        每批写入数据库后记录其条目指纹。
+        """
+        with metrics.time("translate"):
+            done = 0
+            batch: List[Article] = []
+            last_flush = time.monotonic()
+            for index, translation in self.translator.translate_batch_stream(
+                    [article.title for article in articles]):
+                article = articles[index]
+                article.translated_title = translation
+                batch.append(article)
+                done += 1
+                if (len(batch) >= config.TRANSLATE_STREAM_BATCH
+                        or time.monotonic() - last_flush >= config.TRANSLATE_STREAM_FLUSH_INTERVAL):
+                    self.persist_articles(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+                if self.status_callback:
+                    self.status_callback(f"↻ 已翻译{done}/{len(articles)}篇...", False)
+            if batch:
+                self.persist_articles(batch)
+
+    def persist_articles(self, articles: List[Article]) -> None:
+        """
+        保存阶段：把文章写入数据库
+        
+        文章真正写入数据库后才记录其指纹（之后的刷新不再处理这些条目）；启用延迟写入时
+        在批量提交成功后记录，连续提交失败被丢弃的文章不记录，下次刷新时重新获取。
+        """
+        with metrics.time("persist"):
+            self.db.save_articles(articles, on_saved=self._remember_articles)
+
+    def _remember_articles(self, articles: List[Article]) -> None:
+        """记录已写入数据库的文章的指纹"""
+        by_source = {}
+        for article in articles:
+            if article.fingerprint:
+                by_source.setdefault(article.source, set()).add(article.fingerprint)
+        for source, fingerprints in by_source.items():
+            self._remember_fingerprints(source, self._known_fingerprints(source) | fingerprints)
 
     def fetch_feed(self, url: str = config.DEFAULT_RSS_URL) -> None:
-        """获取并解析RSS源"""
-        # 首先从数据库获取现有文章
-        db_articles = self.db.get_articles_by_source(url)
-        self.articles = [(article.title, article.translated_title, article.url) 
-                        for article in db_articles]
+        """
+        获取并解析RSS源
+        
+        立即返回数据库中已有的文章；后台更新保存的新文章通过数据库通知送达，
+        需要先调用start_live_updates()
+        """
+        # 首先从数据库获取现有文章；查询期间持有锁，监听线程此时送达的本源变更在加载后再合并
+        with self._articles_lock:
+            self.source = url
+            self._set_articles(self.db.get_articles_by_source(url))
         
         # 启动后台更新线程
         update_thread = threading.Thread(
@@ -155,13 +509,157 @@ class RSSReader:
         )
         update_thread.daemon = True  # 设置为守护线程，主程序退出时自动结束
         update_thread.start()
+
+    def _set_articles(self, db_articles: List[Article]) -> None:
+        """用数据库中的文章替换当前文章列表，调用方持有self._articles_lock（或尚无其他线程）"""
+        self.articles = [(article.title, article.translated_title, article.url)
+                         for article in db_articles]
+        self.article_times = {article.url: article.created_at for article in db_articles}
+
+    def translate_titles(self, urls: List[str]) -> int:
+        """
+        懒加载模式：在后台翻译当前列表中尚未翻译的标题
+        
+        每LAZY_TRANSLATE_BATCH个标题一次请求，按urls的顺序（可见的行在前）提交；
+        正在翻译的文章不会重复提交。翻译失败的标题按指数退避延迟重试，
+        失败LAZY_TRANSLATE_MAX_RETRIES次后不再自动重试。译文写入数据库后通过变更通知更新列表。
+        
+        Args:
+            urls: 需要显示译文的文章URL（可见区域及预取的行）
+            
+        Returns:
+            int: 本次提交翻译的标题数量
+        """
+        titles = {url: title for title, translated_title, url in self.articles if not translated_title}
+        now = time.monotonic()
+        with self._lazy_lock:
+            pending = [(url, titles[url]) for url in dict.fromkeys(urls)
+                       if url in titles and url not in self._lazy_pending and self._lazy_ready(url, now)]
+            if not pending:
+                return 0
+            self._lazy_pending.update(url for url, _ in pending)
+            if self._lazy_pool is None:
+                self._lazy_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="lazy-translate")
+            pool = self._lazy_pool
+        size = max(1, config.LAZY_TRANSLATE_BATCH)
+        for offset in range(0, len(pending), size):
+            pool.submit(self._translate_titles, pending[offset:offset + size])
+        return len(pending)
+
+    def _lazy_ready(self, url: str, now: float) -> bool:
+        """标题是否可以提交翻译（未失败过，或已过退避时间且未超过重试次数），调用方持有self._lazy_lock"""
+        failures, retry_at = self._lazy_failures.get(url, (0, 0.0))
+        return failures < config.LAZY_TRANSLATE_MAX_RETRIES and now >= retry_at
+
+    def _translate_titles(self, batch: List[Tuple[str, str]]) -> None:
+        """翻译一批标题并保存"""
+        urls = [url for url, _ in batch]
+        try:
+            with metrics.time("translate"):
+                translations = self.translator.translate_batch([title for _, title in batch])
+            with metrics.time("persist"):
+                self.db.update_translated_titles([
+                    (url, title, translation) for (url, title), translation in zip(batch, translations)
+                ])
+            metrics.inc("rss_lazy_translations_total", len(batch))
+            with self._lazy_lock:
+                for url in urls:
+                    self._lazy_failures.pop(url, None)
+        except Exception as e:
+            if self.log_callback:
+                self.log_callback(f"✗ 翻译标题失败: {str(e)}")
+            metrics.inc("rss_lazy_translation_failures_total", len(batch))
+            # 失败的标题在退避时间之后再次显示时重新提交
+            now = time.monotonic()
+            with self._lazy_lock:
+                for url in urls:
+                    failures = self._lazy_failures.get(url, (0, 0.0))[0] + 1
+                    delay = config.LAZY_TRANSLATE_RETRY_DELAY * 2 ** (failures - 1)
+                    self._lazy_failures[url] = (failures, now + delay)
+        finally:
+            with self._lazy_lock:
+                self._lazy_pending.difference_update(urls)
+
+    def start_live_updates(self, on_change: Callable[[dict], None]) -> None:
+        """
+        监听数据库变更，把其他实例（以及本实例后台线程）写入的文章和总结同步到本地
         
-        if not self.articles:
-            # 等待后台更新完成第一批数据
-            time.sleep(2)  # 给后台线程一些时间来获取和处理数据
-            db_articles = self.db.get_articles_by_source(url)
-            self.articles = [(article.title, article.translated_title, article.url) 
-                           for article in db_articles]
+        Args:
+            on_change: 本地数据更新后的回调，在监听线程中调用，参数为变更事件
+                       （type为 articles、summary 或 reconnect）
+        """
+        self.listener = ChangeListener(
+            self.db.conn_params, lambda event: self._apply_change(event, on_change)
+        ).start()
+
+    def stop_live_updates(self) -> None:
+        """停止监听数据库变更"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+
+    def _apply_change(self, event: dict, on_change: Callable[[dict], None]) -> None:
+        """
+        把数据库变更事件应用到缓存和当前文章列表
+        
+        在监听线程中执行：数据库查询不持有锁，合并到列表前在锁内再次确认当前RSS源，
+        查询期间用户切换了RSS源时丢弃结果（新源的文章由fetch_feed重新加载）。
+        """
+        kind = event.get("type")
+        if kind == "articles":
+            source = event.get("source")
+            if source != self.source:
+                # 其他RSS源的文章不在当前列表中，只需使缓存失效，不必查询数据库
+                self.db.invalidate_ids(event.get("ids", []), source)
+                return
+            articles = self.db.get_articles_by_ids(event.get("ids", []))
+            self.db.invalidate([article.url for article in articles], {source})
+            if not articles:
+                return
+            with self._articles_lock:
+                if source != self.source:
+                    return
+                added = self._merge_articles(articles)
+            # 告诉界面哪些行有变化，以及是否有新文章，没有新文章时只需更新这些行
+            event = dict(event, urls=list(dict.fromkeys(article.url for article in articles)), added=added)
+        elif kind == "summary":
+            self.db.invalidate_summary(event.get("url"))
+        elif kind == "reconnect":
+            self.db.clear_cache()
+            source = self.source
+            if source:
+                db_articles = self.db.get_articles_by_source(source)
+                with self._articles_lock:
+                    if source != self.source:
+                        return
+                    self._set_articles(db_articles)
+        else:
+            return
+        on_change(event)
+
+    def _merge_articles(self, articles: List[Article]) -> bool:
+        """
+        把有变化的文章合并到当前列表，调用方持有self._articles_lock
+        
+        Returns:
+            bool: 是否有新文章加入列表
+        """
+        changed = {article.url: (article.title, article.translated_title, article.url)
+                   for article in articles}
+        self.article_times.update((article.url, article.created_at) for article in articles)
+        # 已有文章原位更新，新文章按创建时间插入（流式翻译时同一批文章逐篇送达）
+        existing = [changed.pop(item[2], item) for item in self.articles]
+        if not changed:
+            # 只有已有文章更新（例如懒加载翻译的译文），顺序不变
+            self.articles = existing
+            return False
+        merged = list(changed.values()) + existing
+        merged.sort(key=lambda item: self.article_times.get(item[2]) or datetime.min, reverse=True)
+        # 与从数据库加载时一样，只保留最新的ARTICLE_LIST_LIMIT篇
+        for _, _, url in merged[config.ARTICLE_LIST_LIMIT:]:
+            self.article_times.pop(url, None)
+        self.articles = merged[:config.ARTICLE_LIST_LIMIT]
+        return True
 
     def get_article_content(self, url: str) -> Optional[str]:
         """
@@ -173,24 +671,25 @@ class RSSReader:
         Returns:
             Optional[str]: 文章内容，如果获取失败则返回None
         """
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 移除脚本和样式元素
-            for script in soup(['script', 'style']):
-                script.decompose()
-            
-            # 获取正文内容
-            text = soup.get_text()
-            
-            # 清理文本
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+        page = self.fetch_article(url)
+        return page[0] if page else None
+
+    def fetch_article(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        获取文章内容及页面声明的规范URL
+        
+        Args:
+            url: 文章URL
             
-            return text
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: (文章内容, 规范化后的canonical URL)，获取失败则返回None
+        """
+        try:
+            with metrics.time("content_fetch"):
+                response = requests.get(url, timeout=config.REQUEST_TIMEOUT)
+                response.raise_for_status()
+            with metrics.time("extract"):
+                return extract_article(response.content, response.encoding, response.url or url)
         except Exception:
             return None
 
@@ -235,4 +734,102 @@ class RSSReader:
                 else:
                     print(f'请输入1到{len(self.articles)}之间的数字')
             except ValueError:
-                print('请输入有效的数字或q退出')
\ No newline at end of file
+                print('请输入有效的数字或q退出')
+
+    def fetch_paragraphs(self, url: str) -> Optional[List[str]]:
+        """
+        获取文章并按段落提取正文
+        
+        Returns:
+            Optional[List[str]]: 段落列表，获取失败则返回None
+        """
+        try:
+            with metrics.time("content_fetch"):
+                response = requests.get(url, timeout=config.REQUEST_TIMEOUT)
+                response.raise_for_status()
+            with metrics.time("extract"):
+                return _run_extract(parse_paragraph_bytes, response.content, response.encoding)
+        except Exception:
+            return None
+
+    def translate_article(self, url: str,
+                          on_paragraph: Callable[[int, str, Optional[str]], None],
+                          cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        逐段翻译全文，按原文顺序回调每一段
+        
+        已翻译过的段落（按模型和段落内容的哈希，任一可处理段落翻译的模型的译文均可）
+        直接使用数据库中的译文，其余段落并发翻译；前面的段落完成后立即回调，不等待全文翻译结束。
+        
+        Args:
+            url: 文章URL
+            on_paragraph: 回调 (段落序号, 原文, 译文)，翻译失败时译文为None
+            cancelled: 每段输出前检查，返回True时（例如用户已切换文章）取消尚未开始的段落翻译并返回
+            
+        Returns:
+            int: 已输出的段落数量，取消时少于全文段落数
+            
+        Raises:
+            Exception: 无法获取文章内容
+        """
+        cancelled = cancelled or (lambda: False)
+        paragraphs = self.fetch_paragraphs(url)
+        if not paragraphs:
+            raise Exception("无法获取文章内容")
+        
+        models = self.translator.paragraph_models()
+        keys = [[paragraph_hash(paragraph, model) for model in models] for paragraph in paragraphs]
+        cached = self.db.get_paragraph_translations([digest for digests in keys for digest in digests])
+        translations = [next((cached[digest] for digest in digests if digest in cached), None)
+                        for digests in keys]
+        hits = sum(1 for translation in translations if translation is not None)
+        metrics.inc("rss_cache_requests_total", hits, cache="paragraph_translation", result="hit")
+        metrics.inc("rss_cache_requests_total", len(paragraphs) - hits,
+                    cache="paragraph_translation", result="miss")
+        
+        pool = ThreadPoolExecutor(max_workers=config.PARAGRAPH_WORKERS)
+        futures = {}
+        try:
+            for paragraph, translation in zip(paragraphs, translations):
+                if translation is None and paragraph not in futures:
+                    futures[paragraph] = pool.submit(self._translate_paragraph, paragraph, cancelled)
+            
+            # 按原文顺序等待，已完成的前缀段落立即输出
+            for index, (paragraph, translation) in enumerate(zip(paragraphs, translations)):
+                if translation is None:
+                    future = futures[paragraph]
+                    # 等待期间也定期检查是否已取消，不必等正在进行的请求完成
+                    while not wait([future], timeout=0.2).done:
+                        if cancelled():
+                            return index
+                    translation = future.result()
+                if cancelled():
+                    return index
+                on_paragraph(index, paragraph, translation)
+        finally:
+            # 取消时不等待尚未开始的段落；已发出的请求完成后仍写入缓存
+            # （shutdown的cancel_futures参数需要Python 3.9，这里逐个取消）
+            for future in futures.values():
+                future.cancel()
+            pool.shutdown(wait=False)
+        return len(paragraphs)
+
+    def _translate_paragraph(self, paragraph: str, cancelled: Callable[[], bool]) -> Optional[str]:
+        """翻译单个段落并按实际使用的模型写入缓存，失败或已取消时返回None"""
+        if cancelled():
+            return None
+        try:
+            with metrics.time("translate_paragraph"):
+                translation, model = self.translator.translate_paragraph(paragraph)
+        except Exception as e:
+            if self.log_callback:
+                self.log_callback(f"✗ 段落翻译失败: {str(e)}")
+            return None
+        self.db.save_paragraph_translations({paragraph_hash(paragraph, model): translation})
+        return translation
+
+
+def paragraph_hash(paragraph: str, model: str) -> str:
+    """段落缓存键：翻译所用模型名和段落内容的SHA-1"""
+    return hashlib.sha1(f"{model}\n{paragraph}".encode("utf-8")).hexdigest()
+
@@ -1,15 +1,264 @@
 """翻译服务模块"""
-from typing import List
-from openai import OpenAI
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import openai
 from . import config
+from .backends import Backend, BackendRouter, load_backends
+from .metrics import metrics
+
+def parse_numbered_response(response_text: str, expected: int) -> List[str]:
+    """
+    解析编号格式的批量翻译结果
+    
+    Args:
+        response_text: 模型返回的文本，每行格式为"编号. 译文"
+        expected: 期望的结果数量
+        
+    Returns:
+        List[str]: 按顺序排列的译文列表
+    """
+    # 处理翻译结果，提取每个标题的翻译
+    translations = []
+    for line in response_text.split('\n'):
+        line = line.strip()
+        if line:
+            # 移除编号和点号，只保留翻译内容
+            parts = line.split('.', 1)
+            if len(parts) > 1:
+                translations.append(parts[1].strip())
+    
+    # 验证翻译结果数量
+    if len(translations) != expected:
+        raise Exception(f"翻译结果数量不匹配: 期望 {expected}, 实际 {len(translations)}")
+    
+    return translations
+
+# 流式翻译结果中的一行："编号. 译文"
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\.\s*(.*\S)\s*$")
+
+# 批量总结结果中每篇总结的开头标记，例如"=== 总结3 ==="
+SUMMARY_MARKER = re.compile(r"^\s*=+\s*总结\s*(\d+)\s*=+\s*$", re.MULTILINE)
+
+def parse_batch_summaries(response_text: str, expected: int) -> Dict[int, str]:
+    """
+    解析批量总结结果
+    
+    Args:
+        response_text: 模型返回的文本，每篇总结以"=== 总结N ==="开头
+        expected: 文章数量
+        
+    Returns:
+        Dict[int, str]: 文章下标（从0开始） → 总结，缺失、重复或为空的编号不包含在内
+    """
+    summaries = {}
+    duplicated = set()
+    markers = list(SUMMARY_MARKER.finditer(response_text))
+    for i, marker in enumerate(markers):
+        index = int(marker.group(1)) - 1
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(response_text)
+        summary = response_text[marker.end():end].strip()
+        if not 0 <= index < expected or not summary:
+            continue
+        if index in summaries:
+            # 同一编号出现两次，无法判断哪个对应原文
+            duplicated.add(index)
+        summaries[index] = summary
+    for index in duplicated:
+        del summaries[index]
+    return summaries
+
+def is_retryable(error: Exception) -> bool:
+    """判断LLM调用错误是否值得重试：超时、连接错误、429和5xx"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+# 与具体后端相关的错误，切换到其他后端可能成功
+BACKEND_ERRORS = (openai.AuthenticationError, openai.PermissionDeniedError, openai.NotFoundError)
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """读取429响应中的Retry-After（秒）"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class LatencyWindow:
+    """最近若干次调用的耗时，用于计算对冲请求的触发时间"""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int) -> Optional[float]:
+        """样本数不足时返回None"""
+        with self.lock:
+            if len(self.samples) < min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
 
 class TranslationService:
-    def __init__(self, api_key: str = config.DEEPSEEK_API_KEY):
-        """初始化翻译服务"""
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=config.DEEPSEEK_BASE_URL
-        )
+    def __init__(self, api_key: str = config.DEEPSEEK_API_KEY,
+                 base_url: str = config.DEEPSEEK_BASE_URL,
+                 backends: Optional[List[Backend]] = None):
+        """
+        初始化翻译服务
+        
+        Args:
+            api_key: 未配置LLM_BACKENDS时使用的API密钥
+            base_url: 未配置LLM_BACKENDS时使用的API地址
+            backends: 直接指定的后端列表，默认根据配置创建
+        """
+        self.router = BackendRouter(backends or load_backends(api_key, base_url))
+        self.latency: Dict[str, LatencyWindow] = {}
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _complete(self, task: str, **kwargs):
+        """
+        调用chat.completions.create，带截止时间、指数退避重试、后端故障切换和可选的对冲请求
+        
+        Args:
+            task: 任务类型（translate、summarize等），决定使用的后端和模型、截止时间，并用于统计
+            **kwargs: 传给chat.completions.create的参数（不含model）
+            
+        Raises:
+            TimeoutError: 超过截止时间
+            Exception: 不可重试的错误，或重试次数用完后的最后一个错误
+        """
+        return self._complete_with_model(task, **kwargs)[0]
+
+    def _complete_with_model(self, task: str, **kwargs) -> Tuple[object, str]:
+        """
+        与_complete相同，同时返回实际处理请求的模型（故障切换和对冲后可能不是首选后端的模型）
+        
+        Returns:
+            Tuple[object, str]: (chat.completions.create的返回值, 模型名)
+            
+        Raises:
+            TimeoutError: 超过截止时间
+            Exception: 不可重试的错误，或重试次数用完后的最后一个错误
+        """
+        deadline = time.monotonic() + config.LLM_DEADLINES.get(task, max(config.LLM_DEADLINES.values()))
+        attempt = 0
+        failed = set()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                metrics.inc("rss_llm_deadline_exceeded_total", task=task)
+                raise TimeoutError(f"{task}调用超过截止时间")
+            backend = self.router.pick(task, exclude=failed)
+            try:
+                return self._attempt(task, backend, remaining, kwargs)
+            except Exception as e:
+                attempt += 1
+                # 后端故障（认证失败、模型不存在等）在其他后端上可能成功
+                switchable = isinstance(e, BACKEND_ERRORS) or is_retryable(e)
+                if switchable:
+                    failed.add(backend.name)
+                failover = switchable and self.router.has_alternative(task, failed)
+                if not (is_retryable(e) or failover) or attempt > config.LLM_MAX_RETRIES:
+                    raise
+                if failover:
+                    # 还有其他后端可用，立即切换
+                    delay = 0.0
+                    metrics.inc("rss_llm_failovers_total", task=task, backend=backend.name)
+                else:
+                    delay = min(config.LLM_RETRY_MAX_DELAY, config.LLM_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    delay = max(delay * random.uniform(0.5, 1.0), _retry_after(e) or 0)
+                    # 所有后端都失败过，下一轮重新在全部后端中选择
+                    failed.clear()
+                if delay >= deadline - time.monotonic():
+                    metrics.inc("rss_llm_deadline_exceeded_total", task=task)
+                    raise
+                metrics.inc("rss_llm_retries_total", task=task,
+                            reason=getattr(e, "status_code", None) or type(e).__name__)
+                time.sleep(delay)
+
+    def _attempt(self, task: str, backend: Backend, timeout: float, kwargs: dict):
+        """发出一次请求并返回 (结果, 模型名)；启用对冲时，请求耗时超过历史百分位后再发一个，取先完成的结果"""
+        window = self._latency_window(task)
+        hedge_after = None
+        # 流式请求返回后才开始读取内容，落选的流无法及时关闭，不做对冲
+        if config.LLM_HEDGE and not kwargs.get("stream"):
+            hedge_after = window.percentile(config.LLM_HEDGE_PERCENTILE, config.LLM_HEDGE_MIN_SAMPLES)
+        if hedge_after is None or hedge_after >= timeout:
+            return self._timed_create(task, backend, window, timeout, kwargs)
+
+        pool = self._get_hedge_pool()
+        started = time.monotonic()
+        primary = pool.submit(self._timed_create, task, backend, window, timeout, kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # 对冲请求优先发给另一个后端
+        metrics.inc("rss_llm_hedges_total", task=task, result="sent")
+        hedge_backend = self.router.pick(task, exclude={backend.name})
+        hedge = pool.submit(self._timed_create, task, hedge_backend, window, timeout - hedge_after, kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0, timeout - (time.monotonic() - started)),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                metrics.inc("rss_llm_deadline_exceeded_total", task=task)
+                raise TimeoutError(f"{task}调用超过截止时间")
+            for future in done:
+                if future.exception() is None:
+                    # 另一个请求的结果不再需要；已发出的HTTP请求无法中断，会在超时后结束
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        metrics.inc("rss_llm_hedges_total", task=task, result="won")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _timed_create(self, task: str, backend: Backend, window: LatencyWindow,
+                      timeout: float, kwargs: dict) -> Tuple[object, str]:
+        """向指定后端发出单个请求，记录耗时、后端统计和token用量，返回 (结果, 模型名)"""
+        model = backend.model_for(task)
+        started = time.monotonic()
+        try:
+            completion = backend.client.chat.completions.create(model=model, timeout=timeout, **kwargs)
+        except Exception:
+            backend.record(task, False, time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+        backend.record(task, True, elapsed)
+        window.add(elapsed)
+        if not kwargs.get("stream"):
+            # 流式请求的用量在读取完流之后记录
+            metrics.record_usage(task, model, completion.usage)
+        return completion, model
+
+    def _latency_window(self, task: str) -> LatencyWindow:
+        with self._lock:
+            if task not in self.latency:
+                self.latency[task] = LatencyWindow()
+            return self.latency[task]
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-hedge")
+            return self._hedge_pool
 
     def translate_batch(self, texts: List[str]) -> List[str]:
         """
@@ -21,49 +270,162 @@ class TranslationService:
         Returns:
             List[str]: 翻译后的文本列表
         """
+        try:
+            # 使用OpenAI SDK发送请求
+            completion = self._complete(
+                "translate",
+                messages=self._translate_messages(texts),
+                temperature=config.DEFAULT_TEMPERATURE,
+                top_p=config.DEFAULT_TOP_P,
+                presence_penalty=config.PRESENCE_PENALTY,
+                max_tokens=1024
+            )
+            
+            # 解析返回的翻译结果
+            response_text = completion.choices[0].message.content.strip()
+            return parse_numbered_response(response_text, len(texts))
+            
+        except Exception as e:
+            raise Exception(f"翻译处理失败: {str(e)}")
+
+    def translate_batch_stream(self, texts: List[str]) -> Iterator[Tuple[int, str]]:
+        """
+        流式批量翻译：边生成边解析编号行，每一行完成后立即返回该条译文
+        
+        译文必须按编号逐行给出；遇到编号跳跃、重复或超出范围的行、无法解析的行，
+        或一行中混入了下一条的编号时，停止读取流，尚未返回的条目（包括流提前结束时
+        剩余的条目）最后用translate_batch补齐。
+        
+        Args:
+            texts: 要翻译的文本列表
+            
+        Yields:
+            Tuple[int, str]: (文本下标, 译文)，按生成顺序
+        """
+        emitted = set()
+        try:
+            stream = self._complete(
+                "translate_stream",
+                messages=self._translate_messages(texts),
+                temperature=config.DEFAULT_TEMPERATURE,
+                top_p=config.DEFAULT_TOP_P,
+                presence_penalty=config.PRESENCE_PENALTY,
+                max_tokens=1024,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            deadline = time.monotonic() + config.LLM_DEADLINES["translate_stream"]
+            buffer = ""
+            model = usage = None
+            try:
+                for chunk in stream:
+                    model = chunk.model or model
+                    usage = chunk.usage or usage
+                    if chunk.choices:
+                        buffer += chunk.choices[0].delta.content or ""
+                    while "\n" in buffer:
+                        line, buffer = buffer.split("\n", 1)
+                        item = self._parse_stream_line(line, len(texts), emitted)
+                        if item:
+                            yield item
+                    if time.monotonic() > deadline:
+                        metrics.inc("rss_llm_deadline_exceeded_total", task="translate_stream")
+                        raise TimeoutError("translate_stream调用超过截止时间")
+            finally:
+                stream.close()
+                if model:
+                    metrics.record_usage("translate_stream", model, usage)
+            item = self._parse_stream_line(buffer, len(texts), emitted)
+            if item:
+                yield item
+        except Exception as e:
+            print(f"流式翻译中断: {str(e)}")
+        
+        missing = [i for i in range(len(texts)) if i not in emitted]
+        if missing:
+            metrics.inc("rss_translate_stream_fallback_total", len(missing))
+            translations = self.translate_batch([texts[i] for i in missing])
+            for i, translation in zip(missing, translations):
+                yield i, translation
+
+    def _parse_stream_line(self, line: str, expected: int, emitted: set) -> Optional[Tuple[int, str]]:
+        """
+        解析流中完整的一行，返回下一条 (下标, 译文)
+        
+        空行和第一条译文之前的说明文字忽略；其他与编号顺序不一致的行抛出ValueError，
+        因为之后的译文已无法可靠地对应到原标题。
+        """
+        if not line.strip():
+            return None
+        match = NUMBERED_LINE.match(line)
+        if not match:
+            if emitted:
+                raise ValueError(f"无法解析的译文行: {line.strip()[:50]}")
+            return None
+        index = int(match.group(1)) - 1
+        if index != len(emitted) or index >= expected:
+            raise ValueError(f"译文编号不一致: 期望{len(emitted) + 1}，实际{index + 1}")
+        translation = match.group(2)
+        if index + 1 < expected and re.search(rf"(^|\s){index + 2}\.\s", translation):
+            raise ValueError(f"第{index + 1}条译文混入了下一条")
+        emitted.add(index)
+        return index, translation
+
+    def _translate_messages(self, texts: List[str]) -> List[dict]:
+        """标题批量翻译的提示词"""
         # 将所有标题组合成一个文本，用编号标记
         combined_text = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
+        return [
+            {
+                "role": "system",
+                "content": "You are a professional translator. Translate English news titles to Chinese. Keep translations concise and accurate."
+            },
+            {
+                "role": "user",
+                "content": f"""Please translate these English titles to Chinese. Keep the numbering format and only return the translations:
+
+{combined_text}"""
+            }
+        ]
+
+    def paragraph_models(self) -> List[str]:
+        """可能处理段落翻译的所有模型，按名称排序"""
+        return sorted({backend.model_for("translate_paragraph")
+                       for backend in self.router.candidates("translate_paragraph")})
+
+    def translate_paragraph(self, text: str) -> Tuple[str, str]:
+        """
+        翻译文章中的一个段落
         
+        Args:
+            text: 英文段落
+            
+        Returns:
+            Tuple[str, str]: (中文译文, 实际使用的模型)
+        """
         try:
-            # 使用OpenAI SDK发送请求
-            completion = self.client.chat.completions.create(
-                model=config.MODEL_NAME,
+            completion, model = self._complete_with_model(
+                "translate_paragraph",
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a professional translator. Translate English news titles to Chinese. Keep translations concise and accurate."
+                        "content": "You are a professional translator. Translate the given English news paragraph to Chinese. Only return the translation."
                     },
                     {
                         "role": "user",
-                        "content": f"""Please translate these English titles to Chinese. Keep the numbering format and only return the translations:
-
-{combined_text}"""
+                        "content": text
                     }
                 ],
                 temperature=config.DEFAULT_TEMPERATURE,
                 top_p=config.DEFAULT_TOP_P,
                 presence_penalty=config.PRESENCE_PENALTY,
-                max_tokens=1024
+                max_tokens=2048
             )
             
-            # 解析返回的翻译结果
-            response_text = completion.choices[0].message.content.strip()
-            
-            # 处理翻译结果，提取每个标题的翻译
-            translations = []
-            for line in response_text.split('\n'):
-                line = line.strip()
-                if line:
-                    # 移除编号和点号，只保留翻译内容
-                    parts = line.split('.', 1)
-                    if len(parts) > 1:
-                        translations.append(parts[1].strip())
-            
-            # 验证翻译结果数量
-            if len(translations) != len(texts):
-                raise Exception(f"翻译结果数量不匹配: 期望 {len(texts)}, 实际 {len(translations)}")
-            
-            return translations
+            translation = completion.choices[0].message.content.strip()
+            if not translation:
+                raise Exception("翻译结果为空")
+            return translation, model
             
         except Exception as e:
             raise Exception(f"翻译处理失败: {str(e)}")
@@ -84,8 +446,8 @@ class TranslationService:
             content = content[:config.MAX_INPUT_LENGTH]
             
         try:
-            completion = self.client.chat.completions.create(
-                model=config.MODEL_NAME,
+            completion = self._complete(
+                "summarize",
                 messages=[
                     {
                         "role": "system",
@@ -115,4 +477,71 @@ class TranslationService:
             return completion.choices[0].message.content.strip()
             
         except Exception as e:
-            raise Exception(f"总结处理失败: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"总结处理失败: {str(e)}") 
+
+    def summarize_batch(self, articles: List[Tuple[str, str]]) -> List[Union[str, Exception]]:
+        """
+        在一次请求中总结多篇短文章，省去每篇单独请求的开销和重复的系统提示
+        
+        结果按编号逐篇解析，缺失或无法对应的文章（以及整个批量请求失败时的全部文章）
+        改为单独调用summarize_article；单篇失败不影响其他文章的结果。
+        
+        Args:
+            articles: (标题, 内容) 列表
+            
+        Returns:
+            List[Union[str, Exception]]: 与articles顺序一致的总结，失败的文章为对应的异常
+        """
+        if len(articles) <= 1:
+            return [self._summarize_or_error(title, content) for title, content in articles]
+
+        sections = []
+        for i, (title, content) in enumerate(articles, 1):
+            sections.append(f"=== 文章{i} ===\n标题：{title}\n内容：{content[:config.MAX_INPUT_LENGTH]}")
+
+        summaries: Dict[int, str] = {}
+        try:
+            completion = self._complete(
+                "summarize_batch",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "你是一个专业的新闻文章总结专家。请用中文分别总结每篇文章的要点，突出文章的关键信息、背景和影响。"
+                    },
+                    {
+                        "role": "user",
+                        "content": f"""请分别总结以下{len(articles)}篇文章，每篇单独总结，不要合并：
+
+{chr(10).join(sections)}
+
+要求：
+1. 按文章顺序输出，每篇总结单独一行"=== 总结N ==="开头，N为文章编号，之后是总结正文
+2. 每篇总结字数在200-400字之间
+3. 包含主要事件、关键人物和重要数据
+4. 使用客观准确的语言"""
+                    }
+                ],
+                temperature=config.DEFAULT_TEMPERATURE,
+                top_p=config.DEFAULT_TOP_P,
+                presence_penalty=config.PRESENCE_PENALTY,
+                max_tokens=min(config.MAX_TOKENS, 800 * len(articles))
+            )
+            summaries = parse_batch_summaries(completion.choices[0].message.content, len(articles))
+        except Exception as e:
+            print(f"批量总结失败，改为逐篇总结: {str(e)}")
+
+        missing = [i for i in range(len(articles)) if i not in summaries]
+        metrics.inc("rss_summary_batch_items_total", len(articles) - len(missing), result="batched")
+        if missing:
+            metrics.inc("rss_summary_batch_items_total", len(missing), result="fallback")
+        for i in missing:
+            summaries[i] = self._summarize_or_error(*articles[i])
+        return [summaries[i] for i in range(len(articles))]
+
+    def _summarize_or_error(self, title: str, content: str) -> Union[str, Exception]:
+        """单篇总结，失败时返回异常而不是抛出"""
+        try:
+            return self.summarize_article(title, content)
+        except Exception as e:
+            print(f"✗ 总结失败: {title} - {str(e)}")
+            return e
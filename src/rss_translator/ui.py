@@ -1,10 +1,12 @@
 """UI界面模块"""
 import customtkinter as ctk
-from typing import Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 import webbrowser
 from . import config
 from .translator import TranslationService
 from .rss_reader import RSSReader
+from .jobs import claim_summary_job, run_summary_job
+from .metrics import metrics, start_metrics_server
 import threading
 
 class RSSTranslatorUI:
@@ -43,17 +45,39 @@ class RSSTranslatorUI:
         # 绑定窗口关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         
+        # 启动指标接口
+        if config.METRICS_PORT:
+            start_metrics_server(config.METRICS_PORT)
+        
         # 初始化服务
         self.translator = TranslationService()
         self.reader = RSSReader(self.translator)
         self.reader.set_status_callback(self.update_sync_status)  # 设置状态回调
         self.reader.set_log_callback(self.append_status_log)      # 设置日志回调
+        if config.WRITE_BEHIND:
+            # 保存文章和总结不再等待数据库提交
+            self.reader.db.enable_write_behind()
+        
+        # 当前显示的文章 (URL, 原标题, 翻译标题) 及其总结是否已显示
+        self.current_article = None
+        self.summary_loaded = False
+        # 每次切换文章加一，进行中的全文翻译据此判断是否已过时
+        self.article_generation = 0
         
         # 创建UI组件
         self.setup_ui()
         
+        # 监听数据库变更：新文章和其他实例生成的总结实时显示
+        self.reader.start_live_updates(
+            lambda event: self.root.after(0, lambda: self._on_db_change(event))
+        )
+        
         # 加载RSS源
         self.load_rss_feed()
+        
+        # 懒加载模式：定期检查可见的文章，翻译其中尚未翻译的标题
+        if config.LAZY_TRANSLATE:
+            self.root.after(300, self._translate_visible_titles)
 
     def setup_ui(self):
         """设置UI布局"""
@@ -84,6 +108,9 @@ class RSSTranslatorUI:
             fg_color="transparent"  # 设置透明背景
         )
         self.article_list.pack(fill="both", expand=True, padx=5, pady=5)
+        # URL → [文章框架, 按钮, 当前显示的(序号, 原标题, 翻译标题)]，以及各行的显示顺序
+        self.article_rows: Dict[str, list] = {}
+        self.row_order: List[str] = []
         
         # 文章列表标题使用更优雅的字体
         self.list_label = ctk.CTkLabel(
@@ -145,11 +172,22 @@ class RSSTranslatorUI:
         )
         self.summary_open_btn.pack(pady=5)
         
+        self.detail_button_frame = ctk.CTkFrame(self.tabview.tab("文章详情"), fg_color="transparent")
+        self.detail_button_frame.pack(pady=5)
+        
         self.detail_open_btn = ctk.CTkButton(
-            self.tabview.tab("文章详情"),
+            self.detail_button_frame,
             text="在浏览器中打开"
         )
-        self.detail_open_btn.pack(pady=5)
+        self.detail_open_btn.pack(side="left", padx=5)
+        
+        # 逐段翻译全文，显示中英对照
+        self.translate_btn = ctk.CTkButton(
+            self.detail_button_frame,
+            text="翻译全文",
+            state="disabled"
+        )
+        self.translate_btn.pack(side="left", padx=5)
         
         # 右下角状态日志区域
         self.log_frame = ctk.CTkFrame(self.content_frame)
@@ -205,40 +243,12 @@ class RSSTranslatorUI:
     def load_rss_feed(self):
         """加载RSS源内容"""
         try:
-            # 清空文章列表
-            for widget in self.article_list.winfo_children():
-                widget.destroy()
-            
             # 更新状态为同步中
             self.update_sync_status("↻ 同步中...")
             
-            # 获取RSS内容
+            # 获取RSS内容，后台更新的新文章通过数据库通知加入列表
             self.reader.fetch_feed()
-            
-            # 显示文章列表
-            for i, (title, translated_title, url) in enumerate(self.reader.articles, 1):
-                # 创建文章框架
-                article_frame = ctk.CTkFrame(
-                    self.article_list,
-                    fg_color=("gray85", "gray20"),  # 浅灰/深灰色
-                    corner_radius=6  # 圆角程度
-                )
-                article_frame.pack(fill="x", padx=5, pady=2)
-                
-                # 创建文章按钮，使用更优雅的样式
-                btn = ctk.CTkButton(
-                    article_frame,
-                    text=f"{i}. {translated_title}",
-                    command=lambda u=url, t=title, tt=translated_title: self.show_article(u, t, tt),
-                    anchor="w",
-                    height=30,
-                    fg_color="transparent",  # 透明背景
-                    text_color=("gray10", "gray90"),  # 深色/浅色文字
-                    hover_color=("gray75", "gray30"),  # 悬停颜色
-                    font=("Microsoft YaHei UI", 18),  # 使用微软雅黑，大小12
-                    corner_radius=6
-                )
-                btn.pack(fill="x", padx=2, pady=2)
+            self.render_article_list()
             
             # 更新状态为已同步
             self.update_sync_status("✓ 已同步")
@@ -247,8 +257,153 @@ class RSSTranslatorUI:
             self.update_sync_status("✗ 同步失败", True)
             self.show_error(f"加载RSS源失败: {str(e)}")
 
+    def render_article_list(self):
+        """
+        根据reader.articles更新文章列表
+        
+        已有的行原位更新文字，只为新文章创建行、删除不再显示的行，
+        避免每次变更通知都销毁并重建全部控件。
+        """
+        articles = self.reader.articles
+        urls = [url for _, _, url in articles]
+        keep = set(urls)
+        for url in [url for url in self.article_rows if url not in keep]:
+            self.article_rows.pop(url)[0].destroy()
+        
+        # 保留的行相对顺序不变时（通常只是插入新文章）只需放置新行
+        reordered = ([url for url in self.row_order if url in keep]
+                     != [url for url in urls if url in self.article_rows])
+        previous = None
+        for i, (title, translated_title, url) in enumerate(articles, 1):
+            row = self.article_rows.get(url)
+            if row is None:
+                row = self.article_rows[url] = self._create_article_row()
+                self._place_article_row(row[0], previous)
+            elif reordered:
+                row[0].pack_forget()
+                self._place_article_row(row[0], previous)
+            self._update_article_row(row, i, title, translated_title, url)
+            previous = row[0]
+        self.row_order = urls
+
+    def update_article_rows(self, urls: List[str]):
+        """只更新指定文章所在行的文字，列表顺序不变"""
+        urls = set(urls)
+        for i, (title, translated_title, url) in enumerate(self.reader.articles, 1):
+            row = self.article_rows.get(url)
+            if url in urls and row is not None:
+                self._update_article_row(row, i, title, translated_title, url)
+
+    def _create_article_row(self) -> list:
+        """创建一行文章控件（尚未放置）"""
+        # 创建文章框架
+        article_frame = ctk.CTkFrame(
+            self.article_list,
+            fg_color=("gray85", "gray20"),  # 浅灰/深灰色
+            corner_radius=6  # 圆角程度
+        )
+        
+        # 创建文章按钮，使用更优雅的样式
+        btn = ctk.CTkButton(
+            article_frame,
+            text="",
+            anchor="w",
+            height=30,
+            fg_color="transparent",  # 透明背景
+            text_color=("gray10", "gray90"),  # 深色/浅色文字
+            hover_color=("gray75", "gray30"),  # 悬停颜色
+            font=("Microsoft YaHei UI", 18),  # 使用微软雅黑，大小12
+            corner_radius=6
+        )
+        btn.pack(fill="x", padx=2, pady=2)
+        return [article_frame, btn, None]
+
+    def _place_article_row(self, frame, previous):
+        """把行放在previous之后，previous为None时放在列表最前面"""
+        if previous is not None:
+            frame.pack(fill="x", padx=5, pady=2, after=previous)
+            return
+        slaves = self.article_list.pack_slaves()
+        if slaves:
+            frame.pack(fill="x", padx=5, pady=2, before=slaves[0])
+        else:
+            frame.pack(fill="x", padx=5, pady=2)
+
+    def _update_article_row(self, row: list, index: int, title: str,
+                            translated_title: Optional[str], url: str):
+        """内容有变化时更新一行的文字和点击命令"""
+        # 尚未翻译的标题（懒加载模式）先显示原标题
+        translated_title = translated_title or title
+        state = (index, title, translated_title)
+        if row[2] == state:
+            return
+        row[1].configure(
+            text=f"{index}. {translated_title}",
+            command=lambda u=url, t=title, tt=translated_title: self.show_article(u, t, tt)
+        )
+        row[2] = state
+
+    def _visible_rows(self) -> Tuple[int, int]:
+        """文章列表当前可见的行范围 [first, last)"""
+        count = len(self.reader.articles)
+        canvas = getattr(self.article_list, "_parent_canvas", None)
+        try:
+            top, bottom = canvas.yview() if canvas is not None else (0.0, 1.0)
+        except Exception:
+            top, bottom = 0.0, 1.0
+        return int(top * count), min(count, int(bottom * count) + 1)
+
+    def _translate_visible_titles(self):
+        """翻译可见区域及其下方预取范围内尚未翻译的标题"""
+        try:
+            first, last = self._visible_rows()
+            rows = self.reader.articles[first:last + config.LAZY_TRANSLATE_PREFETCH]
+            urls = [url for _, translated_title, url in rows if not translated_title]
+            if urls:
+                self.reader.translate_titles(urls)
+        except Exception as e:
+            print(f"翻译可见标题时出错: {str(e)}")
+        finally:
+            self.root.after(300, self._translate_visible_titles)
+
+    def _on_db_change(self, event: dict):
+        """在主线程中处理数据库变更事件"""
+        kind = event.get("type")
+        if kind == "articles" and not event.get("added"):
+            # 已有文章的译文等更新，只改这些行的文字
+            self.update_article_rows(event.get("urls", []))
+        elif kind in ("articles", "reconnect"):
+            self.render_article_list()
+        elif kind == "summary" and self.current_article and not self.summary_loaded:
+            # 其他实例为当前文章生成了总结
+            if event.get("url") == self.current_article[0]:
+                thread = threading.Thread(target=self._load_remote_summary_thread, args=self.current_article)
+                thread.daemon = True
+                thread.start()
+
+    def _load_remote_summary_thread(self, url: str, title: str, translated_title: str):
+        """在线程中读取其他实例生成的总结"""
+        try:
+            summary = self.reader.db.get_article_summary(url)
+        except Exception as e:
+            self.append_status_log(f"✗ 读取总结失败: {str(e)}")
+            return
+        if summary:
+            self.append_status_log("✓ 收到其他实例生成的总结")
+            self.root.after(0, lambda: self._show_summary_if_current(url, summary, title, translated_title))
+
+    def _show_summary_if_current(self, url: str, summary: str, title: str, translated_title: str):
+        """总结对应的文章仍是当前文章时才显示"""
+        if self.current_article and self.current_article[0] == url and not self.summary_loaded:
+            self._update_summary_ui(summary, title, translated_title)
+
     def show_article(self, url: str, title: str, translated_title: str):
         """显示文章内容"""
+        self.current_article = (url, title, translated_title)
+        self.summary_loaded = False
+        # 切换文章后，之前文章的全文翻译不再需要
+        self.article_generation += 1
+        
         # 清空详情和总结
         self.detail_text.delete("1.0", "end")
         self.summary_text.delete("1.0", "end")
@@ -275,6 +430,11 @@ class RSSTranslatorUI:
             command=lambda: webbrowser.open(url),
             state="normal"
         )
+        self.translate_btn.configure(
+            command=lambda: self.translate_full_article(url),
+            state="normal",
+            text="翻译全文"
+        )
         self.summary_open_btn.configure(
             command=lambda: webbrowser.open(url),
             state="disabled",
@@ -282,19 +442,22 @@ class RSSTranslatorUI:
         )
         
         # 使用线程处理API调用
-        thread = threading.Thread(target=self._load_article_summary_thread, args=(url, title, translated_title))
+        thread = threading.Thread(target=self._load_article_summary_thread,
+                                  args=(url, title, translated_title, self.article_generation))
         thread.daemon = True
         thread.start()
     
-    def _load_article_summary_thread(self, url: str, title: str, translated_title: str):
-        """在线程中处理API调用"""
+    def _load_article_summary_thread(self, url: str, title: str, translated_title: str, generation: int):
+        """在线程中处理API调用，generation为打开文章时的article_generation，切换文章后停止等待总结"""
         try:
             self.append_status_log("\n=== 开始获取文章总结 ===")
             self.append_status_log(f"文章标题: {title}")
             
             # 先检查数据库中是否已有总结
             self.append_status_log("检查数据库中是否存在总结...")
-            summary = self.reader.db.get_article_summary(url)
+            with metrics.time("summary_lookup"):
+                summary = self.reader.db.get_article_summary(url)
+            metrics.cache("summary", bool(summary))
             
             if summary:
                 # 如果已有总结，直接使用
@@ -304,29 +467,32 @@ class RSSTranslatorUI:
                 self.append_status_log("=== 总结加载完成 ===")
                 return
 
-            # 如果没有总结，生成新的总结
+            # 如果没有总结，通过任务队列认领生成任务，避免多个实例重复生成；
+            # 其他实例持有任务时等待，它失败或崩溃后由本实例认领
+            job, summary = claim_summary_job(
+                self.reader, url, title,
+                cancelled=lambda: self.summary_loaded or self.article_generation != generation,
+                log=self.append_status_log
+            )
+            if job is None:
+                if summary:
+                    self.append_status_log("✓ 收到其他实例生成的总结")
+                    self.root.after(0, lambda: self._show_summary_if_current(url, summary, title, translated_title))
+                self.append_status_log("=== 等待总结结束 ===")
+                return
+            
             self.append_status_log("未找到已有总结，开始生成...")
-            self.append_status_log("正在获取文章内容...")
+            try:
+                summary = run_summary_job(self.reader, url, title, log=self.append_status_log)
+            except Exception as e:
+                # 失败的任务按退避策略重新排队，可由后台服务重试
+                self.reader.db.fail_job(job.id, str(e))
+                raise
+            self.reader.db.complete_job(job.id)
             
-            content = self.reader.get_article_content(url)
-            if content:
-                self.append_status_log("✓ 文章内容获取成功")
-                self.append_status_log("正在生成文章总结...")
-                
-                summary = self.translator.summarize_article(title, content)
-                self.append_status_log("✓ 总结生成成功")
-                
-                # 保存总结到数据库
-                self.append_status_log("正在保存总结到数据库...")
-                self.reader.db.update_article_summary(url, summary)
-                
-                # 更新UI
-                self.root.after(0, lambda: self._update_summary_ui(summary, title, translated_title))
-                self.append_status_log("=== 总结完成 ===")
-            else:
-                self.append_status_log("✗ 无法获取文章内容")
-                self.root.after(0, lambda: self.show_error("无法获取文章内容"))
-                self.append_status_log("=== 总结失败 ===")
+            # 更新UI
+            self.root.after(0, lambda: self._update_summary_ui(summary, title, translated_title))
+            self.append_status_log("=== 总结完成 ===")
         except Exception as e:
             self.append_status_log(f"✗ 生成总结失败: {str(e)}")
             self.root.after(0, lambda: self.show_error(f"生成总结失败: {str(e)}"))
@@ -335,8 +501,59 @@ class RSSTranslatorUI:
             # 在主线程中恢复按钮状态
             self.root.after(0, self._restore_buttons)
     
+    def translate_full_article(self, url: str):
+        """在文章详情中逐段显示全文的中英对照翻译"""
+        self.translate_btn.configure(state="disabled", text="正在翻译...")
+        self.tabview.set("文章详情")
+        self.detail_text.insert("end", "\n正在获取全文...\n")
+        
+        thread = threading.Thread(target=self._translate_article_thread, args=(url, self.article_generation))
+        thread.daemon = True
+        thread.start()
+
+    def _translate_article_thread(self, url: str, generation: int):
+        """在线程中翻译全文，每段完成后立即显示；用户切换文章后停止"""
+        self.append_status_log("\n=== 开始翻译全文 ===")
+        cancelled = lambda: self.article_generation != generation
+        try:
+            count = self.reader.translate_article(
+                url,
+                lambda index, original, translation: self.root.after(
+                    0, lambda: self._append_paragraph(url, index, original, translation)
+                ),
+                cancelled
+            )
+            if cancelled():
+                self.append_status_log(f"已切换文章，全文翻译在第{count}段后停止")
+            else:
+                self.append_status_log(f"✓ 全文翻译完成，共{count}段")
+        except Exception as e:
+            self.append_status_log(f"✗ 全文翻译失败: {str(e)}")
+            self.root.after(0, lambda: self.show_error(f"全文翻译失败: {str(e)}"))
+        finally:
+            self.root.after(0, lambda: self._restore_translate_button(url))
+
+    def _append_paragraph(self, url: str, index: int, original: str, translation: Optional[str]):
+        """在主线程中追加一段对照翻译；用户已切换文章时忽略"""
+        if not self.current_article or self.current_article[0] != url:
+            return
+        if index == 0:
+            self.detail_text.delete("1.0", "end")
+            _, title, translated_title = self.current_article
+            self.detail_text.insert("end", f"标题：{translated_title}\n")
+            self.detail_text.insert("end", f"原标题：{title}\n")
+            self.detail_text.insert("end", f"链接：{url}\n\n")
+        self.detail_text.insert("end", f"{original}\n")
+        self.detail_text.insert("end", f"{translation or '[翻译失败]'}\n\n")
+
+    def _restore_translate_button(self, url: str):
+        """全文翻译结束后恢复按钮"""
+        if self.current_article and self.current_article[0] == url:
+            self.translate_btn.configure(state="normal", text="翻译全文")
+
     def _update_summary_ui(self, summary: str, title: str, translated_title: str):
         """在主线程中更新UI"""
+        self.summary_loaded = True
         self.summary_text.delete("1.0", "end")
         
         # 使用更大的标题字体
@@ -455,6 +672,9 @@ class RSSTranslatorUI:
         except Exception as e:
             print(f"保存窗口状态时出错: {str(e)}")
         finally:
+            self.reader.stop_live_updates()
+            # 提交延迟写入队列中剩余的写入
+            self.reader.db.close()
             # 销毁窗口
             self.root.destroy()
 
@@ -0,0 +1,179 @@
+"""测试公共配置：内存数据库替身和阅读器工厂"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# config模块导入时要求设置API密钥；单元测试不访问真实API，
+# 只在导入期间提供占位密钥，避免影响需要真实密钥的test_api.py
+if not os.getenv("DEEPSEEK_API_KEY"):
+    os.environ["DEEPSEEK_API_KEY"] = "test-key"
+    from src.rss_translator import config  # noqa: F401
+    del os.environ["DEEPSEEK_API_KEY"]
+
+from src.rss_translator import config  # noqa: E402
+from src.rss_translator.backends import Backend  # noqa: E402
+from src.rss_translator.database.models import Job  # noqa: E402
+from src.rss_translator.rss_reader import RSSReader  # noqa: E402
+from src.rss_translator.translator import TranslationService  # noqa: E402
+
+
+class FakeDB:
+    """
+    内存中的DatabaseManager替身，实现阅读器和后台任务用到的读写方法
+
+    Args:
+        articles: 已保存的文章
+        feed_state: RSS源 → 已保存条目的指纹
+        recent: get_recent_title_hashes的返回值
+        paragraphs: 段落哈希 → 译文
+        feed_content: 文章URL → RSS源提供的正文
+    """
+
+    def __init__(self, articles=(), feed_state=None, recent=(), paragraphs=None, feed_content=None):
+        self.articles = list(articles)
+        self.feed_state = {source: set(fingerprints) for source, fingerprints in (feed_state or {}).items()}
+        self.recent = list(recent)
+        self.paragraphs = dict(paragraphs or {})
+        self.feed_content = dict(feed_content or {})
+        self.summaries = {}
+        self.fail = False          # 为True时写入方法抛出异常，模拟数据库不可用
+        self.saved = []            # 每次写入数据库的文章
+        self.lookups = []          # 每次find_articles_by_urls查询的URL
+        self.queried = []          # 每次get_articles_by_ids查询的ID
+        self.invalidated_ids = []  # 每次invalidate_ids的 (ID, 源)
+        self.translated = []       # update_translated_titles写入的 (URL, 原标题, 译文)
+        self.jobs = {}             # (任务类型, 任务对象) → Job
+
+    # 文章
+
+    def save_articles(self, articles, on_saved=None):
+        self.write_articles(articles)
+        if on_saved is not None:
+            on_saved(articles)
+
+    def write_articles(self, articles):
+        if self.fail:
+            raise Exception("database is down")
+        self.saved.append(list(articles))
+        by_url = {article.url: article for article in articles}
+        self.articles = [by_url.pop(article.url, article) for article in self.articles] + list(by_url.values())
+
+    def article(self, url):
+        return next(article for article in self.articles if article.url == url)
+
+    def find_articles_by_urls(self, urls, canonical_urls):
+        self.lookups.append(list(urls))
+        return [article for article in self.articles
+                if article.url in urls or article.canonical_url in canonical_urls]
+
+    def get_articles_by_ids(self, ids):
+        self.queried.append(list(ids))
+        by_id = {article.id: article for article in self.articles}
+        return [by_id[id] for id in ids if id in by_id]
+
+    def get_articles_by_source(self, source, limit=config.ARTICLE_LIST_LIMIT):
+        articles = [article for article in self.articles if article.source == source]
+        articles.sort(key=lambda article: article.created_at, reverse=True)
+        return articles[:limit]
+
+    def get_recent_title_hashes(self, limit):
+        return self.recent[:limit]
+
+    def update_translated_titles(self, translations):
+        self.translated.extend(translations)
+        return len(translations)
+
+    # RSS源状态
+
+    def get_feed_state(self, source):
+        return set(self.feed_state.get(source, ()))
+
+    def save_feed_state(self, source, fingerprints):
+        self.feed_state[source] = set(fingerprints)
+
+    # 总结、正文和段落译文
+
+    def get_article_summary(self, url, cached=True):
+        return self.summaries.get(url)
+
+    def write_article_summaries(self, summaries):
+        if self.fail:
+            raise Exception("database is down")
+        self.summaries.update(summaries)
+
+    def get_feed_content(self, url):
+        return self.feed_content.get(url)
+
+    def get_paragraph_translations(self, hashes):
+        return {digest: self.paragraphs[digest] for digest in hashes if digest in self.paragraphs}
+
+    def save_paragraph_translations(self, translations):
+        self.paragraphs.update(translations)
+
+    # 任务（与jobs表相同的状态转换，退避时间用retry_in表示，测试中置0模拟时间流逝）
+
+    def enqueue_job(self, kind, key, payload=None):
+        job = self.jobs.get((kind, key))
+        if job is None or job.status == "done":
+            self.jobs[(kind, key)] = Job(id=len(self.jobs) + 1, kind=kind, key=key,
+                                         payload=payload or {}, attempts=0, status="pending")
+
+    def claim_job(self, worker, kinds, key=None, lease=config.JOB_LEASE):
+        for (kind, job_key), job in self.jobs.items():
+            if (kind in kinds and key in (None, job_key)
+                    and job.status == "pending" and job.retry_in <= 0):
+                job.status = "running"
+                job.attempts += 1
+                return job
+        return None
+
+    def get_job(self, kind, key):
+        return self.jobs.get((kind, key))
+
+    def complete_job(self, job_id):
+        self._job(job_id).status = "done"
+
+    def fail_job(self, job_id, error, max_attempts=config.JOB_MAX_ATTEMPTS):
+        job = self._job(job_id)
+        job.status = "failed" if job.attempts >= max_attempts else "pending"
+        job.last_error = error
+        job.retry_in = config.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+
+    def _job(self, job_id):
+        return next(job for job in self.jobs.values() if job.id == job_id)
+
+    # 缓存
+
+    def invalidate(self, urls, sources):
+        pass
+
+    def invalidate_ids(self, ids, source):
+        self.invalidated_ids.append((list(ids), source))
+
+    def invalidate_summary(self, url):
+        pass
+
+    def clear_cache(self):
+        pass
+
+
+@pytest.fixture
+def make_reader():
+    """
+    通过RSSReader.__init__创建阅读器，数据库替换为FakeDB，翻译服务替换为给定的替身
+
+    返回的工厂接受 db、translator、source（当前显示的源）和 articles（当前列表中的文章）
+    """
+    def factory(db=None, translator=None, source=None, articles=()):
+        reader = RSSReader(translator or SimpleNamespace(), db=db if db is not None else FakeDB())
+        if source is not None:
+            reader.source = source
+            reader._set_articles(list(articles))
+        return reader
+    return factory
+
+
+def make_translation_service():
+    """通过TranslationService.__init__创建翻译服务，只有一个不发出请求的后端，由测试替换_complete"""
+    return TranslationService(backends=[Backend("test", None, model="test-model")])
@@ -0,0 +1,117 @@
+"""LLM后端路由测试：任务模型、评分选择、暂停期和故障切换"""
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from src.rss_translator import backends as backends_module
+from src.rss_translator import config
+from src.rss_translator.backends import Backend, BackendRouter
+from src.rss_translator.translator import TranslationService
+
+
+@pytest.fixture(autouse=True)
+def no_exploration(monkeypatch):
+    monkeypatch.setattr(config, "LLM_ROUTER_EXPLORE", 0.0)
+
+
+def test_model_for_uses_task_fallback_and_none_disables_task():
+    backend = Backend("a", None, model="base", models={"summarize": "small", "translate": None})
+    assert backend.model_for("summarize") == "small"
+    assert backend.model_for("summarize_batch") == "small"
+    assert backend.model_for("translate") is None
+    assert backend.model_for("translate_stream") is None
+    assert backend.model_for("translate_paragraph") == "base"
+
+    only_summaries = Backend("b", None, models={"summarize": "small"})
+    router = BackendRouter([backend, only_summaries])
+    assert [b.name for b in router.candidates("summarize_batch")] == ["a", "b"]
+    assert router.candidates("translate") == []
+    with pytest.raises(Exception):
+        router.pick("translate")
+
+
+def test_pick_prefers_untried_then_lowest_score():
+    fast, slow = Backend("fast", None, model="m"), Backend("slow", None, model="m")
+    router = BackendRouter([slow, fast])
+    slow.record("translate", True, 1.0)
+    # 从未调用过的后端评分为0，先被尝试
+    assert router.pick("translate") is fast
+    fast.record("translate", True, 0.5)
+    assert router.pick("translate") is fast
+    for _ in range(3):
+        fast.record("translate", False, 0.5)
+    # 错误率抬高评分后改选另一个后端
+    assert fast.score("translate") > slow.score("translate")
+    assert router.pick("translate") is slow
+
+
+def test_backend_with_only_failures_ranks_last():
+    failing, untried = Backend("failing", None, model="m"), Backend("untried", None, model="m")
+    failing.record("translate", False, 1.0)
+    assert failing.score("translate") == float("inf")
+    assert BackendRouter([failing, untried]).pick("translate") is untried
+
+
+def test_consecutive_failures_start_cooldown(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(backends_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(config, "LLM_BACKEND_FAILURES", 2)
+    monkeypatch.setattr(config, "LLM_BACKEND_COOLDOWN", 30.0)
+    primary, backup = Backend("primary", None, model="m"), Backend("backup", None, model="m")
+    router = BackendRouter([primary, backup])
+    primary.record("translate", True, 0.1)
+    backup.record("translate", True, 1.0)
+
+    primary.record("translate", False, 0.1)
+    assert primary.available(clock[0])
+    primary.record("translate", False, 0.1)
+    assert not primary.available(clock[0])
+    assert router.pick("translate") is backup
+
+    clock[0] += 30
+    assert primary.available(clock[0])
+    primary.record("translate", True, 0.1)
+    assert primary.failures == 0
+
+
+def test_exclude_and_has_alternative():
+    a, b = Backend("a", None, model="m"), Backend("b", None, model="m")
+    router = BackendRouter([a, b])
+    assert router.pick("translate", exclude={"a"}) is b
+    assert router.has_alternative("translate", {"a"})
+    assert not router.has_alternative("translate", {"a", "b"})
+    # 全部排除时仍返回一个后端
+    assert router.pick("translate", exclude={"a", "b"}) in (a, b)
+
+
+def test_router_requires_backends():
+    with pytest.raises(ValueError):
+        BackendRouter([])
+
+
+def fake_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_failover_returns_model_of_serving_backend(monkeypatch):
+    monkeypatch.setattr(config, "LLM_HEDGE", False)
+    calls = []
+
+    def broken(model, **kwargs):
+        calls.append(model)
+        # 只用于类型判断，不依赖具体httpx版本构造请求对象
+        raise openai.APIConnectionError.__new__(openai.APIConnectionError)
+
+    def working(model, **kwargs):
+        calls.append(model)
+        message = SimpleNamespace(content="译文")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    service = TranslationService(backends=[
+        Backend("broken", fake_client(broken), model="broken-model"),
+        Backend("working", fake_client(working), model="working-model"),
+    ])
+    assert service.translate_paragraph("Hello") == ("译文", "working-model")
+    assert calls == ["broken-model", "working-model"]
+    assert service.router.backends[0].failures == 1
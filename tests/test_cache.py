@@ -0,0 +1,47 @@
+"""LRU/TTL缓存测试"""
+from src.rss_translator.database import cache as cache_module
+from src.rss_translator.database.cache import MISSING, LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1       # a变为最近使用
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    cache = LRUCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+    clock[0] += 0.2
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_none_is_cached_and_distinct_from_missing():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("a", None)
+    assert cache.get("a") is None
+    assert cache.get("b") is MISSING
+
+
+def test_invalidation():
+    cache = LRUCache(maxsize=10, ttl=60)
+    for key, value in (("a", 1), ("b", None), (("src", 50), 3)):
+        cache.set(key, value)
+    cache.invalidate("a")
+    assert cache.get("a") is MISSING
+    cache.invalidate_where(lambda key, value: value is None)
+    assert cache.get("b") is MISSING
+    assert cache.get(("src", 50)) == 3
+    cache.clear()
+    assert len(cache) == 0
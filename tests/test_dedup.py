@@ -0,0 +1,67 @@
+"""去重模块测试"""
+from src.rss_translator import config
+from src.rss_translator.database.models import Article
+from src.rss_translator.dedup import (
+    canonicalize_url, find_near_duplicate, hamming_distance, normalize_title, simhash
+)
+from tests.conftest import FakeDB
+
+RISE = "Stocks rise as Fed holds interest rates steady"
+FALL = "Stocks fall as Fed holds interest rates steady"
+
+
+def test_canonicalize_url_removes_tracking_and_variants():
+    assert canonicalize_url(
+        "http://www.Example.com:80/news/story/?utm_source=rss&b=2&a=1#top"
+    ) == "https://example.com/news/story?a=1&b=2"
+    assert canonicalize_url("https://amp.example.com/news/story/amp") == "https://example.com/news/story"
+    assert canonicalize_url(
+        "https://example-com.cdn.ampproject.org/c/s/example.com/news/story.amp.html"
+    ) == "https://example.com/news/story.html"
+
+
+def test_canonicalize_url_keeps_distinct_articles_apart():
+    assert canonicalize_url("https://example.com/news?id=1") != canonicalize_url("https://example.com/news?id=2")
+    assert canonicalize_url("https://example.com:8080/a") == "https://example.com:8080/a"
+
+
+def test_simhash_is_stable_and_skips_short_titles():
+    assert simhash(RISE) == simhash(RISE.upper() + "!")
+    assert simhash("Live updates") is None
+    assert -(1 << 63) <= simhash(RISE) < (1 << 63)
+
+
+def test_near_duplicate_can_be_a_different_story():
+    # 只差一个词、含义相反的标题，指纹仍在默认阈值之内
+    rise, fall = simhash(RISE), simhash(FALL)
+    assert hamming_distance(rise, fall) <= config.TITLE_SIMHASH_DISTANCE
+    assert find_near_duplicate(fall, [(1, rise)], config.TITLE_SIMHASH_DISTANCE) == 1
+    assert normalize_title(RISE) != normalize_title(FALL)
+
+
+def test_find_near_duplicate_picks_closest():
+    base = simhash(RISE)
+    candidates = [(1, base ^ 0b111), (2, base ^ 0b1), (3, base ^ 0b11)]
+    assert find_near_duplicate(base, candidates, 6) == 2
+    assert find_near_duplicate(base, [(1, base ^ 0b1111111)], 6) is None
+    assert find_near_duplicate(None, candidates, 6) is None
+
+
+def make_article(title, url):
+    return Article(id=None, title=title, translated_title=None, url=url,
+                   source="feed", created_at=None)
+
+
+def test_build_articles_does_not_reuse_near_duplicate_translation(make_reader):
+    reader = make_reader(db=FakeDB(recent=[(1, simhash(RISE), RISE, "美联储维持利率不变，股市上涨")]))
+    article = make_article(FALL, "https://b.example.com/fall")
+    [result] = reader.build_articles("feed", [(article, canonicalize_url(article.url), None)])
+    assert result.duplicate_of == 1
+    assert result.translated_title is None
+
+
+def test_build_articles_reuses_exact_title_translation(make_reader):
+    reader = make_reader(db=FakeDB(recent=[(1, simhash(RISE), RISE, "美联储维持利率不变，股市上涨")]))
+    article = make_article(RISE.lower() + ".", "https://b.example.com/rise")
+    [result] = reader.build_articles("feed", [(article, canonicalize_url(article.url), None)])
+    assert result.translated_title == "美联储维持利率不变，股市上涨"
@@ -0,0 +1,88 @@
+"""RSS源解析测试：快速解析与feedparser回退"""
+from src.rss_translator.feed_parser import (
+    html_to_text, parse_feed, parse_feed_fallback, parse_feed_fast
+)
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>World News</title>
+    <item>
+      <title>First story</title>
+      <link>https://example.com/1</link>
+      <guid isPermaLink="false">id-1</guid>
+      <pubDate>Mon, 01 Jan 2024 08:00:00 GMT</pubDate>
+      <description>Short summary</description>
+      <content:encoded><![CDATA[<p>Full <b>text</b> of the story.</p><p>Second paragraph.</p>]]></content:encoded>
+    </item>
+    <item>
+      <title>Second story</title>
+      <guid>https://example.com/2</guid>
+    </item>
+    <item>
+      <title>No link</title>
+    </item>
+  </channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title type="html">&lt;b&gt;Atom&lt;/b&gt; Feed</title>
+  <entry>
+    <title>Atom story</title>
+    <link rel="alternate" type="text/html" href="https://example.com/a"/>
+    <id>urn:uuid:1</id>
+    <updated>2024-01-02T10:00:00Z</updated>
+    <summary>Atom summary</summary>
+  </entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/">
+  <channel rdf:about="https://example.com/"><title>RDF Feed</title></channel>
+  <item rdf:about="https://example.com/r"><title>RDF story</title><link>https://example.com/r</link></item>
+</rdf:RDF>"""
+
+
+def summary(feed):
+    return [(a.url, a.title, a.guid, a.published_at, a.feed_content) for a in feed.articles]
+
+
+def test_rss_fast_path_matches_feedparser():
+    fast = parse_feed(RSS, "feed")
+    assert fast.parser == "fast"
+    assert fast.title == "World News"
+    assert summary(fast) == summary(parse_feed_fallback(RSS, "feed"))
+    first, second = fast.articles
+    assert first.feed_content == "Full text of the story.\nSecond paragraph."
+    assert second.url == "https://example.com/2"
+    assert all(article.source == "feed" and article.fingerprint for article in fast.articles)
+
+
+def test_atom_fast_path_matches_feedparser():
+    fast = parse_feed_fast(ATOM, "feed")
+    assert fast.title == "Atom Feed"
+    assert summary(fast) == summary(parse_feed_fallback(ATOM, "feed"))
+    assert fast.articles[0].guid == "urn:uuid:1"
+
+
+def test_unsupported_and_malformed_feeds_fall_back():
+    rdf = parse_feed(RDF, "feed")
+    assert rdf.parser == "feedparser"
+    assert [article.url for article in rdf.articles] == ["https://example.com/r"]
+
+    broken = parse_feed(RSS.replace(b"</channel>", b""), "feed")
+    assert broken.parser == "feedparser"
+    assert len(broken.articles) == 2
+
+
+def test_fingerprint_changes_with_title():
+    changed = parse_feed(RSS.replace(b"First story", b"First story, updated"), "feed")
+    original = parse_feed(RSS, "feed")
+    assert changed.articles[0].fingerprint != original.articles[0].fingerprint
+    assert changed.articles[1].fingerprint == original.articles[1].fingerprint
+
+
+def test_html_to_text():
+    assert html_to_text("<script>x()</script><p>a &amp; b</p><br/>c") == "a & b\nc"
+    assert html_to_text(None) == ""
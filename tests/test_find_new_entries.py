@@ -0,0 +1,104 @@
+"""条目指纹分类测试：未变化、已存在、标题更新、新文章和跨源重复"""
+from datetime import datetime
+
+from src.rss_translator.database.models import Article
+from src.rss_translator.feed_parser import ParsedFeed, entry_fingerprint
+from tests.conftest import FakeDB
+
+SOURCE = "https://feed.example.com/rss"
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def entry(url, title, published=None):
+    return Article(id=None, title=title, translated_title=None, url=url, source=SOURCE,
+                   created_at=NOW, guid=url, published_at=published,
+                   fingerprint=entry_fingerprint(url, url, title, published))
+
+
+def stored(id, url, title, source=SOURCE):
+    return Article(id=id, title=title, translated_title="译文", url=url, source=source,
+                   created_at=datetime(2023, 12, 1), canonical_url=url, duplicate_of=None)
+
+
+def test_entries_are_classified_by_fingerprint(make_reader):
+    unchanged = entry("https://example.com/unchanged", "Same")
+    existing = entry("https://example.com/existing", "Existing")
+    retitled = entry("https://example.com/retitled", "New title")
+    new = entry("https://example.com/new?utm_source=rss", "Brand new")
+    variant = entry("https://www.example.com/new", "Brand new again")
+    elsewhere = entry("https://example.com/elsewhere?utm_source=feed", "Seen on another feed")
+    db = FakeDB(
+        feed_state={SOURCE: {unchanged.fingerprint}},
+        articles=[
+            stored(1, existing.url, "Existing"),
+            stored(2, retitled.url, "Old title"),
+            stored(3, "https://example.com/elsewhere", "Seen on another feed",
+                   source="https://other.example.com/rss"),
+        ],
+    )
+    reader = make_reader(db=db)
+    feed = ParsedFeed("Feed", [unchanged, existing, retitled, new, variant, elsewhere], "fast")
+
+    results = reader.find_new_entries(SOURCE, feed)
+
+    # 指纹未变的条目不查询数据库
+    assert unchanged.url not in db.lookups[0]
+    by_url = {article.url: (article, original) for article, _, original in results}
+    assert set(by_url) == {retitled.url, new.url, elsewhere.url}
+    assert by_url[retitled.url][0].id == 2
+    assert by_url[retitled.url][0].created_at == datetime(2023, 12, 1)
+    assert by_url[new.url][1] is None
+    assert by_url[elsewhere.url][1].id == 3
+    # 未变化和已存在的条目记入源状态，之后的刷新直接跳过
+    assert {unchanged.fingerprint, existing.fingerprint} <= db.feed_state[SOURCE]
+    assert new.fingerprint not in db.feed_state[SOURCE]
+
+
+def test_unchanged_feed_skips_database_lookup(make_reader):
+    article = entry("https://example.com/1", "Title")
+    db = FakeDB(feed_state={SOURCE: {article.fingerprint}})
+    reader = make_reader(db=db)
+    assert reader.find_new_entries(SOURCE, ParsedFeed("Feed", [article], "fast")) == []
+    assert db.lookups == []
+
+
+def test_new_entries_follow_publish_order(make_reader):
+    older = entry("https://example.com/older", "Older", published=datetime(2024, 1, 1, 8))
+    newer = entry("https://example.com/newer", "Newer", published=datetime(2024, 1, 1, 9))
+    reader = make_reader()
+    reader.find_new_entries(SOURCE, ParsedFeed("Feed", [older, newer], "fast"))
+    assert newer.created_at > older.created_at
+
+
+class QueuingDB(FakeDB):
+    """save_articles只排队，模拟延迟写入尚未提交"""
+
+    def __init__(self):
+        super().__init__()
+        self.queued = []
+
+    def save_articles(self, articles, on_saved=None):
+        self.queued.append((articles, on_saved))
+
+    def commit(self):
+        for articles, on_saved in self.queued:
+            super().save_articles(articles, on_saved)
+        self.queued = []
+
+
+def test_fingerprints_are_recorded_only_after_the_durable_write(make_reader):
+    db = QueuingDB()
+    reader = make_reader(db=db)
+    article = entry("https://example.com/new", "Brand new")
+    feed = ParsedFeed("Feed", [article], "fast")
+    [(new, _, _)] = reader.find_new_entries(SOURCE, feed)
+    reader.persist_articles([new])
+    assert article.fingerprint not in db.feed_state.get(SOURCE, set())
+    # 排队的写入被丢弃时，下次刷新仍会重新处理该条目
+    assert len(reader.find_new_entries(SOURCE, feed)) == 1
+
+    db.commit()
+    assert article.fingerprint in db.feed_state[SOURCE]
+    lookups = len(db.lookups)
+    assert reader.find_new_entries(SOURCE, feed) == []
+    assert len(db.lookups) == lookups
@@ -0,0 +1,65 @@
+"""界面认领总结任务时等待其他执行者的测试"""
+import pytest
+
+from src.rss_translator.jobs import SUMMARY_JOB, claim_summary_job
+from tests.conftest import FakeDB
+
+URL = "https://a/1"
+
+
+def claimed_elsewhere(db):
+    db.enqueue_job(SUMMARY_JOB, URL, {"title": "title"})
+    return db.claim_job("other-instance", [SUMMARY_JOB], key=URL)
+
+
+def wait(reader, on_poll):
+    logs = []
+    result = claim_summary_job(reader, URL, "title", cancelled=on_poll, log=logs.append, poll_interval=0)
+    return result, logs
+
+
+def test_claims_job_after_other_worker_fails(make_reader):
+    db = FakeDB()
+    other = claimed_elsewhere(db)
+
+    def on_poll():
+        # 其他实例失败（不发送通知），退避时间结束
+        if other.status == "running":
+            db.fail_job(other.id, "timeout")
+            other.retry_in = 0
+        return False
+
+    (job, summary), logs = wait(make_reader(db=db), on_poll)
+    assert job is other and job.status == "running" and job.attempts == 2
+    assert summary is None
+    assert logs == ["其他实例正在生成该文章的总结，完成后将自动显示"]
+
+
+def test_returns_summary_written_by_other_worker(make_reader):
+    db = FakeDB()
+    other = claimed_elsewhere(db)
+
+    def on_poll():
+        db.summaries[URL] = "总结"
+        db.complete_job(other.id)
+        return False
+
+    (job, summary), _ = wait(make_reader(db=db), on_poll)
+    assert job is None and summary == "总结"
+
+
+def test_enqueue_keeps_backoff_and_failed_jobs(make_reader):
+    db = FakeDB()
+    other = claimed_elsewhere(db)
+    db.fail_job(other.id, "rate limited")
+    polls = []
+    (job, summary), logs = wait(make_reader(db=db), lambda: polls.append(1) or len(polls) >= 2)
+    # 退避中的任务不会因打开文章而清零重试
+    assert (job, summary) == (None, None)
+    assert other.attempts == 1 and other.retry_in > 0
+    assert logs[0].startswith("上次生成失败")
+
+    other.status = "failed"
+    with pytest.raises(Exception, match="不再重试"):
+        wait(make_reader(db=db), lambda: False)
+    assert db.get_job(SUMMARY_JOB, URL).status == "failed"
@@ -0,0 +1,140 @@
+"""数据库变更事件合并到文章列表的测试"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.rss_translator import config, rss_reader
+from src.rss_translator.database.models import Article
+from tests.conftest import FakeDB
+
+BASE = datetime(2024, 1, 1)
+
+
+def make_article(id, source="feed"):
+    return Article(id=id, title=f"title {id}", translated_title=f"标题 {id}",
+                   url=f"https://a/{id}", source=source, created_at=BASE + timedelta(minutes=id))
+
+
+def test_other_source_events_skip_database_query(make_reader):
+    db = FakeDB([make_article(1, source="other")])
+    reader = make_reader(db=db, source="feed")
+    events = []
+    reader._apply_change({"type": "articles", "source": "other", "ids": [1]}, events.append)
+    assert db.queried == []
+    assert db.invalidated_ids == [([1], "other")]
+    assert events == []
+
+
+def test_new_articles_are_merged_in_order_and_trimmed(monkeypatch, make_reader):
+    monkeypatch.setattr(config, "ARTICLE_LIST_LIMIT", 3)
+    existing = [make_article(3), make_article(2), make_article(1)]
+    db = FakeDB(existing + [make_article(4)])
+    reader = make_reader(db=db, source="feed", articles=existing)
+    events = []
+    reader._apply_change({"type": "articles", "source": "feed", "ids": [4]}, events.append)
+    assert [url for _, _, url in reader.articles] == ["https://a/4", "https://a/3", "https://a/2"]
+    assert "https://a/1" not in reader.article_times
+    assert events[0]["added"] and events[0]["urls"] == ["https://a/4"]
+
+
+def test_updated_articles_keep_order_and_report_changed_rows(make_reader):
+    existing = [make_article(2), make_article(1)]
+    updated = make_article(1)
+    updated.translated_title = "新译文"
+    reader = make_reader(db=FakeDB([existing[0], updated]), source="feed", articles=existing)
+    events = []
+    reader._apply_change({"type": "articles", "source": "feed", "ids": [1]}, events.append)
+    assert reader.articles[1] == ("title 1", "新译文", "https://a/1")
+    assert not events[0]["added"] and events[0]["urls"] == ["https://a/1"]
+
+
+def test_stream_translation_persists_in_micro_batches(monkeypatch, make_reader):
+    monkeypatch.setattr(config, "TRANSLATE_STREAM_BATCH", 2)
+    monkeypatch.setattr(config, "TRANSLATE_STREAM_FLUSH_INTERVAL", 3600)
+    articles = [make_article(id) for id in range(5)]
+    db = FakeDB()
+    translator = SimpleNamespace(
+        translate_batch_stream=lambda titles: ((i, f"译{i}") for i in range(len(titles)))
+    )
+    reader = make_reader(db=db, translator=translator)
+    reader.stream_translate_articles(articles)
+    assert [[article.id for article in batch] for batch in db.saved] == [[0, 1], [2, 3], [4]]
+    assert [article.translated_title for article in articles] == [f"译{i}" for i in range(5)]
+
+
+class InlinePool:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+def make_lazy_reader(make_reader, translate_batch):
+    untranslated = make_article(1)
+    untranslated.translated_title = None
+    reader = make_reader(translator=SimpleNamespace(translate_batch=translate_batch),
+                         source="feed", articles=[untranslated])
+    reader._lazy_pool = InlinePool()
+    return reader
+
+
+def test_failed_lazy_translation_backs_off_and_gives_up(monkeypatch, make_reader):
+    monkeypatch.setattr(config, "LAZY_TRANSLATE_RETRY_DELAY", 10)
+    monkeypatch.setattr(config, "LAZY_TRANSLATE_MAX_RETRIES", 2)
+    clock = [1000.0]
+    monkeypatch.setattr(rss_reader.time, "monotonic", lambda: clock[0])
+    calls = []
+
+    def translate_batch(titles):
+        calls.append(titles)
+        raise Exception("rate limited")
+
+    reader = make_lazy_reader(make_reader, translate_batch)
+    assert reader.translate_titles(["https://a/1"]) == 1
+    # 退避期间不重新提交
+    assert reader.translate_titles(["https://a/1"]) == 0
+    clock[0] += 10
+    assert reader.translate_titles(["https://a/1"]) == 1
+    # 达到重试上限后不再自动重试
+    clock[0] += 1000
+    assert reader.translate_titles(["https://a/1"]) == 0
+    assert len(calls) == 2
+
+
+def test_successful_lazy_translation_clears_failures(make_reader):
+    reader = make_lazy_reader(make_reader, lambda titles: ["标题"])
+    reader._lazy_failures["https://a/1"] = (1, 0.0)
+    assert reader.translate_titles(["https://a/1"]) == 1
+    assert reader._lazy_failures == {}
+    assert reader._lazy_pending == set()
+
+
+
+class SwitchingDB(FakeDB):
+    """查询期间调用switch，模拟界面线程此时切换到另一个RSS源"""
+
+    switch = None
+
+    def get_articles_by_ids(self, ids):
+        self.switch()
+        return super().get_articles_by_ids(ids)
+
+    def get_articles_by_source(self, source, limit=config.ARTICLE_LIST_LIMIT):
+        self.switch()
+        return super().get_articles_by_source(source, limit)
+
+
+def test_changes_queried_before_a_feed_switch_are_dropped(make_reader):
+    db = SwitchingDB([make_article(1)])
+    reader = make_reader(db=db, source="feed")
+
+    def switch():
+        reader.source = "other"
+        reader._set_articles([])
+
+    db.switch = switch
+    events = []
+    reader._apply_change({"type": "articles", "source": "feed", "ids": [1]}, events.append)
+    assert reader.articles == [] and reader.article_times == {}
+
+    reader.source = "feed"
+    reader._apply_change({"type": "reconnect"}, events.append)
+    assert reader.source == "other" and reader.articles == []
+    assert events == []
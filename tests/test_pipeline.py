@@ -0,0 +1,62 @@
+"""流水线停止时的任务计数测试"""
+import threading
+import time
+
+from src.rss_translator.pipeline import IngestPipeline
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>Story from {url}</title><link>{url}/story</link></item>
+</channel></rss>"""
+
+
+class BlockingTranslator:
+    """翻译阶段阻塞到release被设置，模拟慢速LLM调用"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.translating = threading.Event()
+
+    def translate_batch(self, titles):
+        self.translating.set()
+        self.release.wait(5)
+        return [f"译:{title}" for title in titles]
+
+
+def make_pipeline_reader(make_reader, translator):
+    reader = make_reader(translator=translator)
+    # 只替换网络下载，其余阶段使用阅读器的实际实现
+    reader.download_feed = lambda url: RSS.format(url=url).encode()
+    return reader
+
+
+def test_stop_accounts_for_queued_and_blocked_jobs(make_reader):
+    translator = BlockingTranslator()
+    reader = make_pipeline_reader(make_reader, translator)
+    workers = {name: 1 for name in ("fetch", "parse", "dedup", "translate", "persist")}
+    pipeline = IngestPipeline(reader, workers=workers, queue_size=1)
+    pipeline.start()
+    for i in range(6):
+        pipeline.submit(f"https://feed/{i}", timeout=1)
+    assert translator.translating.wait(2)
+    time.sleep(0.5)
+
+    pipeline.stop()
+    translator.release.set()
+    # 阻塞在put上的任务和队列中剩余的任务都计为已结束
+    assert pipeline.join(timeout=5)
+
+
+def test_join_waits_for_completed_jobs(make_reader):
+    translator = BlockingTranslator()
+    translator.release.set()
+    reader = make_pipeline_reader(make_reader, translator)
+    done = []
+    pipeline = IngestPipeline(reader, on_complete=lambda url, count: done.append((url, count)))
+    pipeline.start()
+    pipeline.submit("https://feed/1")
+    assert pipeline.join(timeout=5)
+    pipeline.stop()
+    assert done == [("https://feed/1", 1)]
+    [saved] = reader.db.saved
+    assert saved[0].translated_title == "译:Story from https://feed/1"
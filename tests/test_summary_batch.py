@@ -0,0 +1,47 @@
+"""批量总结的逐篇错误处理测试"""
+from types import SimpleNamespace
+
+from src.rss_translator import jobs
+from tests.conftest import FakeDB, make_translation_service
+
+
+def make_translator(response, failing=()):
+    translator = make_translation_service()
+
+    def complete(task, **kwargs):
+        if isinstance(response, Exception):
+            raise response
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response))])
+
+    def summarize_article(title, content):
+        if title in failing:
+            raise Exception(f"总结处理失败: {title}")
+        return f"总结：{title}"
+
+    translator._complete = complete
+    translator.summarize_article = summarize_article
+    return translator
+
+
+def test_summarize_batch_returns_partial_results_when_fallback_fails():
+    translator = make_translator("=== 总结1 ===\n第一篇的总结", failing={"b"})
+    results = translator.summarize_batch([("a", "x"), ("b", "y"), ("c", "z")])
+    assert results[0] == "第一篇的总结"
+    assert isinstance(results[1], Exception)
+    assert results[2] == "总结：c"
+
+
+def test_summarize_batch_falls_back_per_item_when_request_fails():
+    translator = make_translator(Exception("timeout"), failing={"a"})
+    results = translator.summarize_batch([("a", "x"), ("b", "y")])
+    assert isinstance(results[0], Exception)
+    assert results[1] == "总结：b"
+
+
+def test_run_summary_batch_reports_errors_per_url(make_reader):
+    db = FakeDB(feed_content={"https://a/1": "正文" * 500, "https://a/2": "正文" * 500})
+    reader = make_reader(db=db, translator=make_translator(Exception("timeout"), failing={"bad"}))
+    results = jobs.run_summary_batch(reader, [("https://a/1", "good"), ("https://a/2", "bad")])
+    assert results["https://a/1"] is None
+    assert isinstance(results["https://a/2"], Exception)
+    assert db.summaries == {"https://a/1": "总结：good"}
@@ -0,0 +1,36 @@
+"""全文逐段翻译测试"""
+from types import SimpleNamespace
+
+from src.rss_translator.rss_reader import paragraph_hash
+from tests.conftest import FakeDB
+
+
+def make_article_reader(make_reader, paragraphs, db, served_by="fast-model"):
+    translator = SimpleNamespace(
+        paragraph_models=lambda: ["deepseek-v3", "fast-model"],
+        translate_paragraph=lambda text: (f"译:{text}", served_by),
+    )
+    reader = make_reader(db=db, translator=translator)
+    reader.fetch_paragraphs = lambda url: paragraphs
+    return reader
+
+
+def test_cache_is_keyed_by_the_model_that_served_the_request(make_reader):
+    db = FakeDB(paragraphs={paragraph_hash("one", "deepseek-v3"): "缓存:one"})
+    reader = make_article_reader(make_reader, ["one", "two"], db)
+    output = []
+    count = reader.translate_article("https://a/1", lambda i, p, t: output.append((i, t)))
+    assert count == 2
+    assert output == [(0, "缓存:one"), (1, "译:two")]
+    assert db.paragraphs[paragraph_hash("two", "fast-model")] == "译:two"
+    assert paragraph_hash("two", "deepseek-v3") not in db.paragraphs
+
+
+def test_cancelled_translation_stops_emitting_paragraphs(make_reader):
+    reader = make_article_reader(make_reader, ["one", "two", "three"], FakeDB())
+    output = []
+    count = reader.translate_article(
+        "https://a/1", lambda i, p, t: output.append(i), cancelled=lambda: len(output) >= 1
+    )
+    assert count == 1
+    assert output == [0]
@@ -0,0 +1,71 @@
+"""翻译结果解析测试"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.rss_translator.translator import parse_batch_summaries, parse_numbered_response
+from tests.conftest import make_translation_service
+
+TITLES = ["first", "second", "third"]
+
+
+def test_parse_numbered_response():
+    assert parse_numbered_response("1. 甲\n\n2. 乙\n", 2) == ["甲", "乙"]
+    with pytest.raises(Exception):
+        parse_numbered_response("1. 甲", 2)
+
+
+def test_parse_batch_summaries_skips_duplicated_and_out_of_range():
+    text = "=== 总结1 ===\n一\n=== 总结2 ===\n二\n=== 总结2 ===\n又二\n=== 总结9 ===\n九"
+    assert parse_batch_summaries(text, 3) == {0: "一"}
+
+
+def make_translator(chunks, error=None):
+    translator = make_translation_service()
+    fallback = []
+
+    class Stream:
+        def __iter__(self):
+            for text in chunks:
+                yield SimpleNamespace(model="m", usage=None,
+                                      choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+            if error:
+                raise error
+
+        def close(self):
+            pass
+
+    def translate_batch(texts):
+        fallback.append(list(texts))
+        return [f"补{text}" for text in texts]
+
+    translator._complete = lambda task, **kwargs: Stream()
+    translator.translate_batch = translate_batch
+    return translator, fallback
+
+
+def test_stream_yields_each_line_in_order():
+    translator, fallback = make_translator(["以下是译文：\n1. 一", "\n2. 二\n3.", " 三"])
+    assert list(translator.translate_batch_stream(TITLES)) == [(0, "一"), (1, "二"), (2, "三")]
+    assert fallback == []
+
+
+def test_short_stream_falls_back_for_remaining_titles():
+    translator, fallback = make_translator(["1. 一\n"], error=ConnectionError("reset"))
+    assert list(translator.translate_batch_stream(TITLES)) == [(0, "一"), (1, "补second"), (2, "补third")]
+    assert fallback == [["second", "third"]]
+
+
+@pytest.mark.parametrize("text", [
+    "1. 一\n3. 三\n2. 二\n",          # 编号跳跃
+    "1. 一\n1. 一\n2. 二\n",          # 编号重复
+    "1. 一\n说明文字\n2. 二\n",        # 无法解析的行
+    "1. 一\n2. 二 3. 三\n",           # 两条合并在一行
+])
+def test_misnumbered_stream_stops_and_falls_back(text):
+    translator, fallback = make_translator([text])
+    results = list(translator.translate_batch_stream(TITLES))
+    assert results[0] == (0, "一")
+    assert sorted(index for index, _ in results) == [0, 1, 2]
+    assert all(translation.startswith("补") for index, translation in results if index == 2)
+    assert len(fallback) == 1
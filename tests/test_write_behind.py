@@ -0,0 +1,118 @@
+"""延迟写入队列测试"""
+from datetime import datetime
+
+from src.rss_translator.database.models import Article
+from src.rss_translator.database import write_behind
+from src.rss_translator.database.write_behind import WriteBehindBuffer
+from tests.conftest import FakeDB
+
+
+def make_article(url, title="title"):
+    return Article(id=None, title=title, translated_title="标题", url=url, source="feed",
+                   created_at=datetime(2024, 1, 1, 8, 30))
+
+
+def make_buffer(db, tmp_path, **kwargs):
+    return WriteBehindBuffer(db, str(tmp_path / "journal.jsonl"),
+                             max_items=1000, interval=3600, **kwargs).start()
+
+
+def test_flush_coalesces_writes(tmp_path):
+    db = FakeDB()
+    buffer = make_buffer(db, tmp_path)
+    buffer.save_articles([make_article("https://a/1", "old")])
+    buffer.save_articles([make_article("https://a/1", "new")])
+    buffer.update_summary("https://a/1", "总结")
+    assert buffer.pending_summary("https://a/1") == "总结"
+    assert buffer.flush()
+    assert db.article("https://a/1").title == "new"
+    assert db.summaries == {"https://a/1": "总结"}
+    assert buffer.pending_count() == 0
+    assert (tmp_path / "journal.jsonl").read_text(encoding="utf-8") == ""
+    buffer.close()
+
+
+def test_failed_flush_requeues_without_overwriting_newer_writes(tmp_path):
+    db = FakeDB()
+    buffer = make_buffer(db, tmp_path)
+    buffer.update_summary("https://a/1", "旧总结")
+    db.fail = True
+    assert not buffer.flush()
+    assert buffer.pending_summary("https://a/1") == "旧总结"
+    buffer.update_summary("https://a/1", "新总结")
+    db.fail = False
+    assert buffer.flush()
+    assert db.summaries == {"https://a/1": "新总结"}
+    buffer.close()
+
+
+def test_items_dropped_after_repeated_failures(tmp_path):
+    db = FakeDB()
+    db.fail = True
+    buffer = make_buffer(db, tmp_path, max_failures=2)
+    buffer.update_summary("https://a/1", "总结")
+    assert not buffer.flush()
+    assert buffer.pending_count() == 1
+    assert not buffer.flush()
+    assert buffer.pending_count() == 0
+    assert (tmp_path / "journal.jsonl").read_text(encoding="utf-8") == ""
+    buffer.close()
+
+
+def test_journal_replay_recovers_unflushed_writes(tmp_path):
+    db = FakeDB()
+    buffer = make_buffer(db, tmp_path)
+    buffer.save_articles([make_article("https://a/1")])
+    buffer.update_summary("https://a/1", "总结")
+    # 模拟异常退出：不提交，直接丢弃缓冲区，并在日志末尾留下不完整的一行
+    buffer._journal.write('{"op": "summary", "url"')
+    buffer._journal.close()
+
+    recovered = make_buffer(db, tmp_path)
+    assert recovered.pending_count() == 2
+    assert recovered.flush()
+    assert db.article("https://a/1").created_at == datetime(2024, 1, 1, 8, 30)
+    assert db.summaries == {"https://a/1": "总结"}
+    recovered.close()
+
+
+def test_save_articles_syncs_journal_once_per_call(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = write_behind.os.fsync
+    monkeypatch.setattr(write_behind.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    buffer = make_buffer(FakeDB(), tmp_path)
+    buffer.save_articles([make_article(f"https://a/{i}") for i in range(50)])
+    assert len(synced) == 1
+    assert len((tmp_path / "journal.jsonl").read_text(encoding="utf-8").splitlines()) == 50
+    buffer.update_summary("https://a/1", "总结")
+    assert len(synced) == 2
+    buffer.close()
+
+
+def test_on_saved_runs_after_commit_and_not_for_dropped_articles(tmp_path):
+    db = FakeDB()
+    buffer = make_buffer(db, tmp_path, max_failures=2)
+    saved = []
+    buffer.save_articles([make_article("https://a/1"), make_article("https://a/2")], saved.extend)
+    assert saved == []
+    assert buffer.flush()
+    assert [article.url for article in saved] == ["https://a/1", "https://a/2"]
+
+    saved.clear()
+    db.fail = True
+    buffer.save_articles([make_article("https://a/3")], saved.extend)
+    assert not buffer.flush()
+    # 重试期间保留回调，提交成功后调用
+    db.fail = False
+    assert buffer.flush()
+    assert [article.url for article in saved] == ["https://a/3"]
+
+    saved.clear()
+    db.fail = True
+    buffer.save_articles([make_article("https://a/4")], saved.extend)
+    assert not buffer.flush()
+    assert not buffer.flush()
+    db.fail = False
+    assert buffer.flush()
+    assert saved == []
+    buffer.close()